@@ -23,7 +23,7 @@ SSD Core Engine - 汎用計算エンジン（Log-Alignment対応版）
 """
 
 import numpy as np
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from typing import List, Tuple, Optional, Dict
 from enum import Enum, auto
 
@@ -38,12 +38,20 @@ class LeapType(Enum):
     # 必要に応じて追加可能
 
 
-@dataclass
+# 毎ステップ配列として使うため、代入のたびに float64 ndarray へ変換するフィールド
+_PARAM_ARRAY_FIELDS = frozenset(('Theta_values', 'gamma_values', 'beta_values'))
+
+
+@dataclass(slots=True)
 class SSDCoreParams:
     """
     SSD汎用パラメータ（Log-Alignment対応）
     
     レイヤー数やドメインに依存しない基本パラメータセット
+    
+    Theta_values / gamma_values / beta_values は構築時・後からの代入
+    （params.Theta_values = [...] など）のどちらでも float64 の ndarray（コピー）になる。
+    == は配列フィールドを np.array_equal で比較する。
     """
     # レイヤー構成
     num_layers: int = 4
@@ -106,6 +114,26 @@ class SSDCoreParams:
     # ウォームアップ
     warmup_steps: int = 50  # ウォームアップ期間（ステップ数）
     
+    def __setattr__(self, name, value):
+        # 閾値・生成・減衰はリストで代入されても常に自前の float64 配列として保持
+        if name in _PARAM_ARRAY_FIELDS:
+            value = np.array(value, dtype=np.float64)
+        object.__setattr__(self, name, value)
+    
+    def __eq__(self, other):
+        """全フィールドの比較（ndarray のフィールドは np.array_equal で比較）"""
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        for f in fields(self):
+            a = getattr(self, f.name)
+            b = getattr(other, f.name)
+            if isinstance(a, np.ndarray) or isinstance(b, np.ndarray):
+                if not np.array_equal(a, b):
+                    return False
+            elif a != b:
+                return False
+        return True
+    
     def __post_init__(self):
         """パラメータ配列の長さを検証"""
         arrays = [
@@ -116,9 +144,30 @@ class SSDCoreParams:
         for arr in arrays:
             if len(arr) != self.num_layers:
                 raise ValueError(f"パラメータ配列の長さがnum_layers={self.num_layers}と一致しません")
+    
+    def copy_into(self, dst: 'SSDCoreParams') -> 'SSDCoreParams':
+        """
+        全フィールドを既存インスタンス dst へ上書きコピー（新規インスタンスを作らない）
+        
+        配列フィールドは必ず dst 自身の float64 配列になる（self と配列を共有しない）。
+        dst 側に同形状の自前バッファがあればそこへ値をコピーし、
+        なければ（リスト・形状違い・self と同じ配列の場合）新しく確保する。
+        """
+        for f in fields(self):
+            src = getattr(self, f.name)
+            if f.name in _PARAM_ARRAY_FIELDS or isinstance(src, np.ndarray):
+                cur = getattr(dst, f.name)
+                if (isinstance(cur, np.ndarray) and cur is not src
+                        and cur.dtype == np.float64 and cur.shape == np.shape(src)):
+                    np.copyto(cur, src)
+                else:
+                    setattr(dst, f.name, np.array(src, dtype=np.float64))
+            else:
+                setattr(dst, f.name, src)
+        return dst
 
 
-@dataclass
+@dataclass(slots=True)
 class SSDCoreState:
     """
     SSD汎用状態ベクトル（Log-Alignment対応）
@@ -137,7 +186,7 @@ class SSDCoreState:
     # ステップカウンタ（ウォームアップ判定用）
     step_count: int = 0
     
-    # 跳躍履歴
+    # 跳躍履歴（ステップ間で共有されるため直接追記しないこと）
     leap_history: List[Tuple[float, LeapType]] = field(default_factory=list)
     
     # Log-Alignment状態
@@ -150,12 +199,17 @@ class SSDCoreState:
     # 診断情報（オプション）
     diagnostics: Dict = field(default_factory=dict)
     
+    # 総エネルギー ΣE（バッチ状態では行ごと）。生成時と step() で更新され、
+    # E を外部から直接書き換えた場合は再計算されない
+    E_total: float = field(init=False, default=0.0)
+    
     def __post_init__(self):
         """NumPy配列に変換"""
         if not isinstance(self.E, np.ndarray):
             self.E = np.array(self.E)
         if not isinstance(self.kappa, np.ndarray):
             self.kappa = np.array(self.kappa)
+        self.E_total = self.E.sum(axis=-1)
 
 
 class SSDCoreEngine:
@@ -333,12 +387,14 @@ class SSDCoreEngine:
             kappa=state.kappa.copy(),
             t=state.t,
             step_count=state.step_count,
+            # step() は跳躍履歴を共有で引き継ぐため、追記前にここでコピーする
             leap_history=state.leap_history.copy(),
             logalign_state=state.logalign_state.copy()
         )
         
         # エネルギーリセット
         new_state.E[layer_index] *= 0.1
+        new_state.E_total = new_state.E.sum()
         
         # κ微増（跳躍による学習）
         new_state.kappa[layer_index] += 0.1
@@ -438,7 +494,8 @@ class SSDCoreEngine:
             kappa=state.kappa.copy(),
             t=state.t + dt,
             step_count=state.step_count + 1,
-            leap_history=state.leap_history.copy(),
+            # 跳躍履歴はコピーオンライト（追記する execute_leap 側だけがコピーする）
+            leap_history=state.leap_history,
             logalign_state=state.logalign_state.copy(),
             diagnostics={
                 'theta_dynamic': theta_dynamic.copy(),
@@ -462,8 +519,8 @@ class SSDCoreEngine:
         
         # 各レイヤーの更新
         R_array = np.array(self.params.R_values)
-        gamma_array = np.array(self.params.gamma_values)
-        beta_array = np.array(self.params.beta_values)
+        gamma_array = np.asarray(self.params.gamma_values)
+        beta_array = np.asarray(self.params.beta_values)
         eta_array = np.array(self.params.eta_values)
         lambda_array = np.array(self.params.lambda_values)
         kappa_min_array = np.array(self.params.kappa_min_values)
@@ -493,6 +550,7 @@ class SSDCoreEngine:
             dE += interlayer_transfer
         
         new_state.E = np.maximum(0.0, state.E + dE * dt)
+        new_state.E_total = new_state.E.sum()
         
         # κ更新（使用による強化と未使用減衰）
         usage_factor = np.abs(j) / (np.abs(j) + 1.0)  # 正規化された使用度
@@ -514,6 +572,191 @@ class SSDCoreEngine:
         
         return new_state
     
+    def step_batched(
+        self,
+        state: SSDCoreState,
+        pressure: np.ndarray,
+        dt: float = 0.1,
+        interlayer_transfer: Optional[np.ndarray] = None,
+        row_params: Optional[List[SSDCoreParams]] = None
+    ) -> SSDCoreState:
+        """
+        バッチ版1ステップ実行（B個の独立な状態を同時に更新）
+        
+        step() と同じ更新則を先頭のバッチ軸でブロードキャストして計算する。
+        状態は create_batched_state() で生成したものを使う。
+        
+        ただし物理残差モード（use_log_residual=False, zeta_auto=True）では、
+        ζのEMA更新を返す状態の logalign_state に残す。step() は更新後のζを
+        入力側 state の logalign_state に書き込むため返す状態には残らず、
+        ステップを重ねると両者の E は一致しない。
+        
+        - state.E, state.kappa: (B, num_layers)
+        - state.logalign_state の 'm', 'alpha_t', 'zeta': (B,)
+        - t, step_count: バッチ共通
+        
+        跳躍は leap_history には記録せず、diagnostics['leap_layer']
+        （(B,)、跳躍なしは -1）で返す。
+        
+        Args:
+            state: バッチ状態
+            pressure: 意味圧 (B, num_layers)、または全バッチ共通の (num_layers,)
+            dt: 時間刻み
+            interlayer_transfer: 層間転送 (B, num_layers) または (num_layers,)（オプション）
+            row_params: 行ごとのパラメータ（長さBのリスト、オプション）。
+                レイヤー配列・alpha0・G0・g・temperature_T を行ごとに差し替える。
+                フラグ類やEMA等の定数は self.params を共通で使う。
+        
+        Returns:
+            更新後のバッチ状態
+        """
+        p = self.params
+        E = state.E
+        kappa = state.kappa
+        batch_size = E.shape[0]
+        pressure = np.broadcast_to(np.asarray(pressure, dtype=float), E.shape)
+        
+        if row_params is None:
+            R_array = np.array(p.R_values)
+            Theta_array = np.asarray(p.Theta_values)
+            gamma_array = np.asarray(p.gamma_values)
+            beta_array = np.asarray(p.beta_values)
+            eta_array = np.array(p.eta_values)
+            lambda_array = np.array(p.lambda_values)
+            kappa_min_array = np.array(p.kappa_min_values)
+            alpha0, G0, g, temperature_T = p.alpha0, p.G0, p.g, p.temperature_T
+        else:
+            # 行ごとのパラメータを (B, num_layers) / (B, 1) に積み上げてブロードキャスト
+            def stack(name):
+                return np.array([getattr(q, name) for q in row_params], dtype=float)
+            R_array = stack('R_values')
+            Theta_array = stack('Theta_values')
+            gamma_array = stack('gamma_values')
+            beta_array = stack('beta_values')
+            eta_array = stack('eta_values')
+            lambda_array = stack('lambda_values')
+            kappa_min_array = stack('kappa_min_values')
+            alpha0 = stack('alpha0')
+            G0 = stack('G0')[:, None]
+            g = stack('g')[:, None]
+            temperature_T = stack('temperature_T')[:, None]
+        logalign = state.logalign_state.copy()
+        
+        # 対数整合層（行ごとのノルムでEMA・適応ゲインを更新）
+        norm_p_rows = np.sqrt(np.einsum('ij,ij->i', pressure, pressure))
+        if p.log_align:
+            logalign['m'] = p.ema_tau * logalign['m'] + (1 - p.ema_tau) * norm_p_rows
+            alpha_t = np.clip(alpha0 / (p.eps_log + logalign['m']), p.alpha_min, p.alpha_max)
+            logalign['alpha_t'] = alpha_t
+            pressure_hat = (np.sign(pressure) * np.log1p(alpha_t[:, None] * np.abs(pressure))
+                            / np.log(p.log_base))
+        else:
+            pressure_hat = pressure
+        
+        # 構造的影響力と動的Theta（跳躍前の状態で評価）
+        power = pressure_hat * E * kappa * R_array
+        dominant_layer = power.argmax(axis=1)
+        if p.enable_dynamic_theta:
+            denominator = (kappa * R_array).sum(axis=1)
+            safe_denominator = np.where(denominator > 0, denominator, 1.0)
+            structural_influence = np.where(denominator > 0, power.sum(axis=1) / safe_denominator, 0.0)
+            theta_dynamic = np.maximum(
+                1.0, Theta_array * (1.0 - p.theta_sensitivity * structural_influence[:, None])
+            )
+        else:
+            theta_dynamic = np.broadcast_to(Theta_array, E.shape).copy()
+        
+        # 跳躍検出（各行で条件を満たす最初のレイヤー）
+        leap_layer = np.full(batch_size, -1)
+        if state.step_count >= p.warmup_steps:
+            draws = np.random.random(E.shape)
+            stochastic = p.enable_stochastic_leap and np.asarray(temperature_T > 0)
+            if not np.any(stochastic):
+                leap_prob = np.minimum(1.0, (E - theta_dynamic) / theta_dynamic)
+                hit = (E >= theta_dynamic) & (draws < leap_prob)
+            elif np.all(stochastic):
+                hit = draws < 1.0 / (1.0 + np.exp(-(E - theta_dynamic) / temperature_T))
+            else:
+                # 温度0の行だけ決定論的判定
+                leap_prob = np.minimum(1.0, (E - theta_dynamic) / theta_dynamic)
+                safe_T = np.where(stochastic, temperature_T, 1.0)
+                hit = np.where(
+                    stochastic,
+                    draws < 1.0 / (1.0 + np.exp(-(E - theta_dynamic) / safe_T)),
+                    (E >= theta_dynamic) & (draws < leap_prob)
+                )
+            leap_occurred = hit.any(axis=1)
+            leap_layer[leap_occurred] = hit.argmax(axis=1)[leap_occurred]
+        else:
+            leap_occurred = np.zeros(batch_size, dtype=bool)
+        
+        # 跳躍の実行（エネルギーリセット・κ微増）
+        if leap_occurred.any():
+            E = E.copy()
+            kappa = kappa.copy()
+            rows = np.flatnonzero(leap_occurred)
+            cols = leap_layer[rows]
+            E[rows, cols] *= 0.1
+            kappa[rows, cols] += 0.1
+        
+        # Ohm's law: j = (G0 + g·κ)·p̂
+        j = (G0 + g * kappa) * pressure_hat
+        abs_j = np.abs(j)
+        norm_j_rows = np.sqrt(np.einsum('ij,ij->i', j, j))
+        
+        # エネルギー残差（モード別）
+        if p.use_log_residual:
+            resid = np.maximum(0.0, np.abs(pressure_hat) - abs_j)
+        else:
+            if p.zeta_auto:
+                zeta_new = logalign['zeta'] * p.tau_zeta + (1 - p.tau_zeta) * (
+                    (norm_p_rows + p.eps_log) / (norm_j_rows + p.eps_log)
+                )
+                logalign['zeta'] = np.clip(zeta_new, p.zeta_min, p.zeta_max)
+            resid = np.maximum(0.0, np.abs(pressure) - np.asarray(logalign['zeta'])[..., None] * abs_j)
+        
+        # エネルギー更新
+        dE = gamma_array * resid / R_array - beta_array * E
+        if interlayer_transfer is not None:
+            dE += interlayer_transfer
+        new_E = np.maximum(0.0, E + dE * dt)
+        
+        # κ更新
+        usage_factor = abs_j / (abs_j + 1.0)
+        dkappa = eta_array * usage_factor - lambda_array * kappa
+        new_kappa = np.maximum(kappa_min_array, kappa + dkappa * dt)
+        
+        # KPI計算（診断用）
+        norm_p = norm_p_rows + p.eps_log
+        norm_phat = np.sqrt(np.einsum('ij,ij->i', pressure_hat, pressure_hat))
+        norm_j = norm_j_rows + p.eps_log
+        eta_align_phys = norm_j / norm_p
+        
+        return SSDCoreState(
+            E=new_E,
+            kappa=new_kappa,
+            t=state.t + dt,
+            step_count=state.step_count + 1,
+            leap_history=state.leap_history,
+            logalign_state=logalign,
+            diagnostics={
+                'theta_dynamic': theta_dynamic,
+                'power': power,
+                'dominant_layer': dominant_layer,
+                'leap_occurred': leap_occurred,
+                'leap_layer': leap_layer,
+                'alpha_t': logalign['alpha_t'],
+                'zeta': logalign['zeta'],
+                'pressure_hat': pressure_hat,
+                'pressure_hat_norm': norm_phat,
+                'resid_norm': np.sqrt(np.einsum('ij,ij->i', resid, resid)),
+                'eta_align_phys': eta_align_phys,
+                'eta_align_log': norm_j / (norm_phat + p.eps_log) if p.log_align else eta_align_phys,
+                'compression_ratio': (norm_phat + p.eps_log) / norm_p if p.log_align else np.ones(batch_size),
+                'warmup_complete': state.step_count >= p.warmup_steps
+            }
+        )
+    
     def get_dominant_layer(self, state: SSDCoreState, pressure: np.ndarray) -> int:
         """
         最も影響力の高いレイヤーを返す
@@ -567,6 +810,21 @@ def create_default_state(num_layers: int = 4) -> SSDCoreState:
     )
 
 
+def create_batched_state(batch_size: int, num_layers: int = 4) -> SSDCoreState:
+    """SSDCoreEngine.step_batched 用のバッチ状態の生成"""
+    return SSDCoreState(
+        E=np.zeros((batch_size, num_layers)),
+        kappa=np.ones((batch_size, num_layers)),
+        t=0.0,
+        step_count=0,
+        logalign_state={
+            'm': np.zeros(batch_size),
+            'alpha_t': np.ones(batch_size),
+            'zeta': np.ones(batch_size)
+        }
+    )
+
+
 def create_custom_params(
     num_layers: int,
     R_values: List[float],
@@ -589,7 +847,7 @@ def print_diagnostics(state: SSDCoreState, step: int = None, verbose: bool = Fal
         step: ステップ番号（オプション）
         verbose: 詳細表示モード
     """
-    if 'diagnostics' not in state.__dict__ or not state.diagnostics:
+    if not state.diagnostics:
         print("診断情報がありません")
         return
     
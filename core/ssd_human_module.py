@@ -3,7 +3,7 @@ SSD Human Module - 人間心理特化モジュール（新コア対応版）
 """
 
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional, Dict, List, Tuple, Union
 
@@ -88,8 +88,29 @@ class HumanPressure:
     core: float = 0.0
     upper: float = 0.0
     
+    # as_array() のキャッシュ（フィールド更新時に破棄）
+    _arr: Optional[np.ndarray] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != '_arr':
+            object.__setattr__(self, '_arr', None)
+    
     def to_vector(self) -> np.ndarray:
         return np.array([self.physical, self.base, self.core, self.upper])
+    
+    def as_array(self) -> np.ndarray:
+        """
+        意味圧ベクトル（読み取り専用・キャッシュ済み）
+        
+        同じ圧力を繰り返し与えるループでは、ループ前に一度だけ変換して
+        HumanAgent.step に配列として渡す。書き換えが必要なら to_vector() を使う。
+        """
+        if self._arr is None:
+            arr = self.to_vector()
+            arr.flags.writeable = False
+            object.__setattr__(self, '_arr', arr)
+        return self._arr
 
 
 class HumanAgent:
@@ -108,12 +129,19 @@ class HumanAgent:
         if enable_nonlinear_transfer:
             self.nonlinear_transfer = NonlinearInterlayerTransfer()
         
+        # HumanPressure → ベクトル変換用の作業バッファ（engine.step は同期的に消費するだけ）
+        self._pscratch = np.empty(4, dtype=np.float64)
+        
     def step(self, pressure: Union[HumanPressure, np.ndarray], dt: float = 0.1):
         """1ステップ実行（非線形転送対応）"""
         if isinstance(pressure, np.ndarray):
             p_vector = pressure
         else:
-            p_vector = pressure.to_vector()
+            p_vector = self._pscratch
+            p_vector[0] = pressure.physical
+            p_vector[1] = pressure.base
+            p_vector[2] = pressure.core
+            p_vector[3] = pressure.upper
         
         # 非線形転送計算
         interlayer_transfer = None
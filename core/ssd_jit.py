@@ -0,0 +1,23 @@
+"""
+numba の任意依存ヘルパー
+========================
+
+numba があれば njit をそのまま使い、なければ何もしないデコレータに置き換える。
+@njit / @njit(cache=True, ...) のどちらの書き方でも、numba未導入時は
+元のPython関数がそのまま返る。
+"""
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+
+    # numba未導入時は通常のPython関数として実行
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+__all__ = ['njit', 'HAVE_NUMBA']
@@ -11,6 +11,11 @@ from typing import Callable, Optional, Dict, List
 from enum import Enum
 import numpy as np
 
+try:
+    from .ssd_jit import njit
+except ImportError:
+    from ssd_jit import njit
+
 
 class StructuralLayer(Enum):
     """構造層（新コア対応版）"""
@@ -20,6 +25,73 @@ class StructuralLayer(Enum):
     UPPER = 3
 
 
+# ===== 組み込み転送関数（スカラー・配列の両方で動作、numba下ではJIT化） =====
+
+@njit(cache=True, fastmath=True)
+def _saturating_suppression_fn(E_source, E_target, kappa_source, kappa_target):
+    """飽和抑制関数"""
+    suppression_power = E_source * kappa_source * 0.8
+    resistance = 1.0 + E_target / 8.0
+    return suppression_power / resistance
+
+
+@njit(cache=True, fastmath=True)
+def _saturating_transfer_fn(E_source, E_target, kappa_source, kappa_target):
+    """飽和転送関数"""
+    transfer_power = E_source * 0.9
+    saturation_factor = 1.0 / (1.0 + E_target / 40.0)
+    receptivity = kappa_target / 2.2
+    return transfer_power * saturation_factor * receptivity
+
+
+@njit(cache=True, fastmath=True)
+def _kappa_weighted_suppression_fn(E_source, E_target, kappa_source, kappa_target):
+    """κ重み付き抑制関数"""
+    suppression_strength = E_source * (kappa_source / 1.8)
+    resistance = 1.0 + E_target / 15.0
+    return suppression_strength / resistance
+
+
+@njit(cache=True, fastmath=True)
+def _pain_transfer_fn(E_source, E_target, kappa_source, kappa_target):
+    """痛覚転送関数"""
+    pain_intensity = E_source * 0.9
+    pain_sensitivity = 1.8 / (kappa_source + 1.0)
+    return pain_intensity * pain_sensitivity
+
+
+# カーネルテーブルの列: [関数種別, 転送元, 転送先, 基本係数, Log-Alignment適応係数]
+_KIND_SATURATING_SUPPRESSION = 0
+_KIND_SATURATING_TRANSFER = 1
+_KIND_KAPPA_WEIGHTED_SUPPRESSION = 2
+_KIND_PAIN_TRANSFER = 3
+
+
+@njit(cache=True, fastmath=True)
+def _compute_transfer_kernel(E, kappa, table, use_adaptation, global_strength):
+    """1エージェント分 (num_layers,) の非線形層間転送（組み込み関数のみのテーブル）"""
+    transfer = np.zeros(E.shape[0])
+    for r in range(table.shape[0]):
+        kind = int(table[r, 0])
+        src = int(table[r, 1])
+        tgt = int(table[r, 2])
+        
+        if kind == _KIND_SATURATING_SUPPRESSION:
+            amount = _saturating_suppression_fn(E[src], E[tgt], kappa[src], kappa[tgt])
+        elif kind == _KIND_SATURATING_TRANSFER:
+            amount = _saturating_transfer_fn(E[src], E[tgt], kappa[src], kappa[tgt])
+        elif kind == _KIND_KAPPA_WEIGHTED_SUPPRESSION:
+            amount = _kappa_weighted_suppression_fn(E[src], E[tgt], kappa[src], kappa[tgt])
+        else:
+            amount = _pain_transfer_fn(E[src], E[tgt], kappa[src], kappa[tgt])
+        
+        value = table[r, 3] * amount
+        if use_adaptation:
+            value *= table[r, 4]
+        transfer[tgt] += value * global_strength
+    return transfer
+
+
 @dataclass
 class NonlinearTransferFunction:
     """非線形転送関数の定義"""
@@ -39,6 +111,7 @@ class NonlinearInterlayerTransfer:
         self._register_default_functions()
         self.global_strength: float = 1.0
         self.log_align_compensation: bool = True
+        self.refresh_kernel_table()
         
     def _register_default_functions(self):
         """デフォルトの非線形転送関数を登録"""
@@ -91,18 +164,57 @@ class NonlinearInterlayerTransfer:
             )
         )
     
+    def refresh_kernel_table(self):
+        """
+        登録済み転送関数をカーネル用の係数テーブルに詰め直す
+        
+        transfer_functions の要素を直接書き換えた場合はこれを呼ぶ（件数の変化は自動検出）。
+        組み込み以外の転送関数が含まれる場合はテーブルを作らず、Python経路で計算する。
+        """
+        kinds = {
+            self._saturating_suppression: _KIND_SATURATING_SUPPRESSION,
+            self._saturating_transfer: _KIND_SATURATING_TRANSFER,
+            self._kappa_weighted_suppression: _KIND_KAPPA_WEIGHTED_SUPPRESSION,
+            self._pain_transfer: _KIND_PAIN_TRANSFER,
+        }
+        rows = []
+        for func_def in self.transfer_functions:
+            kind = kinds.get(func_def.transfer_function)
+            if kind is None:
+                rows = None
+                break
+            rows.append((kind, func_def.source_layer.value, func_def.target_layer.value,
+                         func_def.base_coefficient, func_def.log_align_adaptation))
+        self._kernel_table = None if rows is None else np.array(rows, dtype=np.float64).reshape(-1, 5)
+        self._kernel_table_len = len(self.transfer_functions)
+    
     def compute_transfer(self, E: np.ndarray, kappa: np.ndarray, log_aligned: bool = True) -> np.ndarray:
-        """非線形層間転送を計算"""
-        transfer = np.zeros(4)
+        """
+        非線形層間転送を計算
+        
+        E, kappa は (4,) または先頭にバッチ軸を持つ (B, 4)。転送関数は要素演算のみなので
+        バッチ入力ではレイヤー列ごとにまとめて評価される。
+        1エージェント入力で組み込み関数のみの場合は係数テーブル上のカーネルで計算する。
+        """
+        if self._kernel_table_len != len(self.transfer_functions):
+            self.refresh_kernel_table()
+        if self._kernel_table is not None and np.ndim(E) == 1:
+            return _compute_transfer_kernel(
+                np.asarray(E, dtype=np.float64), np.asarray(kappa, dtype=np.float64),
+                self._kernel_table, log_aligned and self.log_align_compensation,
+                float(self.global_strength)
+            )
+        
+        transfer = np.zeros(np.shape(E))
         
         for func_def in self.transfer_functions:
             src_idx = func_def.source_layer.value
             tgt_idx = func_def.target_layer.value
             
-            E_source = E[src_idx]
-            E_target = E[tgt_idx]
-            kappa_source = kappa[src_idx]
-            kappa_target = kappa[tgt_idx]
+            E_source = E[..., src_idx]
+            E_target = E[..., tgt_idx]
+            kappa_source = kappa[..., src_idx]
+            kappa_target = kappa[..., tgt_idx]
             
             # 非線形転送量を計算
             transfer_amount = func_def.transfer_function(
@@ -119,34 +231,25 @@ class NonlinearInterlayerTransfer:
             # 全体強度適用
             base_transfer *= self.global_strength
             
-            transfer[tgt_idx] += base_transfer
+            transfer[..., tgt_idx] += base_transfer
         
         return transfer
     
     def _saturating_suppression(self, E_source: float, E_target: float, kappa_source: float, kappa_target: float) -> float:
         """飽和抑制関数"""
-        suppression_power = E_source * kappa_source * 0.8
-        resistance = 1.0 + E_target / 8.0
-        return suppression_power / resistance
+        return _saturating_suppression_fn(E_source, E_target, kappa_source, kappa_target)
     
     def _saturating_transfer(self, E_source: float, E_target: float, kappa_source: float, kappa_target: float) -> float:
         """飽和転送関数"""
-        transfer_power = E_source * 0.9
-        saturation_factor = 1.0 / (1.0 + E_target / 40.0)
-        receptivity = kappa_target / 2.2
-        return transfer_power * saturation_factor * receptivity
+        return _saturating_transfer_fn(E_source, E_target, kappa_source, kappa_target)
     
     def _kappa_weighted_suppression(self, E_source: float, E_target: float, kappa_source: float, kappa_target: float) -> float:
         """κ重み付き抑制関数"""
-        suppression_strength = E_source * (kappa_source / 1.8)
-        resistance = 1.0 + E_target / 15.0
-        return suppression_strength / resistance
+        return _kappa_weighted_suppression_fn(E_source, E_target, kappa_source, kappa_target)
     
     def _pain_transfer(self, E_source: float, E_target: float, kappa_source: float, kappa_target: float) -> float:
         """痛覚転送関数"""
-        pain_intensity = E_source * 0.9
-        pain_sensitivity = 1.8 / (kappa_source + 1.0)
-        return pain_intensity * pain_sensitivity
+        return _pain_transfer_fn(E_source, E_target, kappa_source, kappa_target)
     
     def set_global_strength(self, strength: float):
         """全体的な転送強度を設定"""
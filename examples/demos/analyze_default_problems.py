@@ -117,7 +117,7 @@ def test_default_settings_problem():
             
             # ステップ実行（物理修正版を手動実装）
             pressure_test = np.array([200.0, 0.0, 0.0, 0.0])
-            if params == realistic_params:
+            if params is realistic_params:
                 # 物理修正版の簡易実装
                 j_test = pressure_test[0] / 1000.0  # p/R
                 resid_test = max(0, pressure_test[0] - j_test)
@@ -28,9 +28,9 @@ def analyze_leap_blocking_factors():
     
     print(f"📊 設定パラメータ:")
     print(f"   Log-Alignment: {params.log_align}")
-    print(f"   Theta閾値: {params.Theta_values}")
-    print(f"   Gamma値: {params.gamma_values}")
-    print(f"   Beta値: {params.beta_values}")
+    print(f"   Theta閾値: {np.asarray(params.Theta_values).tolist()}")
+    print(f"   Gamma値: {np.asarray(params.gamma_values).tolist()}")
+    print(f"   Beta値: {np.asarray(params.beta_values).tolist()}")
     print(f"   R値: {params.R_values}")
     print()
     
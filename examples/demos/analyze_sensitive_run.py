@@ -18,11 +18,11 @@ def analyze_leap_conditions():
     print("🔬 高感度版LEAP条件分析")
     print("="*80)
     
-    print(f"📊 Theta閾値: {params.Theta_values}")
+    print(f"📊 Theta閾値: {np.asarray(params.Theta_values).tolist()}")
     print(f"🎯 最低LEAP閾値: {min(params.Theta_values)}")
     print(f"⚡ Dynamic Theta感度: {params.theta_sensitivity}")
-    print(f"🔋 Gamma値: {params.gamma_values}")
-    print(f"📉 Beta値: {params.beta_values}")
+    print(f"🔋 Gamma値: {np.asarray(params.gamma_values).tolist()}")
+    print(f"📉 Beta値: {np.asarray(params.beta_values).tolist()}")
     
     # 理論的最大エネルギー計算
     max_gamma = max(params.gamma_values)
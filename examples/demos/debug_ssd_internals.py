@@ -27,9 +27,9 @@ def debug_ssd_internals():
     params.beta_values = [0.001, 0.01, 0.05, 0.1]  # 小さなBeta
     
     print(f"📊 デバッグ用パラメータ:")
-    print(f"   Theta: {params.Theta_values}")
-    print(f"   Gamma: {params.gamma_values}")
-    print(f"   Beta: {params.beta_values}")
+    print(f"   Theta: {np.asarray(params.Theta_values).tolist()}")
+    print(f"   Gamma: {np.asarray(params.gamma_values).tolist()}")
+    print(f"   Beta: {np.asarray(params.beta_values).tolist()}")
     print(f"   R: {params.R_values}")
     print(f"   G0: {params.G0}, g: {params.g}")
     print()
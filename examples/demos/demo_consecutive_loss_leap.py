@@ -206,7 +206,7 @@ def run_consecutive_loss_experiment():
     
     for agent in agents:
         print(f"\n【{agent.name}】({agent.sensitivity}感度)")
-        print(f"閾値: {agent.params.Theta_values}")
+        print(f"閾値: {np.asarray(agent.params.Theta_values).tolist()}")
         print(f"温度: {agent.params.temperature_T}")
         print("-" * 60)
         
@@ -235,8 +235,8 @@ def run_consecutive_loss_experiment():
                           f"→ {np.linalg.norm(diagnostics['processed_pressure']):.2f}")
         
         # エージェント別まとめ
-        total_leaps = sum(agent.history['leap_events'])
-        max_energy = max(agent.history['total_energy']) if agent.history['total_energy'] else 0
+        total_leaps = int(np.count_nonzero(agent.history['leap_events']))
+        max_energy = float(np.max(agent.history['total_energy'])) if agent.history['total_energy'] else 0.0
         final_kappa = np.mean(agent.state.kappa)
         
         print(f"\n{agent.name} 結果:")
@@ -329,10 +329,10 @@ def analyze_leap_conditions(agents: List[LeapExperimentAgent]):
     for agent in agents:
         print(f"\n【{agent.name}】")
         
-        leap_indices = [i for i, leap in enumerate(agent.history['leap_events']) if leap]
+        leap_indices = np.flatnonzero(agent.history['leap_events'])
         
-        if leap_indices:
-            print(f"跳躍発生: {len(leap_indices)}回")
+        if leap_indices.size:
+            print(f"跳躍発生: {leap_indices.size}回")
             
             for i, leap_idx in enumerate(leap_indices):
                 leap_round = agent.history['round'][leap_idx]
@@ -352,7 +352,7 @@ def analyze_leap_conditions(agents: List[LeapExperimentAgent]):
                     print(f"    エネルギー急増: {pre_energy:.1f} → {leap_energy:.1f} (+{energy_jump:.1f})")
         else:
             print("跳躍発生: 0回（完全な堰き止め効果）")
-            max_energy = max(agent.history['total_energy'])
+            max_energy = float(np.max(agent.history['total_energy']))
             threshold = np.mean(agent.params.Theta_values)
             print(f"  最大エネルギー: {max_energy:.1f} (閾値: {threshold:.1f})")
             print(f"  堰き止め効果: {((threshold - max_energy) / threshold * 100):.1f}%の余裕")
@@ -10,6 +10,8 @@ Log版エンジンによる「対数整合 ↔ 指数跳躍」双対性の実装
 3. 線形安定化と非連続創発の双対モード
 """
 
+import math
+import os
 import sys
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
@@ -18,16 +20,24 @@ import numpy as np
 import matplotlib.pyplot as plt
 from ssd_core_engine_log import SSDCoreEngine, SSDCoreParams, SSDCoreState
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 import matplotlib
 
+from ssd_jit import njit
+
 # 日本語フォント設定
 matplotlib.rcParams['font.family'] = ['DejaVu Sans', 'Hiragino Sans', 'Yu Gothic', 'Meiryo', 'Takao', 'IPAexGothic', 'IPAPGothic', 'VL PGothic', 'Noto Sans CJK JP']
 
+# デモ共通の乱数生成器（PCG64、一括サンプリング用）
+_RNG = np.random.default_rng(0)
+
+# 可視化の有効/無効（--no-plot または SSD_SHOW_PLOTS=0 で描画を完全にスキップ）
+SHOW_PLOTS = os.environ.get('SSD_SHOW_PLOTS', '1') == '1' and '--no-plot' not in sys.argv
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class LogExpDualityParams:
-    """対数整合・指数跳躍双対性パラメータ"""
+    """対数整合・指数跳躍双対性パラメータ（不変・共有可能）"""
     # 対数整合パラメータ
     weber_constant: float = 0.1  # ウェーバー定数
     linearization_base: float = 10.0  # 対数底
@@ -42,30 +52,169 @@ class LogExpDualityParams:
     leap_sensitivity: float = 0.3  # 跳躍感度
 
 
+# 各デモ用の双対性パラメータ（不変なのでモジュールで1回だけ生成して共有）
+LINEARIZATION_DUALITY_PARAMS = LogExpDualityParams(
+    critical_threshold=200.0,  # 非常に高い閾値
+    exponential_gamma=10.0,   # 緩やかな指数増大
+    coherence_weight=0.9,     # 整合モード優勢
+    leap_sensitivity=0.1      # 低い跳躍感度
+)
+TRANSITION_DUALITY_PARAMS = LogExpDualityParams(
+    critical_threshold=100.0,  # 高い閾値で整合モード優勢
+    exponential_gamma=8.0,    # 緩やかな指数増大
+    leap_sensitivity=0.2      # 低い跳躍感度
+)
+PARADIGM_DUALITY_PARAMS = LogExpDualityParams(
+    weber_constant=0.05,     # 繊細な知覚
+    critical_threshold=200.0,  # 非常に高い知的閾値
+    exponential_gamma=15.0,  # 革命的な跳躍
+    coherence_weight=0.95,   # 通常は強く整合優勢
+    leap_sensitivity=0.1     # 非常に慎重な跳躍
+)
+
+
+# ホットパスで使うufuncの束縛（step毎の np.xxx 属性探索を避ける）
+_maximum = np.maximum
+_minimum = np.minimum
+_log = np.log
+_log1p = np.log1p
+_abs = np.abs
+_copysign = np.copysign
+_exp = np.exp
+_sqrt = np.sqrt
+_einsum = np.einsum
+_sqrt_scalar = math.sqrt
+_exp_scalar = math.exp
+
+
+def _norm(v: np.ndarray) -> float:
+    """小ベクトル用L2ノルム（np.linalg.normのord分岐を経由しない）"""
+    return _sqrt_scalar(v.dot(v))
+
+
+@njit(cache=True, fastmath=True)
+def _dual_mode_core(
+    raw_pressure: np.ndarray,
+    coherent_pressure: np.ndarray,
+    E: np.ndarray,
+    Theta: float,
+    inv_gamma: float,
+    h0: float,
+    base_coherence_weight: float,
+    leap_sensitivity: float
+):
+    """
+    双対モード処理の数値コア（Numba JIT）
+    
+    層数が小さい（≤4）ためufunc呼び出しのディスパッチが支配的になる部分を
+    スカラーループ1関数にまとめる。
+    
+    Returns:
+        (最終圧力, 跳躍モードフラグ, 最大跳躍確率, 整合重み, 跳躍重み, 総エネルギー)
+    """
+    n = E.shape[0]
+    
+    # 総エネルギーと最大エネルギー
+    # モード判定は更新前のEを使うため、合計は最大値探索と同じ1パスで求める
+    # （別途の累積値を状態に持たせても走査回数は減らない）
+    total_energy = 0.0
+    max_energy = E[0]
+    for i in range(n):
+        total_energy += E[i]
+        if E[i] > max_energy:
+            max_energy = E[i]
+    
+    # 最大跳躍確率 max_i min(h_0 * exp(max(E_i - Θ, 0)/γ), 1)
+    # 各演算は単調なので、最大エネルギーに対するexp 1回で求まる
+    excess = max_energy - Theta
+    if excess < 0.0:
+        excess = 0.0
+    max_leap_prob = h0 * np.exp(excess * inv_gamma)
+    if max_leap_prob > 1.0:
+        max_leap_prob = 1.0
+    
+    # 双対モード重み
+    coherence_weight = base_coherence_weight * (1.0 - max_leap_prob)
+    leap_weight = leap_sensitivity * max_leap_prob
+    
+    # 統合圧力
+    final_pressure = np.empty(n)
+    leap_mode = max_leap_prob > 0.5
+    if leap_mode:
+        leap_amplification = 1.0 + leap_weight * np.exp(total_energy * inv_gamma)
+        for i in range(n):
+            final_pressure[i] = raw_pressure[i] * leap_amplification
+    else:
+        for i in range(n):
+            final_pressure[i] = (coherence_weight * coherent_pressure[i]
+                                 + (1.0 - coherence_weight) * raw_pressure[i])
+    
+    return final_pressure, leap_mode, max_leap_prob, coherence_weight, leap_weight, total_energy
+
+
 class LogExpDualityEngine:
     """対数整合・指数跳躍双対性エンジン"""
     
+    HISTORY_KEYS = ('time', 'raw_input', 'log_coherent', 'exp_leap',
+                    'coherence_mode', 'leap_probability', 'total_energy')
+    HISTORY_INITIAL_CAPACITY = 1024
+    SEQUENCE_TILE = 64
+    
     def __init__(self, ssd_engine: SSDCoreEngine, duality_params: LogExpDualityParams):
         self.ssd_engine = ssd_engine
         self.params = duality_params
-        self.history = {
-            'time': [],
-            'raw_input': [],
-            'log_coherent': [],
-            'exp_leap': [],
-            'coherence_mode': [],
-            'leap_probability': [],
-            'total_energy': []
-        }
+        
+        # 履歴バッファ（事前確保したfloat64配列、満杯時に容量倍増）
+        self._n = 0
+        self._t = 0.0  # 記録時刻（ステップ毎にdtを加算）
+        self._cap = self.HISTORY_INITIAL_CAPACITY
+        self._history_buf = {key: np.empty(self._cap) for key in self.HISTORY_KEYS}
+        
+        # エンジン定数のキャッシュ（paramsは不変）
+        self._k = self.params.weber_constant
+        self._inv_log_base = 1.0 / np.log(self.params.linearization_base)
+        self._theta = self.params.critical_threshold
+        self._inv_gamma = 1.0 / self.params.exponential_gamma
+        self._h0 = self.params.jump_intensity
+        self._coherence_weight = self.params.coherence_weight
+        self._leap_sensitivity = self.params.leap_sensitivity
+        
+        # ウェーバー・フェヒナー変換の作業バッファ（ステップ毎の再確保を避ける）
+        self._wf_buf = np.empty(ssd_engine.num_layers)
+    
+    @property
+    def history(self) -> dict:
+        """記録済み履歴（各キーは長さ_nのndarrayビュー）"""
+        n = self._n
+        return {key: buf[:n] for key, buf in self._history_buf.items()}
+    
+    def _record_history(self, **values) -> None:
+        """履歴バッファへ1ステップ分を書き込む"""
+        if self._n == self._cap:
+            self._cap *= 2
+            for key, buf in self._history_buf.items():
+                self._history_buf[key] = np.resize(buf, self._cap)
+        n = self._n
+        for key, value in values.items():
+            self._history_buf[key][n] = value
+        self._n = n + 1
     
     def weber_fechner_transform(self, stimulus: np.ndarray) -> np.ndarray:
         """
         ウェーバー・フェヒナー法則による対数変換
         感覚強度 = k * log(刺激強度/閾値)
+        
+        閾値は1.0のため除算は省略し、作業バッファ上で max → log → ×k を行う。
+        戻り値はエンジン内部のバッファ（次回呼び出しで上書き）なので、
+        保持する場合は呼び出し側で .copy() すること。
         """
-        k = self.params.weber_constant
-        threshold = 1.0
-        return k * np.log(np.maximum(stimulus, threshold) / threshold)
+        if stimulus.shape == self._wf_buf.shape:
+            sensation = _maximum(stimulus, 1.0, out=self._wf_buf)
+        else:
+            sensation = _maximum(stimulus, 1.0)
+        _log(sensation, out=sensation)
+        sensation *= self._k
+        return sensation
     
     def logarithmic_coherence(self, raw_pressure: np.ndarray) -> np.ndarray:
         """
@@ -73,12 +222,15 @@ class LogExpDualityEngine:
         - 意味圧の対数スケール圧縮
         - 線形的に扱える形への変換
         """
-        # ウェーバー・フェヒナー変換
+        # ウェーバー・フェヒナー変換（内部バッファ、ここで消費するのでコピー不要）
         linearized = self.weber_fechner_transform(raw_pressure)
         
-        # 対数整合による安定化
-        base = self.params.linearization_base
-        coherent_pressure = np.sign(linearized) * np.log(1 + np.abs(linearized)) / np.log(base)
+        # 対数整合による安定化: sign(x)·log(1+|x|)/log(b) = copysign(log1p(|x|), x)/log(b)
+        # （arcsinh(x)/log(b) なら1パスだが |x|→0 付近の値が変わるため厳密形を採用）
+        coherent_pressure = _abs(linearized)
+        _log1p(coherent_pressure, out=coherent_pressure)
+        _copysign(coherent_pressure, linearized, out=coherent_pressure)
+        coherent_pressure *= self._inv_log_base
         
         return coherent_pressure
     
@@ -87,44 +239,49 @@ class LogExpDualityEngine:
         指数跳躍確率：整合限界超過時の非連続転換
         h = h_0 * exp((E - Θ)/γ)
         """
-        Theta = self.params.critical_threshold
-        gamma = self.params.exponential_gamma
-        h0 = self.params.jump_intensity
-        
         # エネルギーが閾値を超えた部分のみ指数増大
-        excess_energy = np.maximum(energy - Theta, 0)
-        leap_prob = h0 * np.exp(excess_energy / gamma)
+        excess_energy = _maximum(energy - self._theta, 0)
+        leap_prob = self._h0 * _exp(excess_energy * self._inv_gamma)
         
-        return np.minimum(leap_prob, 1.0)  # 確率なので上限1
-    
-    def dual_mode_processing(self, raw_pressure: np.ndarray, current_state: SSDCoreState) -> Tuple[np.ndarray, dict]:
+        return _minimum(leap_prob, 1.0)  # 確率なので上限1
+    
+    def _max_leap_prob(self, E: np.ndarray) -> float:
+        """最大跳躍確率 min(h_0·exp(max(max(E) - Θ, 0)/γ), 1) のスカラー評価"""
+        excess = max(0.0, float(E.max()) - self._theta)
+        return min(1.0, self._h0 * _exp_scalar(min(excess * self._inv_gamma, 700.0)))
+    
+    def _coherence_needed(self, E: np.ndarray) -> bool:
+        """整合モードの統合圧力に対数整合結果が寄与するか"""
+        return self._coherence_weight != 0.0 and self._max_leap_prob(E) <= 0.5
+    
+    def dual_mode_processing(
+        self,
+        raw_pressure: np.ndarray,
+        current_state: SSDCoreState,
+        coherent_pressure: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, dict]:
         """
         双対モード処理：対数整合と指数跳躍の統合
-        """
-        # 1. 対数整合モード（線形化・安定化）
-        coherent_pressure = self.logarithmic_coherence(raw_pressure)
         
-        # 2. 現在のエネルギー状態評価
-        total_energy = np.sum(current_state.E)
-        
-        # 3. 指数跳躍確率計算
-        leap_probs = self.exponential_leap_probability(current_state.E)
-        max_leap_prob = np.max(leap_probs)
-        
-        # 4. 双対モード重み計算
-        coherence_weight = self.params.coherence_weight * (1 - max_leap_prob)
-        leap_weight = self.params.leap_sensitivity * max_leap_prob
+        coherent_pressure を渡した場合は対数整合の再計算を省略する。
+        渡されず、跳躍モードが確定している（または整合重みが0の）場合は
+        対数整合自体を計算せず、診断情報の coherent_pressure は None になる。
+        """
+        # 1. 対数整合モード（線形化・安定化）— 結果が使われる場合のみ計算
+        if coherent_pressure is None and self._coherence_needed(current_state.E):
+            coherent_pressure = self.logarithmic_coherence(raw_pressure)
         
-        # 5. 統合圧力計算
-        if max_leap_prob > 0.5:  # 跳躍モード優勢
-            # 指数的増強による非連続変化
-            leap_amplification = 1 + leap_weight * np.exp(total_energy / self.params.exponential_gamma)
-            final_pressure = raw_pressure * leap_amplification
-            mode = "指数跳躍"
-        else:  # 整合モード優勢
-            # 対数的安定化による線形処理
-            final_pressure = coherence_weight * coherent_pressure + (1 - coherence_weight) * raw_pressure
-            mode = "対数整合"
+        # 2-5. エネルギー評価・指数跳躍確率・双対モード重み・統合圧力（JITコア）
+        # coherent_pressure 未計算時は整合項が寄与しないため raw_pressure を代入しておく
+        (final_pressure, leap_mode, max_leap_prob,
+         coherence_weight, leap_weight, total_energy) = _dual_mode_core(
+            raw_pressure,
+            raw_pressure if coherent_pressure is None else coherent_pressure,
+            current_state.E,
+            self._theta, self._inv_gamma, self._h0,
+            self._coherence_weight, self._leap_sensitivity
+        )
+        mode = "指数跳躍" if leap_mode else "対数整合"
         
         # 診断情報
         diagnostics = {
@@ -140,21 +297,106 @@ class LogExpDualityEngine:
     
     def step(self, raw_pressure: np.ndarray, state: SSDCoreState, dt: float = 0.1) -> Tuple[SSDCoreState, dict]:
         """双対性エンジンの1ステップ実行"""
+        return self._advance(raw_pressure, None, _norm(raw_pressure), None, state, dt)
+    
+    def run_constant(
+        self,
+        raw_pressure: np.ndarray,
+        state: SSDCoreState,
+        steps: int,
+        dt: float = 0.1
+    ) -> Tuple[SSDCoreState, List[dict]]:
+        """
+        一定圧力下でstepsステップ連続実行
+        
+        入力のみに依存する対数整合とノルムはループ外で1回だけ計算し、
+        各ステップでは跳躍判定とコア更新のみを行う。
+        
+        Returns:
+            (最終状態, 各ステップの診断情報リスト)
+        """
+        coherent_pressure = self.logarithmic_coherence(raw_pressure)
+        raw_norm = _norm(raw_pressure)
+        coherent_norm = _norm(coherent_pressure)
+        
+        trajectory = []
+        for _ in range(steps):
+            state, diagnostics = self._advance(
+                raw_pressure, coherent_pressure, raw_norm, coherent_norm, state, dt
+            )
+            trajectory.append(diagnostics)
+        
+        return state, trajectory
+    
+    def run_sequence(
+        self,
+        raw_inputs: np.ndarray,
+        state: SSDCoreState,
+        dt: float = 0.1
+    ) -> Tuple[SSDCoreState, List[dict]]:
+        """
+        時系列入力 (time_steps, num_layers) を順に実行
+        
+        SEQUENCE_TILEステップ単位で対数整合とノルムを一括計算し
+        （(64, 4) float64 = 2KiBでL1に収まる）、タイル内は逐次ステップのみ行う。
+        
+        Returns:
+            (最終状態, 各ステップの診断情報リスト)
+        """
+        tile = self.SEQUENCE_TILE
+        trajectory = []
+        for t0 in range(0, len(raw_inputs), tile):
+            raw_tile = raw_inputs[t0:t0 + tile]
+            coherent_tile = self.logarithmic_coherence(raw_tile)
+            raw_norms = _sqrt(_einsum('ij,ij->i', raw_tile, raw_tile))
+            coherent_norms = _sqrt(_einsum('ij,ij->i', coherent_tile, coherent_tile))
+            
+            for i in range(len(raw_tile)):
+                state, diagnostics = self._advance(
+                    raw_tile[i], coherent_tile[i], raw_norms[i], coherent_norms[i], state, dt
+                )
+                trajectory.append(diagnostics)
+        
+        return state, trajectory
+    
+    def _advance(
+        self,
+        raw_pressure: np.ndarray,
+        coherent_pressure: Optional[np.ndarray],
+        raw_norm: float,
+        coherent_norm: Optional[float],
+        state: SSDCoreState,
+        dt: float
+    ) -> Tuple[SSDCoreState, dict]:
+        """
+        1ステップ進める（step/run_*共通部）
+        
+        coherent_pressure / coherent_norm が None の場合は必要時のみ内部で計算し、
+        対数整合を省略したステップの履歴 log_coherent は NaN になる。
+        """
         
         # 双対モード処理
-        processed_pressure, diagnostics = self.dual_mode_processing(raw_pressure, state)
+        processed_pressure, diagnostics = self.dual_mode_processing(
+            raw_pressure, state, coherent_pressure
+        )
+        if coherent_norm is None:
+            coherent = diagnostics['coherent_pressure']
+            coherent_norm = _norm(coherent) if coherent is not None else np.nan
         
         # SSDコアエンジンで状態更新
         new_state = self.ssd_engine.step(state, processed_pressure, dt)
         
         # 履歴記録
-        self.history['time'].append(len(self.history['time']) * dt)
-        self.history['raw_input'].append(np.linalg.norm(raw_pressure))
-        self.history['log_coherent'].append(np.linalg.norm(diagnostics['coherent_pressure']))
-        self.history['exp_leap'].append(diagnostics['leap_probability'])
-        self.history['coherence_mode'].append(1 if diagnostics['mode'] == "対数整合" else 0)
-        self.history['leap_probability'].append(diagnostics['leap_probability'])
-        self.history['total_energy'].append(diagnostics['total_energy'])
+        self._record_history(
+            time=self._t,
+            raw_input=raw_norm,
+            log_coherent=coherent_norm,
+            exp_leap=diagnostics['leap_probability'],
+            coherence_mode=1 if diagnostics['mode'] == "対数整合" else 0,
+            leap_probability=diagnostics['leap_probability'],
+            total_energy=diagnostics['total_energy'],
+        )
+        self._t += dt
         
         return new_state, diagnostics
 
@@ -180,34 +422,28 @@ def demo_nonlinear_world_linearization():
     )
     
     ssd_engine = SSDCoreEngine(params)
-    duality_params = LogExpDualityParams(
-        critical_threshold=200.0,  # 非常に高い閾値
-        exponential_gamma=10.0,   # 緩やかな指数増大
-        coherence_weight=0.9,     # 整合モード優勢
-        leap_sensitivity=0.1      # 低い跳躍感度
-    )
-    dual_engine = LogExpDualityEngine(ssd_engine, duality_params)
+    dual_engine = LogExpDualityEngine(ssd_engine, LINEARIZATION_DUALITY_PARAMS)
     
     # 非線形入力信号（距離の二乗反比例的な「意味圧」）
     time_steps = 100
     distances = np.linspace(1, 10, time_steps)
-    nonlinear_inputs = []
+    t = np.arange(time_steps)
     
-    for i, d in enumerate(distances):
-        # 意味圧は距離の二乗に反比例 + ランダム変動
-        meaning_pressure = 100.0 / (d ** 2) + 10 * np.sin(i * 0.1) + np.random.normal(0, 2)
-        nonlinear_inputs.append(np.array([meaning_pressure, meaning_pressure*0.8, meaning_pressure*0.6, meaning_pressure*0.4]))
+    # 意味圧は距離の二乗に反比例 + ランダム変動（全ステップを一括生成）
+    meaning_pressure = 100.0 / distances ** 2 + 10 * np.sin(0.1 * t) + 2.0 * _RNG.standard_normal(time_steps)
+    layer_weights = np.array([1.0, 0.8, 0.6, 0.4])
+    nonlinear_inputs = meaning_pressure[:, None] * layer_weights[None, :]  # (time_steps, num_layers)
     
     # シミュレーション実行
     state = SSDCoreState(E=np.zeros(4), kappa=np.ones(4))
     
-    for i, raw_input in enumerate(nonlinear_inputs):
-        state, diagnostics = dual_engine.step(raw_input, state)
-        
-        if i % 20 == 0:
-            print(f"Step {i:3d}: Raw={np.linalg.norm(raw_input):6.2f}, "
-                  f"Mode={diagnostics['mode']:8s}, "
-                  f"LeapProb={diagnostics['leap_probability']:.3f}")
+    state, trajectory = dual_engine.run_sequence(nonlinear_inputs, state)
+    
+    for i in range(0, time_steps, 20):
+        diagnostics = trajectory[i]
+        print(f"Step {i:3d}: Raw={np.linalg.norm(nonlinear_inputs[i]):6.2f}, "
+              f"Mode={diagnostics['mode']:8s}, "
+              f"LeapProb={diagnostics['leap_probability']:.3f}")
     
     print("\n✅ 非線形世界の線形化完了")
     return dual_engine
@@ -235,12 +471,7 @@ def demo_coherence_to_leap_transition():
     )
     
     ssd_engine = SSDCoreEngine(params)
-    duality_params = LogExpDualityParams(
-        critical_threshold=100.0,  # 高い閾値で整合モード優勢
-        exponential_gamma=8.0,    # 緩やかな指数増大
-        leap_sensitivity=0.2      # 低い跳躍感度
-    )
-    dual_engine = LogExpDualityEngine(ssd_engine, duality_params)
+    dual_engine = LogExpDualityEngine(ssd_engine, TRANSITION_DUALITY_PARAMS)
     
     # 段階的に増大する圧力（整合限界のテスト）
     pressure_phases = [
@@ -250,7 +481,9 @@ def demo_coherence_to_leap_transition():
     ]
     
     state = SSDCoreState(E=np.zeros(3), kappa=np.ones(3))
-    phase_transitions = []
+    phase_transitions = np.empty(
+        len(pressure_phases), dtype=[('phase', 'i4'), ('p_norm', 'f8'), ('dE', 'f8')]
+    )
     
     print(f"{'Phase':<8} {'Step':<6} {'Pressure':<10} {'Energy':<10} {'Mode':<10} {'LeapProb':<10}")
     print("-" * 70)
@@ -258,19 +491,21 @@ def demo_coherence_to_leap_transition():
     step_count = 0
     for phase_num, (steps, pressure) in enumerate(pressure_phases, 1):
         phase_start_energy = np.sum(state.E)
+        pressure_norm = np.linalg.norm(pressure)
+        
+        state, trajectory = dual_engine.run_constant(pressure, state, steps)
         
-        for i in range(steps):
-            state, diagnostics = dual_engine.step(pressure, state)
+        for i, diagnostics in enumerate(trajectory):
             step_count += 1
             
             if i % 10 == 0 or diagnostics['leap_probability'] > 0.3:
-                print(f"Phase{phase_num:<3} {step_count:<6} {np.linalg.norm(pressure):<10.2f} "
+                print(f"Phase{phase_num:<3} {step_count:<6} {pressure_norm:<10.2f} "
                       f"{diagnostics['total_energy']:<10.2f} {diagnostics['mode']:<10} "
                       f"{diagnostics['leap_probability']:<10.3f}")
         
         phase_end_energy = np.sum(state.E)
         energy_change = phase_end_energy - phase_start_energy
-        phase_transitions.append((phase_num, pressure, energy_change))
+        phase_transitions[phase_num - 1] = (phase_num, pressure_norm, energy_change)
         print(f"  → Phase {phase_num} 終了: エネルギー変化 = {energy_change:.2f}")
     
     print("\n✅ 整合→跳躍転換デモ完了")
@@ -299,14 +534,7 @@ def demo_knowledge_paradigm_shift():
     )
     
     ssd_engine = SSDCoreEngine(params)
-    duality_params = LogExpDualityParams(
-        weber_constant=0.05,     # 繊細な知覚
-        critical_threshold=200.0,  # 非常に高い知的閾値
-        exponential_gamma=15.0,  # 革命的な跳躍
-        coherence_weight=0.95,   # 通常は強く整合優勢
-        leap_sensitivity=0.1     # 非常に慎重な跳躍
-    )
-    dual_engine = LogExpDualityEngine(ssd_engine, duality_params)
+    dual_engine = LogExpDualityEngine(ssd_engine, PARADIGM_DUALITY_PARAMS)
     
     # 科学的発見シナリオ
     scenarios = [
@@ -317,29 +545,31 @@ def demo_knowledge_paradigm_shift():
     ]
     
     state = SSDCoreState(E=np.zeros(3), kappa=np.ones(3))
-    paradigm_history = []
+    paradigm_history = np.empty(
+        len(scenarios), dtype=[('scenario', 'U32'), ('start', 'i4'), ('end', 'i4')]
+    )
     
     print(f"{'Scenario':<20} {'Mode':<12} {'Energy':<8} {'LeapProb':<8} {'Description'}")
     print("-" * 80)
     
-    for scenario_name, steps, pressure in scenarios:
+    for scenario_idx, (scenario_name, steps, pressure) in enumerate(scenarios):
         scenario_start = len(dual_engine.history['time'])
         
-        for i in range(steps):
-            state, diagnostics = dual_engine.step(pressure, state)
-            
-            if i == steps - 1:  # 各シナリオの最終状態
-                if diagnostics['mode'] == "対数整合":
-                    description = "安定的知識蓄積"
-                else:
-                    description = "パラダイム転換！"
-                
-                print(f"{scenario_name:<20} {diagnostics['mode']:<12} "
-                      f"{diagnostics['total_energy']:<8.1f} {diagnostics['leap_probability']:<8.3f} "
-                      f"{description}")
+        state, trajectory = dual_engine.run_constant(pressure, state, steps)
+        
+        # 各シナリオの最終状態
+        diagnostics = trajectory[-1]
+        if diagnostics['mode'] == "対数整合":
+            description = "安定的知識蓄積"
+        else:
+            description = "パラダイム転換！"
+        
+        print(f"{scenario_name:<20} {diagnostics['mode']:<12} "
+              f"{diagnostics['total_energy']:<8.1f} {diagnostics['leap_probability']:<8.3f} "
+              f"{description}")
         
         scenario_end = len(dual_engine.history['time'])
-        paradigm_history.append((scenario_name, scenario_start, scenario_end))
+        paradigm_history[scenario_idx] = (scenario_name, scenario_start, scenario_end)
     
     print("\n✅ パラダイムシフトモデル完了")
     return dual_engine, paradigm_history
@@ -348,18 +578,22 @@ def demo_knowledge_paradigm_shift():
 def visualize_log_exp_duality(dual_engine, title="対数整合と指数跳躍の双対性"):
     """双対性の可視化"""
     
-    if not dual_engine.history['time']:
+    if not SHOW_PLOTS:
+        return
+    
+    history = dual_engine.history
+    if not history['time'].size:
         print("⚠️ 履歴データがありません")
         return
     
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     fig.suptitle(title, fontsize=16, fontweight='bold')
     
-    time = dual_engine.history['time']
+    time = history['time']
     
     # 1. 入力と対数変換
-    axes[0, 0].plot(time, dual_engine.history['raw_input'], 'b-', label='生入力（非線形）', linewidth=2)
-    axes[0, 0].plot(time, dual_engine.history['log_coherent'], 'g-', label='対数整合', linewidth=2)
+    axes[0, 0].plot(time, history['raw_input'], 'b-', label='生入力（非線形）', linewidth=2)
+    axes[0, 0].plot(time, history['log_coherent'], 'g-', label='対数整合', linewidth=2)
     axes[0, 0].set_title('非線形世界の線形化')
     axes[0, 0].set_xlabel('時間')
     axes[0, 0].set_ylabel('圧力強度')
@@ -367,7 +601,7 @@ def visualize_log_exp_duality(dual_engine, title="対数整合と指数跳躍の
     axes[0, 0].grid(True, alpha=0.3)
     
     # 2. 指数跳躍確率
-    axes[0, 1].plot(time, dual_engine.history['exp_leap'], 'r-', label='跳躍確率', linewidth=2)
+    axes[0, 1].plot(time, history['exp_leap'], 'r-', label='跳躍確率', linewidth=2)
     axes[0, 1].axhline(y=0.5, color='orange', linestyle='--', label='跳躍閾値')
     axes[0, 1].set_title('指数跳躍確率')
     axes[0, 1].set_xlabel('時間')
@@ -376,9 +610,9 @@ def visualize_log_exp_duality(dual_engine, title="対数整合と指数跳躍の
     axes[0, 1].grid(True, alpha=0.3)
     
     # 3. 双対モード切り替え
-    axes[1, 0].fill_between(time, dual_engine.history['coherence_mode'], 
+    axes[1, 0].fill_between(time, history['coherence_mode'], 
                            alpha=0.6, color='green', label='対数整合モード')
-    axes[1, 0].fill_between(time, [1-x for x in dual_engine.history['coherence_mode']], 
+    axes[1, 0].fill_between(time, 1 - history['coherence_mode'], 
                            alpha=0.6, color='red', label='指数跳躍モード')
     axes[1, 0].set_title('双対モード切り替え')
     axes[1, 0].set_xlabel('時間')
@@ -387,7 +621,7 @@ def visualize_log_exp_duality(dual_engine, title="対数整合と指数跳躍の
     axes[1, 0].grid(True, alpha=0.3)
     
     # 4. 総エネルギー変化
-    axes[1, 1].plot(time, dual_engine.history['total_energy'], 'purple', linewidth=2)
+    axes[1, 1].plot(time, history['total_energy'], 'purple', linewidth=2)
     axes[1, 1].set_title('システム総エネルギー')
     axes[1, 1].set_xlabel('時間')
     axes[1, 1].set_ylabel('エネルギー')
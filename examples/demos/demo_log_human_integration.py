@@ -12,6 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "core"))
 
 import numpy as np
 from ssd_core_engine_log import SSDCoreEngine, SSDCoreParams, SSDCoreState
+from ssd_core_engine import LeapType, create_batched_state
 from ssd_human_module import HumanAgent, HumanPressure, HumanParams
 
 
@@ -90,28 +91,45 @@ def test_human_agent_with_log_engine():
         ("極限状態", HumanPressure(physical=100.0, base=80.0, core=60.0, upper=40.0))
     ]
     
-    for scenario_name, pressure in test_scenarios:
-        print(f"\n--- {scenario_name} ---")
+    # 4シナリオを独立したエージェントとしてバッチ化し、(4, 4) の圧力ブロックで同時に実行
+    num_scenarios = len(test_scenarios)
+    P = np.stack([pressure.to_vector() for _, pressure in test_scenarios])
+    batch_state = create_batched_state(num_scenarios, num_layers=4)
+    leap_counts = np.zeros(num_scenarios, dtype=int)
+    last_leap_t = np.full(num_scenarios, np.nan)
+    last_leap_layer = np.full(num_scenarios, -1)
+    
+    # 10ステップ実行
+    for step in range(10):
+        transfer = agent._interlayer_strength * agent._nl_transfer.compute_transfer(
+            batch_state.E, batch_state.kappa
+        )
+        t_before = batch_state.t
+        batch_state = agent.engine.step_batched(batch_state, P, dt=0.1, interlayer_transfer=transfer)
         
-        # 10ステップ実行
-        for step in range(10):
-            agent.step(pressure, dt=0.1)
+        leaped = batch_state.diagnostics['leap_occurred']
+        leap_counts += leaped
+        last_leap_t[leaped] = t_before
+        last_leap_layer[leaped] = batch_state.diagnostics['leap_layer'][leaped]
+    
+    diag = batch_state.diagnostics
+    for b, (scenario_name, _) in enumerate(test_scenarios):
+        print(f"\n--- {scenario_name} ---")
         
         # 結果表示
-        print(f"  E: {agent.state.E}")
-        print(f"  κ: {agent.state.kappa}")
-        print(f"  跳躍回数: {len(agent.state.leap_history)}")
-        print(f"  α_t: {agent.state.logalign_state['alpha_t']:.4f}")
+        print(f"  E: {batch_state.E[b]}")
+        print(f"  κ: {batch_state.kappa[b]}")
+        print(f"  跳躍回数: {leap_counts[b]}")
+        print(f"  α_t: {batch_state.logalign_state['alpha_t'][b]:.4f}")
         
         # 診断情報
-        diag = agent.state.diagnostics
-        print(f"  Dominant layer: {diag.get('dominant_layer', 'N/A')}")
-        print(f"  Pressure_hat norm: {diag.get('pressure_hat_norm', 'N/A'):.2f}")
+        print(f"  Dominant layer: {diag['dominant_layer'][b]}")
+        print(f"  Pressure_hat norm: {diag['pressure_hat_norm'][b]:.2f}")
         
         # 跳躍があった場合
-        if agent.state.leap_history:
-            last_leap = agent.state.leap_history[-1]
-            print(f"  最新跳躍: t={last_leap[0]:.1f}, type={last_leap[1].name}")
+        if leap_counts[b]:
+            leap_type = LeapType(int(last_leap_layer[b]) + 2)
+            print(f"  最新跳躍: t={last_leap_t[b]:.1f}, type={leap_type.name}")
     
     print("\n✅ HumanAgent + Log版エンジンテスト完了")
     return True
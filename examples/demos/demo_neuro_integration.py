@@ -22,9 +22,23 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
 import numpy as np
-from dataclasses import dataclass, replace
-from core.ssd_core_engine import SSDCoreEngine, SSDCoreParams, SSDCoreState
+from dataclasses import dataclass
+from typing import Dict, List
+from core.ssd_core_engine import SSDCoreEngine, SSDCoreParams, SSDCoreState, create_batched_state
 from extensions.ssd_neuro_modulators import NeuroState, NeuroConfig, modulate_params, neuro_preset
+from core.ssd_jit import njit
+
+# ステップごとの詳細出力（--quiet または SSD_VERBOSE=0 で整形ごとスキップ）
+VERBOSE = os.environ.get('SSD_VERBOSE', '1') == '1' and '--quiet' not in sys.argv
+
+
+@njit(cache=True)
+def any_ge(E, Theta):
+    """E のいずれかの層が閾値以上なら True（小ベクトル用の明示ループ）"""
+    for i in range(E.shape[0]):
+        if E[i] >= Theta[i]:
+            return True
+    return False
 
 
 class SSDNeuroEngine(SSDCoreEngine):
@@ -32,26 +46,79 @@ class SSDNeuroEngine(SSDCoreEngine):
     神経変調対応SSDエンジン
     
     既存のSSDCoreEngineを継承し、神経変調機能を追加
+    
+    変調済みパラメータは神経状態の値（丸めなし）ごとにキャッシュする。
+    base_params / neuro_config は再代入すればキャッシュが破棄されるが、
+    中身をその場で書き換えた場合は invalidate_modulated_cache() を呼ぶこと。
     """
     
+    # 変調済みパラメータキャッシュの上限（超過時は最古のエントリを破棄）
+    MODULATED_CACHE_SIZE = 16
+    
     def __init__(self, params: SSDCoreParams, neuro_config: NeuroConfig = None):
         super().__init__(params)
+        self._modulated_cache: Dict[tuple, SSDCoreParams] = {}
         self.base_params = params  # 元のパラメータを保持
         self.neuro_state = NeuroState()  # デフォルト神経状態
         self.neuro_config = neuro_config or NeuroConfig()
         
+        # スカラー圧力展開用の作業バッファ（同じ値が続く間は再フィルしない）
+        self._pressure_buf = np.empty(params.num_layers, dtype=np.float64)
+        self._last_pressure_scalar = None
+    
+    @property
+    def base_params(self) -> SSDCoreParams:
+        return self._base_params
+    
+    @base_params.setter
+    def base_params(self, params: SSDCoreParams):
+        # 再代入時は既存キャッシュを破棄
+        self._base_params = params
+        self.invalidate_modulated_cache()
+    
+    @property
+    def neuro_config(self) -> NeuroConfig:
+        return self._neuro_config
+    
+    @neuro_config.setter
+    def neuro_config(self, cfg: NeuroConfig):
+        self._neuro_config = cfg
+        self.invalidate_modulated_cache()
+    
+    def invalidate_modulated_cache(self):
+        """変調済みパラメータのキャッシュを破棄（base_params / neuro_config をその場で変更した後に呼ぶ）"""
+        self._modulated_cache.clear()
+    
+    def _get_modulated_params(self, neuro_state: NeuroState = None) -> SSDCoreParams:
+        """神経状態（既定は現在の neuro_state）に対応する変調済みパラメータ（キャッシュ済みなら再利用）"""
+        ns = neuro_state if neuro_state is not None else self.neuro_state
+        key = (ns.D1, ns.D2, ns.NE, ns._5HT, ns.ACh)
+        
+        cached = self._modulated_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        modulated = modulate_params(self._base_params, ns, self._neuro_config)
+        if len(self._modulated_cache) >= self.MODULATED_CACHE_SIZE:
+            del self._modulated_cache[next(iter(self._modulated_cache))]
+        self._modulated_cache[key] = modulated
+        return modulated
+        
     def step(self, state: SSDCoreState, pressure, dt: float = 0.1) -> SSDCoreState:
         """
         神経変調を適用してから通常のステップ実行
         """
-        # pressureをndarrayに変換（必要に応じて）
+        # pressureをndarrayに変換（スカラーは作業バッファへ展開、配列はコピーしない）
         if np.isscalar(pressure):
-            pressure_array = np.full(self.base_params.num_layers, pressure)
+            if pressure != self._last_pressure_scalar:
+                self._pressure_buf.fill(pressure)
+                self._last_pressure_scalar = pressure
+            pressure_array = self._pressure_buf
         else:
-            pressure_array = np.array(pressure)
+            pressure_array = np.asarray(pressure)
             
-        # 神経変調を適用したパラメータで実行
-        modulated_params = modulate_params(self.base_params, self.neuro_state, self.neuro_config)
+        # 神経変調を適用したパラメータで実行（神経状態が同じ間はキャッシュを再利用）
+        modulated_params = self._get_modulated_params()
         
         # 一時的にパラメータを置き換え
         original_params = self.params
@@ -64,6 +131,34 @@ class SSDNeuroEngine(SSDCoreEngine):
         self.params = original_params
         
         return result
+    
+    def step_batch(self, state: SSDCoreState, pressure, neuro_states: List[NeuroState],
+                   dt: float = 0.1) -> SSDCoreState:
+        """
+        神経状態ごとに変調したパラメータでバッチ状態を1ステップ更新
+        
+        state は create_batched_state() で生成した (len(neuro_states), num_layers) の状態。
+        各行は neuro_states の対応する神経状態で変調される。
+        """
+        row_params = [self._get_modulated_params(ns) for ns in neuro_states]
+        return self.step_batched(state, pressure, dt, row_params=row_params)
+
+
+def get_preset_modulated(base_params: SSDCoreParams, preset_name: str,
+                         config: NeuroConfig = None) -> SSDCoreParams:
+    """neuro_preset(preset_name) で変調したパラメータ（呼び出しごとに新しいコピー）"""
+    return modulate_params(base_params, neuro_preset(preset_name), config)
+
+
+# 神経状態比較デモのプリセット（名前, 神経状態）。並び順がバッチの行番号になる
+NEURO_COMPARISON_PRESETS = (
+    ("ベースライン", NeuroState()),
+    ("集中モード", neuro_preset("focus")),
+    ("探索モード", neuro_preset("explore")),
+    ("鎮静モード", neuro_preset("calm")),
+    ("ドーパミンHigh", NeuroState(D1=0.8, D2=0.2, NE=0.5, _5HT=0.3, ACh=0.4)),
+    ("セロトニンHigh", NeuroState(D1=0.2, D2=0.4, NE=0.3, _5HT=0.8, ACh=0.5)),
+)
 
 
 def demo_neuro_comparison():
@@ -84,50 +179,47 @@ def demo_neuro_comparison():
         log_align=True
     )
     
-    # 初期状態
-    initial_state = SSDCoreState(
-        E=np.array([0.0, 0.0, 0.0, 0.0]),
-        kappa=np.array([0.9, 0.8, 0.5, 0.3]),
-        t=0.0,
-        step_count=0
-    )
+    initial_kappa = np.array([0.9, 0.8, 0.5, 0.3])
     
     pressure = 50.0  # 中程度の圧力
+    num_steps = 5
     
     print("\n🔬 神経状態別シミュレーション（5ステップ）")
     print("-" * 60)
     
-    # 各神経状態での比較
-    neuro_states = {
-        "ベースライン": NeuroState(),
-        "集中モード": neuro_preset("focus"),
-        "探索モード": neuro_preset("explore"),
-        "鎮静モード": neuro_preset("calm"),
-        "ドーパミンHigh": NeuroState(D1=0.8, D2=0.2, NE=0.5, _5HT=0.3, ACh=0.4),
-        "セロトニンHigh": NeuroState(D1=0.2, D2=0.4, NE=0.3, _5HT=0.8, ACh=0.5)
-    }
+    # 全プリセットを (プリセット数, 4) のバッチ状態として同時に実行
+    engine = SSDNeuroEngine(params)
+    Theta_arr = engine.base_params.Theta_values
+    neuro_list = [neuro_state for _, neuro_state in NEURO_COMPARISON_PRESETS]
     
-    for name, neuro_state in neuro_states.items():
-        print(f"\n🧠 {name}:")
-        print(f"   D1={neuro_state.D1:.1f} D2={neuro_state.D2:.1f} NE={neuro_state.NE:.1f} 5HT={neuro_state._5HT:.1f} ACh={neuro_state.ACh:.1f}")
-        
-        engine = SSDNeuroEngine(params)
-        engine.neuro_state = neuro_state
+    state = create_batched_state(len(neuro_list), num_layers=4)
+    state.kappa[:] = initial_kappa
+    
+    E0_history = np.empty((num_steps, len(neuro_list)))
+    leap_history = np.empty((num_steps, len(neuro_list)), dtype=bool)
+    for step in range(num_steps):
+        state = engine.step_batch(state, pressure, neuro_list, dt=0.1)
         
-        state = replace(initial_state)
-        leap_count = 0
+        # LEAP検出（全プリセット一括）
+        E0_history[step] = state.E[:, 0]
+        leap_history[step] = (state.E >= Theta_arr).any(axis=1)
+    
+    for b, (name, neuro_state) in enumerate(NEURO_COMPARISON_PRESETS):
+        # プリセットごとに行をまとめて1回で出力
+        out_lines = [
+            f"\n🧠 {name}:",
+            f"   D1={neuro_state.D1:.1f} D2={neuro_state.D2:.1f} NE={neuro_state.NE:.1f} 5HT={neuro_state._5HT:.1f} ACh={neuro_state.ACh:.1f}"
+        ]
         
-        for step in range(5):
-            state = engine.step(state, pressure, dt=0.1)
-            
-            # LEAP検出
-            if any(E >= T for E, T in zip(state.E, engine.params.Theta_values)):
-                leap_count += 1
-                print(f"   Step {step+1}: 🚀LEAP! E={state.E[0]:.1f}")
-            else:
-                print(f"   Step {step+1}: E={state.E[0]:.1f}")
+        if VERBOSE:
+            for step in range(num_steps):
+                if leap_history[step, b]:
+                    out_lines.append(f"   Step {step+1}: 🚀LEAP! E={E0_history[step, b]:.1f}")
+                else:
+                    out_lines.append(f"   Step {step+1}: E={E0_history[step, b]:.1f}")
         
-        print(f"   → LEAP回数: {leap_count}/5")
+        out_lines.append(f"   → LEAP回数: {int(leap_history[:, b].sum())}/{num_steps}")
+        print("\n".join(out_lines))
 
 
 def demo_kaiji_neuro_progression():
@@ -147,6 +239,7 @@ def demo_kaiji_neuro_progression():
     )
     
     engine = SSDNeuroEngine(params)
+    Theta_arr = engine.base_params.Theta_values
     state = SSDCoreState(
         E=np.array([0.0, 0.0, 0.0, 0.0]),
         kappa=np.array([0.9, 0.8, 0.5, 0.3]),
@@ -154,20 +247,30 @@ def demo_kaiji_neuro_progression():
         step_count=0
     )
     
-    # カイジの心理状態進行
-    stages = [
-        ("冷静な計算", 30.0, NeuroState(D1=0.3, D2=0.4, NE=0.3, _5HT=0.6, ACh=0.7)),
-        ("ゲーム開始", 45.0, NeuroState(D1=0.5, D2=0.3, NE=0.5, _5HT=0.4, ACh=0.6)),
-        ("連敗の焦り", 65.0, NeuroState(D1=0.6, D2=0.2, NE=0.7, _5HT=0.2, ACh=0.4)),
-        ("絶望的状況", 85.0, NeuroState(D1=0.8, D2=0.1, NE=0.8, _5HT=0.1, ACh=0.3)),
-        ("最後の賭け", 95.0, NeuroState(D1=0.9, D2=0.1, NE=0.9, _5HT=0.1, ACh=0.2))
-    ]
+    # カイジの心理状態進行（ステージ名・圧力・神経状態を並列配列で保持）
+    stage_names = ["冷静な計算", "ゲーム開始", "連敗の焦り", "絶望的状況", "最後の賭け"]
+    stage_pressures = np.array([30.0, 45.0, 65.0, 85.0, 95.0])
+    # 列: D1, D2, NE, 5HT, ACh
+    stage_neuro_matrix = np.array([
+        [0.3, 0.4, 0.3, 0.6, 0.7],
+        [0.5, 0.3, 0.5, 0.4, 0.6],
+        [0.6, 0.2, 0.7, 0.2, 0.4],
+        [0.8, 0.1, 0.8, 0.1, 0.3],
+        [0.9, 0.1, 0.9, 0.1, 0.2]
+    ])
     
     print("\n📊 カイジの心理状態とLEAP発生パターン:")
     
-    for i, (stage_name, pressure, neuro_state) in enumerate(stages):
-        print(f"\n🎯 Stage {i+1}: {stage_name}")
-        print(f"   圧力: {pressure:.1f} | 神経: D1={neuro_state.D1:.1f} NE={neuro_state.NE:.1f} 5HT={neuro_state._5HT:.1f}")
+    for i in range(len(stage_names)):
+        stage_name = stage_names[i]
+        pressure = float(stage_pressures[i])
+        neuro_state = NeuroState(*stage_neuro_matrix[i].tolist())
+        
+        # ステージごとに行をまとめて1回で出力
+        out_lines = [
+            f"\n🎯 Stage {i+1}: {stage_name}",
+            f"   圧力: {pressure:.1f} | 神経: D1={neuro_state.D1:.1f} NE={neuro_state.NE:.1f} 5HT={neuro_state._5HT:.1f}"
+        ]
         
         engine.neuro_state = neuro_state
         
@@ -175,17 +278,19 @@ def demo_kaiji_neuro_progression():
         for step in range(3):
             state = engine.step(state, pressure, dt=0.1)
             
-            if any(E >= T for E, T in zip(state.E, engine.params.Theta_values)):
-                print(f"   Step {step+1}: 🚀 「ざわ...ざわ...」LEAP! E={state.E[0]:.1f}")
+            if any_ge(state.E, Theta_arr):
+                if VERBOSE:
+                    out_lines.append(f"   Step {step+1}: 🚀 「ざわ...ざわ...」LEAP! E={state.E[0]:.1f}")
                 leap_occurred = True
                 break
-            else:
-                print(f"   Step {step+1}: E={state.E[0]:.1f}")
+            elif VERBOSE:
+                out_lines.append(f"   Step {step+1}: E={state.E[0]:.1f}")
         
         if not leap_occurred:
-            print(f"   → {stage_name}では構造変化なし")
+            out_lines.append(f"   → {stage_name}では構造変化なし")
         else:
-            print(f"   → {stage_name}で心理的転換点に到達！")
+            out_lines.append(f"   → {stage_name}で心理的転換点に到達！")
+        print("\n".join(out_lines))
 
 
 def demo_neuro_parameter_effects():
@@ -205,17 +310,17 @@ def demo_neuro_parameter_effects():
         beta_values=[0.001, 0.01, 0.05, 0.1]
     )
     
-    neuro_states = {
-        "集中": neuro_preset("focus"),
-        "探索": neuro_preset("explore"),
-        "鎮静": neuro_preset("calm")
+    presets = {
+        "集中": "focus",
+        "探索": "explore",
+        "鎮静": "calm"
     }
     
     print("\n📊 パラメータ変調効果:")
     print("-" * 60)
     
-    for name, neuro_state in neuro_states.items():
-        modulated = modulate_params(base_params, neuro_state)
+    for name, preset_name in presets.items():
+        modulated = get_preset_modulated(base_params, preset_name)
         
         print(f"\n🧠 {name}モード:")
         print(f"   感覚ゲイン alpha0: {base_params.alpha0:.3f} → {modulated.alpha0:.3f}")
@@ -39,8 +39,9 @@ def demo_nonlinear_transfer():
     print("  3. κ依存: 構造が強固なほど転送が効果的")
     print("  4. v5の線形モデル → v7の非線形モデル")
     
-    # 非線形転送システム
+    # 非線形転送システム（JITコンパイルをシナリオ計測前に済ませておく）
     transfer_system = NonlinearInterlayerTransfer()
+    transfer_system.compute_transfer(np.zeros(4), np.ones(4))
     
     print("\n" + "=" * 70)
     print("[1] 登録された転送関数")
@@ -72,7 +73,7 @@ def demo_nonlinear_transfer():
         E = np.array([0.0, E_base, 0.0, E_upper])
         kappa = np.array([1.0, kappa_base, 1.0, kappa_upper])
         
-        transfer = transfer_system.compute_transfer(E, kappa, dt=1.0)
+        transfer = transfer_system.compute_transfer(E, kappa)
         suppression = transfer[HumanLayer.BASE.value]
         
         print(f"    E_base={E_base:6.1f} → 抑制量={suppression:+.3f}")
@@ -103,7 +104,7 @@ def demo_nonlinear_transfer():
         E = np.array([0.0, E_base_fixed, E_core, 0.0])
         kappa = np.array([1.0, kappa_base, kappa_core, 1.0])
         
-        transfer = transfer_system.compute_transfer(E, kappa, dt=1.0)
+        transfer = transfer_system.compute_transfer(E, kappa)
         transfer_amount = transfer[HumanLayer.CORE.value]
         
         print(f"    E_core={E_core:6.1f} → 転送量={transfer_amount:+.3f}")
@@ -134,7 +135,7 @@ def demo_nonlinear_transfer():
         E = np.array([0.0, E_base_fixed, E_core_fixed, 0.0])
         kappa = np.array([1.0, kappa_base, kappa_core, 1.0])
         
-        transfer = transfer_system.compute_transfer(E, kappa, dt=1.0)
+        transfer = transfer_system.compute_transfer(E, kappa)
         suppression = transfer[HumanLayer.BASE.value]
         
         print(f"    κ_core={kappa_core:.2f} → 抑制量={suppression:+.3f}")
@@ -164,7 +165,7 @@ def demo_nonlinear_transfer():
         E = np.array([E_physical, E_base_low, 0.0, 0.0])
         kappa = np.array([kappa_physical, kappa_base, 1.0, 1.0])
         
-        transfer = transfer_system.compute_transfer(E, kappa, dt=1.0)
+        transfer = transfer_system.compute_transfer(E, kappa)
         fear_amplification = transfer[HumanLayer.BASE.value]
         
         print(f"    E_physical={E_physical:6.1f} → 恐怖増幅={fear_amplification:+.3f}")
@@ -6,21 +6,13 @@ Phase 4: 多エージェント社会シミュレーション
 """
 
 import sys
-import os
+from pathlib import Path
 
-# パス設定
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
-# coreモジュールのパス追加
-core_path = os.path.join(grandparent_dir, 'core')
-sys.path.insert(0, core_path)
-
-# extensionsモジュールのパス追加
-extensions_path = os.path.join(grandparent_dir, 'extensions')
-sys.path.insert(0, extensions_path)
+# パス設定（プロジェクトルート・core・extensions。既に登録済みなら追加しない）
+root_dir = Path(__file__).resolve().parent.parent.parent
+for path in (root_dir, root_dir / 'core', root_dir / 'extensions'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 from ssd_social_dynamics import (
     Society, RelationshipMatrix,
@@ -30,6 +22,12 @@ from ssd_social_dynamics import (
 )
 from ssd_human_module import HumanLayer, HumanPressure
 
+# 層インデックス（ループ内での Enum 属性参照を避ける）
+_PHYSICAL, _BASE, _CORE, _UPPER = (
+    HumanLayer.PHYSICAL.value, HumanLayer.BASE.value,
+    HumanLayer.CORE.value, HumanLayer.UPPER.value
+)
+
 
 def demo_social_dynamics():
     """社会ダイナミクスのデモ"""
@@ -45,18 +43,19 @@ def demo_social_dynamics():
     society1 = create_fear_contagion_scenario(num_agents=5)
     
     print("\n  初期状態:")
-    print(f"    Agent_0 E_base: {society1.agents[0].state.E[HumanLayer.BASE.value]:.1f} (恐怖源)")
-    print(f"    Agent_1 E_base: {society1.agents[1].state.E[HumanLayer.BASE.value]:.1f}")
-    print(f"    Agent_2 E_base: {society1.agents[2].state.E[HumanLayer.BASE.value]:.1f}")
+    print(f"    Agent_0 E_base: {society1.E[0, _BASE]:.1f} (恐怖源)")
+    print(f"    Agent_1 E_base: {society1.E[1, _BASE]:.1f}")
+    print(f"    Agent_2 E_base: {society1.E[2, _BASE]:.1f}")
     
     print("\n  シミュレーション実行...")
     for step in range(50):
-        society1.step(dt=0.1)
+        display = step % 10 == 0
+        result = society1.step(dt=0.1, return_state=display)
         
-        if step % 10 == 0:
+        if display:
+            E, _ = result
             print(f"\n  Step {step}:")
-            for i in range(3):  # 最初の3エージェントのみ表示
-                E_base = society1.agents[i].state.E[HumanLayer.BASE.value]
+            for i, E_base in enumerate(E[:3, _BASE]):  # 最初の3エージェントのみ表示
                 print(f"    Agent_{i} E_base: {E_base:.1f}")
     
     print("\n  結果:")
@@ -75,16 +74,18 @@ def demo_social_dynamics():
     print("    A ⇔ B: 競争関係")
     
     print("\n  初期状態:")
-    print(f"    GroupA E_upper平均: {sum(society2.agents[i].state.E[HumanLayer.UPPER.value] for i in range(3))/3:.1f}")
-    print(f"    GroupB E_upper平均: {sum(society2.agents[i].state.E[HumanLayer.UPPER.value] for i in range(3,6))/3:.1f}")
+    print(f"    GroupA E_upper平均: {society2.E[:3, _UPPER].mean():.1f}")
+    print(f"    GroupB E_upper平均: {society2.E[3:6, _UPPER].mean():.1f}")
     
     print("\n  シミュレーション実行...")
     for step in range(30):
-        society2.step(dt=0.1)
+        display = step % 10 == 0
+        result = society2.step(dt=0.1, return_state=display)
         
-        if step % 10 == 0:
-            avg_A = sum(society2.agents[i].state.E[HumanLayer.UPPER.value] for i in range(3))/3
-            avg_B = sum(society2.agents[i].state.E[HumanLayer.UPPER.value] for i in range(3,6))/3
+        if display:
+            E, _ = result
+            avg_A = E[:3, _UPPER].mean()
+            avg_B = E[3:6, _UPPER].mean()
             print(f"\n  Step {step}:")
             print(f"    GroupA E_upper平均: {avg_A:.1f}")
             print(f"    GroupB E_upper平均: {avg_B:.1f}")
@@ -100,18 +101,19 @@ def demo_social_dynamics():
     society3 = create_norm_propagation_scenario(num_agents=7)
     
     print("\n  初期状態:")
-    print(f"    Agent_0 κ_core: {society3.agents[0].state.kappa[HumanLayer.CORE.value]:.2f} (模範)")
-    print(f"    Agent_1 κ_core: {society3.agents[1].state.kappa[HumanLayer.CORE.value]:.2f}")
-    print(f"    Agent_2 κ_core: {society3.agents[2].state.kappa[HumanLayer.CORE.value]:.2f}")
+    print(f"    Agent_0 κ_core: {society3.kappa[0, _CORE]:.2f} (模範)")
+    print(f"    Agent_1 κ_core: {society3.kappa[1, _CORE]:.2f}")
+    print(f"    Agent_2 κ_core: {society3.kappa[2, _CORE]:.2f}")
     
     print("\n  シミュレーション実行...")
     for step in range(50):
-        society3.step(dt=0.1)
+        display = step % 10 == 0
+        result = society3.step(dt=0.1, return_state=display)
         
-        if step % 10 == 0:
+        if display:
+            _, kappa = result
             print(f"\n  Step {step}:")
-            for i in range(3):
-                kappa_core = society3.agents[i].state.kappa[HumanLayer.CORE.value]
+            for i, kappa_core in enumerate(kappa[:3, _CORE]):
                 print(f"    Agent_{i} κ_core: {kappa_core:.3f}")
     
     print("\n  結果:")
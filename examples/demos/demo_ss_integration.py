@@ -18,55 +18,181 @@ HSP/SS型の理論的洞察をSSDシステムで実装・検証。
 """
 
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+import copy
+import math
+from pathlib import Path
+
+# プロジェクトルートをパスに追加（既に登録済みなら追加しない）
+root_dir = str(Path(__file__).resolve().parent.parent.parent)
+if root_dir not in sys.path:
+    sys.path.append(root_dir)
 
 import numpy as np
 from dataclasses import replace
+from typing import Dict
 from core.ssd_core_engine import SSDCoreEngine, SSDCoreParams, SSDCoreState
 from extensions.ssd_ss_sensitivity import (
     SSProfile, SSNeuroConfig, SocialLanguageKPI,
     ss_preset, modulate_with_ss, compute_social_language_kpi
 )
 
+from core.ssd_jit import njit
+
+
+@njit(cache=True, fastmath=True, error_model='numpy')
+def _ss_step_kernel(E, Theta_values, pressure_array, context_dep, ss_level):
+    """
+    1ステップ分のストレス・KPI用スカラーを1パスで計算
+    
+    Returns:
+        (current_stress, explicit_info, implicit_info, context_resolved, total_residual)
+    """
+    n = E.shape[0]
+    E_sum = 0.0
+    E_sq = 0.0
+    Theta_sum = 0.0
+    p_abs = 0.0
+    p_sq = 0.0
+    for i in range(n):
+        E_sum += E[i]
+        E_sq += E[i] * E[i]
+        Theta_sum += Theta_values[i]
+    for i in range(pressure_array.shape[0]):
+        p_abs += abs(pressure_array[i])
+        p_sq += pressure_array[i] * pressure_array[i]
+    
+    # 現在ストレス（エネルギー蓄積度と圧力の正規化平均）
+    energy_stress = (E_sum / n) / (Theta_sum / n)
+    pressure_stress = (p_abs / pressure_array.shape[0]) / 100.0
+    current_stress = min(1.0, (energy_stress + pressure_stress) / 2.0)
+    
+    # 情報量・文脈解決・総残差の推定
+    pressure_magnitude = math.sqrt(p_sq)
+    explicit_info = pressure_magnitude * (1.0 - context_dep)
+    implicit_info = pressure_magnitude * context_dep
+    context_resolved = implicit_info * (ss_level * context_dep)
+    total_residual = math.sqrt(E_sq) + pressure_magnitude * 0.1
+    
+    return current_stress, explicit_info, implicit_info, context_resolved, total_residual
+
+
 class SSDSSEngine(SSDCoreEngine):
     """SS型統合SSDエンジン"""
     
+    # 変調済みパラメータキャッシュの上限（超過時は最古のエントリを破棄、0でキャッシュ無効）
+    MODULATED_CACHE_SIZE = 256
+    # ストレス水準の量子化桁（None = 量子化しない。整数を指定するとその桁に丸めた値で
+    # 変調・キャッシュするため、結果は丸めたストレス水準のものになる）
+    STRESS_KEY_DECIMALS = None
+    
     def __init__(self, params: SSDCoreParams, 
                  ss_profile: SSProfile,
-                 ss_config: SSNeuroConfig = None):
+                 ss_config: SSNeuroConfig = None,
+                 store_history: bool = False):
         super().__init__(params)
+        self._modulated_cache: Dict[float, SSDCoreParams] = {}
         self.base_params = params
         self.ss_profile = ss_profile
         self.ss_config = ss_config or SSNeuroConfig()
         
-        # KPI追跡
+        # KPI追跡（最新値は常に last_kpi、全履歴は store_history=True の時のみ保持）
+        self.last_kpi = SocialLanguageKPI()
+        self.store_history = store_history
         self.kpi_history = []
         self.current_stress = 0.0
         
+        # 圧力ベクトルの作業バッファ（step() 内でのみ有効。呼び出し側は保持しないこと）
+        self._pressure_buf = np.empty(params.num_layers, dtype=np.float64)
+        
+        # キャッシュ無効時の変調先（毎ステップ上書きし、新規インスタンスを作らない）
+        self._mod_params_scratch = copy.deepcopy(params)
+    
+    @property
+    def base_params(self) -> SSDCoreParams:
+        return self._base_params
+    
+    @base_params.setter
+    def base_params(self, params: SSDCoreParams):
+        # 再代入時は既存キャッシュを無効化
+        self._base_params = params
+        self._modulated_cache.clear()
+    
+    @property
+    def ss_profile(self) -> SSProfile:
+        return self._ss_profile
+    
+    @ss_profile.setter
+    def ss_profile(self, profile: SSProfile):
+        self._ss_profile = profile
+        self._modulated_cache.clear()
+    
+    @property
+    def ss_config(self) -> SSNeuroConfig:
+        return self._ss_config
+    
+    @ss_config.setter
+    def ss_config(self, cfg: SSNeuroConfig):
+        self._ss_config = cfg
+        self._modulated_cache.clear()
+    
+    def _get_modulated_params(self, stress: float) -> SSDCoreParams:
+        """
+        ストレス水準に対応するSS変調済みパラメータ
+        
+        既定ではストレス水準そのもの（丸めなし）をキーにキャッシュする。
+        STRESS_KEY_DECIMALS を指定した場合のみ、丸めた値で変調・キャッシュする。
+        キャッシュ無効時（MODULATED_CACHE_SIZE <= 0）は常に丸めずに変調する。
+        """
+        if self.MODULATED_CACHE_SIZE <= 0:
+            modulated, _, _ = modulate_with_ss(
+                self._base_params, self._ss_profile, stress,
+                ss_config=self._ss_config, out=self._mod_params_scratch
+            )
+            return modulated
+        
+        key = stress if self.STRESS_KEY_DECIMALS is None else round(stress, self.STRESS_KEY_DECIMALS)
+        cached = self._modulated_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        modulated, _, _ = modulate_with_ss(
+            self._base_params, self._ss_profile, key, ss_config=self._ss_config
+        )
+        if len(self._modulated_cache) >= self.MODULATED_CACHE_SIZE:
+            del self._modulated_cache[next(iter(self._modulated_cache))]
+        self._modulated_cache[key] = modulated
+        return modulated
+        
     def step(self, state: SSDCoreState, pressure, dt: float = 0.1) -> SSDCoreState:
         """SS型変調を適用したステップ実行"""
         
-        # pressureをndarrayに変換
+        # pressureを作業バッファへ展開（毎ステップの配列確保を避ける）
+        pressure_array = self._pressure_buf
         if np.isscalar(pressure):
-            pressure_array = np.full(self.base_params.num_layers, pressure)
+            pressure_array.fill(pressure)
         else:
-            pressure_array = np.array(pressure)
-            
-        # 現在ストレス計算（簡易版：エネルギー蓄積度）
-        energy_stress = np.mean(state.E) / np.mean(self.base_params.Theta_values)
-        pressure_stress = np.mean(np.abs(pressure_array)) / 100.0  # 正規化
-        self.current_stress = min(1.0, (energy_stress + pressure_stress) / 2.0)
+            np.copyto(pressure_array, pressure)
         
-        # SS型変調適用
-        modulated_params, neuro_state, kpi = modulate_with_ss(
-            self.base_params, self.ss_profile, self.current_stress,
-            ss_config=self.ss_config
+        # ストレス・KPI用スカラーを1回のカーネル呼び出しで計算
+        (self.current_stress, explicit_info, implicit_info,
+         context_resolved, total_residual) = _ss_step_kernel(
+            np.asarray(state.E, dtype=np.float64),
+            np.asarray(self.base_params.Theta_values, dtype=np.float64),
+            pressure_array,
+            self.ss_profile.context_dependency,
+            self.ss_profile.ss_level
         )
         
+        # SS型変調適用（同じストレス水準の間はキャッシュを再利用）
+        modulated_params = self._get_modulated_params(self.current_stress)
+        
         # KPI計算（シミュレーション）
-        kpi = self._simulate_social_kpi(pressure_array, state)
-        self.kpi_history.append(kpi)
+        kpi = self._simulate_social_kpi(
+            explicit_info, implicit_info, context_resolved, total_residual
+        )
+        self.last_kpi = kpi
+        if self.store_history:
+            self.kpi_history.append(kpi)
         
         # パラメータ置換してステップ実行
         original_params = self.params
@@ -76,20 +202,9 @@ class SSDSSEngine(SSDCoreEngine):
         
         return result
     
-    def _simulate_social_kpi(self, pressure_array, state) -> SocialLanguageKPI:
-        """社会・言語KPIのシミュレーション計算"""
-        
-        # 情報量推定
-        pressure_magnitude = np.linalg.norm(pressure_array)
-        explicit_info = pressure_magnitude * (1.0 - self.ss_profile.context_dependency)
-        implicit_info = pressure_magnitude * self.ss_profile.context_dependency
-        
-        # 文脈解決推定
-        context_skill = self.ss_profile.ss_level * self.ss_profile.context_dependency
-        context_resolved = implicit_info * context_skill
-        
-        # 総残差推定
-        total_residual = np.linalg.norm(state.E) + pressure_magnitude * 0.1
+    def _simulate_social_kpi(self, explicit_info, implicit_info,
+                             context_resolved, total_residual) -> SocialLanguageKPI:
+        """社会・言語KPIのシミュレーション計算（情報量・残差推定は _ss_step_kernel で算出済み）"""
         
         # 推論ステップ推定（文脈依存度に応じて増加）
         inference_steps = int(5 + self.ss_profile.context_dependency * 10)
@@ -179,14 +294,16 @@ def demo_ss_social_kpi():
             state = engine.step(state, pressure, dt=0.1)
         
         # 最新KPI表示
-        kpi = engine.kpi_history[-1] if engine.kpi_history else SocialLanguageKPI()
+        kpi = engine.last_kpi
         
-        print(f"\n🎯 {society_name}:")
-        print(f"  CAR（場依存整合率）: {kpi.CAR:.3f}")
-        print(f"  LP（言語圧力）: {kpi.LP:.3f}") 
-        print(f"  CCL（空気コスト）: {kpi.CCL:.1f}")
-        print(f"  XAL（異整合変換損失）: {kpi.XAL:.3f}")
-        print(f"  現在ストレス水準: {engine.current_stress:.3f}")
+        print("\n".join([
+            f"\n🎯 {society_name}:",
+            f"  CAR（場依存整合率）: {kpi.CAR:.3f}",
+            f"  LP（言語圧力）: {kpi.LP:.3f}",
+            f"  CCL（空気コスト）: {kpi.CCL:.1f}",
+            f"  XAL（異整合変換損失）: {kpi.XAL:.3f}",
+            f"  現在ストレス水準: {engine.current_stress:.3f}",
+        ]))
 
 
 def demo_kaiji_ss_progression():
@@ -212,6 +329,7 @@ def demo_kaiji_ss_progression():
     
     engine = SSDSSEngine(params, kaiji_ss)
     state = SSDCoreState(E=np.zeros(4), kappa=np.ones(4))
+    Theta_arr = engine.base_params.Theta_values  # __post_init__ でndarray化済み
     
     # 借金地獄進行段階
     stages = [
@@ -226,29 +344,31 @@ def demo_kaiji_ss_progression():
     print("-" * 60)
     
     for i, (stage_name, pressure) in enumerate(stages):
-        print(f"\n🎯 Stage {i+1}: {stage_name} (圧力: {pressure:.1f})")
+        out_lines = []
+        out_lines.append(f"\n🎯 Stage {i+1}: {stage_name} (圧力: {pressure:.1f})")
         
         # 複数ステップ実行
         leap_occurred = False
         for step in range(3):
             state = engine.step(state, pressure, dt=0.1)
             
-            if any(E >= T for E, T in zip(state.E, engine.params.Theta_values)):
-                print(f"  Step {step+1}: 🚀「ざわ...ざわ...」SS-LEAP! E={state.E[0]:.1f}")
+            if np.greater_equal(state.E, Theta_arr).any():
+                out_lines.append(f"  Step {step+1}: 🚀「ざわ...ざわ...」SS-LEAP! E={state.E[0]:.1f}")
                 leap_occurred = True
                 break
             else:
-                print(f"  Step {step+1}: E={state.E[0]:.1f} (ストレス: {engine.current_stress:.2f})")
+                out_lines.append(f"  Step {step+1}: E={state.E[0]:.1f} (ストレス: {engine.current_stress:.2f})")
         
         # KPI表示
-        if engine.kpi_history:
-            kpi = engine.kpi_history[-1]
-            print(f"  社会KPI: CAR={kpi.CAR:.2f}, CCL={kpi.CCL:.1f}, ストレス={engine.current_stress:.2f}")
+        kpi = engine.last_kpi
+        out_lines.append(f"  社会KPI: CAR={kpi.CAR:.2f}, CCL={kpi.CCL:.1f}, ストレス={engine.current_stress:.2f}")
         
         if not leap_occurred:
-            print(f"  → {stage_name}: SS型感受性による緊張蓄積中...")
+            out_lines.append(f"  → {stage_name}: SS型感受性による緊張蓄積中...")
         else:
-            print(f"  → {stage_name}: SS型特有の感覚過敏が閾値突破！")
+            out_lines.append(f"  → {stage_name}: SS型特有の感覚過敏が閾値突破！")
+        
+        print("\n".join(out_lines))
 
 
 def demo_ss_pathway_transition():
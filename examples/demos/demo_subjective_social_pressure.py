@@ -11,21 +11,13 @@ Phase 4の理論的整合を達成した、主観的な社会的意味圧のデ
 """
 
 import sys
-import os
+from pathlib import Path
 
-# パス設定
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
-# coreモジュールのパス追加
-core_path = os.path.join(grandparent_dir, 'core')
-sys.path.insert(0, core_path)
-
-# extensionsモジュールのパス追加
-extensions_path = os.path.join(grandparent_dir, 'extensions')
-sys.path.insert(0, extensions_path)
+# パス設定（プロジェクトルート・core・extensions。既に登録済みなら追加しない）
+root_dir = Path(__file__).resolve().parent.parent.parent
+for path in (root_dir, root_dir / 'core', root_dir / 'extensions'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 from ssd_human_module import HumanAgent, HumanPressure, HumanLayer
 from ssd_subjective_social_pressure import (
@@ -36,6 +28,12 @@ from ssd_subjective_social_pressure import (
     create_ideology_observation
 )
 
+# 層インデックス（ループ内での Enum 属性参照を避ける）
+_PHYSICAL, _BASE, _CORE, _UPPER = (
+    HumanLayer.PHYSICAL.value, HumanLayer.BASE.value,
+    HumanLayer.CORE.value, HumanLayer.UPPER.value
+)
+
 
 def demo_subjective_social_pressure():
     """主観的社会圧力のデモ"""
@@ -59,9 +57,9 @@ def demo_subjective_social_pressure():
     
     # Aliceの初期状態を表示
     print("\n  Alice初期状態:")
-    print(f"    E_base: {agent_A.state.E[HumanLayer.BASE.value]:.3f}")
-    print(f"    E_core: {agent_A.state.E[HumanLayer.CORE.value]:.3f}")
-    print(f"    E_upper: {agent_A.state.E[HumanLayer.UPPER.value]:.3f}")
+    print(f"    E_base: {agent_A.state.E[_BASE]:.3f}")
+    print(f"    E_core: {agent_A.state.E[_CORE]:.3f}")
+    print(f"    E_upper: {agent_A.state.E[_UPPER]:.3f}")
     
     # 圧力計算器
     calculator = SubjectiveSocialPressureCalculator()
@@ -110,7 +108,7 @@ def demo_subjective_social_pressure():
     agent_A.step(human_pressure)
     
     print(f"\n  Alice の内部状態変化:")
-    print(f"    E_base: {agent_A.state.E[HumanLayer.BASE.value]:.3f} ↑ (恐怖が伝染)")
+    print(f"    E_base: {agent_A.state.E[_BASE]:.3f} ↑ (恐怖が伝染)")
     
     # シナリオ2: 敵の恐怖（敵対的関係）
     print("\n" + "=" * 70)
@@ -178,7 +176,7 @@ def demo_subjective_social_pressure():
     agent_A3.step(human_pressure3)
     
     print(f"\n  Alice の内部状態変化:")
-    print(f"    E_upper: {agent_A3.state.E[HumanLayer.UPPER.value]:.3f} ↑ (イデオロギー葛藤)")
+    print(f"    E_upper: {agent_A3.state.E[_UPPER]:.3f} ↑ (イデオロギー葛藤)")
     
     # シナリオ4: 距離による減衰
     print("\n" + "=" * 70)
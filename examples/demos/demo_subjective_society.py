@@ -13,21 +13,13 @@ v8の解決:
 """
 
 import sys
-import os
+from pathlib import Path
 
-# パス設定
-current_dir = os.path.dirname(os.path.abspath(__file__))
-parent_dir = os.path.dirname(current_dir)
-grandparent_dir = os.path.dirname(parent_dir)
-sys.path.insert(0, grandparent_dir)
-
-# coreモジュールのパス追加
-core_path = os.path.join(grandparent_dir, 'core')
-sys.path.insert(0, core_path)
-
-# extensionsモジュールのパス追加
-extensions_path = os.path.join(grandparent_dir, 'extensions')
-sys.path.insert(0, extensions_path)
+# パス設定（プロジェクトルート・core・extensions。既に登録済みなら追加しない）
+root_dir = Path(__file__).resolve().parent.parent.parent
+for path in (root_dir, root_dir / 'core', root_dir / 'extensions'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
 
 from ssd_subjective_society import (
     SubjectiveSociety,
@@ -37,6 +29,12 @@ from ssd_subjective_society import (
 )
 from ssd_human_module import HumanAgent, HumanPressure, HumanLayer
 
+# 層インデックス（ループ内での Enum 属性参照を避ける）
+_PHYSICAL, _BASE, _CORE, _UPPER = (
+    HumanLayer.PHYSICAL.value, HumanLayer.BASE.value,
+    HumanLayer.CORE.value, HumanLayer.UPPER.value
+)
+
 
 def demo_subjective_society():
     """主観的社会システムのデモ"""
@@ -61,7 +59,7 @@ def demo_subjective_society():
     
     print("\n  初期状態:")
     for i, agent in enumerate(society.agents):
-        E_base = agent.state.E[HumanLayer.BASE.value]
+        E_base = agent.state.E[_BASE]
         print(f"    Agent_{i} E_base: {E_base:.1f}")
     
     # シグナル生成を確認
@@ -80,7 +78,7 @@ def demo_subjective_society():
         if step % 10 == 0:
             print(f"\n  Step {step}:")
             for i, agent in enumerate(society.agents):
-                E_base = agent.state.E[HumanLayer.BASE.value]
+                E_base = agent.state.E[_BASE]
                 print(f"    Agent_{i} E_base: {E_base:.1f}")
     
     print("\n  → 恐怖が主観的に伝染した！")
@@ -101,8 +99,8 @@ def demo_subjective_society():
     
     print("\n  初期状態:")
     for i, agent in enumerate(society2.agents):
-        E_upper = agent.state.E[HumanLayer.UPPER.value]
-        kappa_upper = agent.state.kappa[HumanLayer.UPPER.value]
+        E_upper = agent.state.E[_UPPER]
+        kappa_upper = agent.state.kappa[_UPPER]
         print(f"    Agent_{i} E_upper: {E_upper:.1f}, κ_upper: {kappa_upper:.2f}")
     
     print("\n  シミュレーション実行（イデオロギー対立の主観的解釈）...")
@@ -113,8 +111,8 @@ def demo_subjective_society():
         if step % 10 == 0:
             print(f"\n  Step {step}:")
             for i, agent in enumerate(society2.agents):
-                E_upper = agent.state.E[HumanLayer.UPPER.value]
-                E_core = agent.state.E[HumanLayer.CORE.value]
+                E_upper = agent.state.E[_UPPER]
+                E_core = agent.state.E[_CORE]
                 print(f"    Agent_{i} E_upper: {E_upper:.1f}, E_core: {E_core:.1f}")
     
     print("\n  → イデオロギー対立が主観的に発生！")
@@ -135,11 +133,11 @@ def demo_subjective_society():
     
     # リーダーに崇高な理念を注入
     leader.step(HumanPressure(upper=80.0), dt=0.1)
-    leader.state.kappa[HumanLayer.UPPER.value] = 2.5
+    leader.state.kappa[_UPPER] = 2.5
     
     print("\n  初期状態:")
-    print(f"    Leader E_upper: {leader.state.E[HumanLayer.UPPER.value]:.1f}")
-    print(f"    Follower E_base: {follower.state.E[HumanLayer.BASE.value]:.1f}")
+    print(f"    Leader E_upper: {leader.state.E[_UPPER]:.1f}")
+    print(f"    Follower E_base: {follower.state.E[_BASE]:.1f}")
     
     # 2人の社会システム
     society3 = SubjectiveSociety(
@@ -158,9 +156,9 @@ def demo_subjective_society():
         society3.step(dt=0.1)
     
     print(f"\n  最終状態:")
-    print(f"    Leader E_upper: {leader.state.E[HumanLayer.UPPER.value]:.1f}")
-    print(f"    Follower E_base: {follower.state.E[HumanLayer.BASE.value]:.1f}")
-    print(f"    Follower E_upper: {follower.state.E[HumanLayer.UPPER.value]:.1f}")
+    print(f"    Leader E_upper: {leader.state.E[_UPPER]:.1f}")
+    print(f"    Follower E_base: {follower.state.E[_BASE]:.1f}")
+    print(f"    Follower E_upper: {follower.state.E[_UPPER]:.1f}")
     
     print("\n  → Leader の VERBAL_IDEOLOGY (UPPER層) を観測")
     print("  → Follower が主観的に解釈")
@@ -29,13 +29,10 @@
 
 import sys
 import os
-import random
+import zlib
 import numpy as np
 from typing import List, Tuple, Dict, Optional
-from dataclasses import dataclass
 from enum import Enum
-import matplotlib.pyplot as plt
-from collections import deque
 
 # パス設定
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -47,7 +44,37 @@ sys.path.insert(0, core_path)
 # SSD Log版エンジンをインポート
 from ssd_core_engine_log import SSDCoreEngine, SSDCoreParams, create_default_state
 from ssd_human_module import HumanAgent, HumanPressure, HumanLayer
-import numpy as np
+
+from ssd_jit import njit
+
+
+# 乱数生成器（モジュール全体で1つ、シード固定で再現可能）
+RNG = np.random.default_rng(42)  # カイジも運命には逆らえない
+
+
+@njit(cache=True)
+def _build_pressure(despair_change, won, debt_nonneg, despair_level, p):
+    """
+    1ラウンド分の絶望圧力ベクトル（BASE/CORE/SOCIAL/UPPER）を p に構築
+    
+    4要素配列へのNumPy呼び出しを毎ラウンド繰り返すとディスパッチが支配的になるため、
+    スカラー引数と事前確保済みバッファだけを受け取るカーネルにまとめる。
+    """
+    p[:] = 0.0
+    if won:
+        # UPPER: 希望（借金完済なら奇跡の回復）
+        p[3] = 1.0 if debt_nonneg else 0.2
+    else:
+        # 絶望による多層圧力
+        p[0] = despair_change * 0.8  # BASE: 絶望的な焦り
+        p[1] = despair_change * 0.5  # CORE: 責任と後悔
+        p[2] = despair_change * 0.3  # SOCIAL: 社会的地位の不安
+        
+        # 究極の絶望状態では全層に圧力
+        if despair_level >= 8.0:
+            p += 0.5
+    return p
+
 
 # ANSIカラーコード
 class Colors:
@@ -64,14 +91,85 @@ class Colors:
     DARK_YELLOW = '\033[33m'
     GRAY = '\033[90m'
 
+# プレイヤー名 → 表示色（hash() は実行ごとに変わるため固定の対応表を使う）
+_NAME_COLOR = {
+    "カイジ": Colors.DARK_RED,
+    "遠藤": Colors.GRAY,
+    "佐原": Colors.DARK_YELLOW,
+}
+
 # ===== カイジ的借金価値システム =====
-@dataclass
+# 借金状態のSoAレコード（1行 = 1プレイヤー）
+DEBT_DTYPE = np.dtype([
+    ('debt', 'i4'),        # 借金額（負の値）
+    ('despair', 'f8'),     # 絶望レベル（1.0〜10.0）
+    ('desp_coef', 'f8'),   # 破れかぶれ係数
+    ('hope', 'f8'),        # 一発逆転への希望
+])
+
+def apply_losses(debt_state: np.ndarray, mask, loss_amount):
+    """
+    さらなる損失による絶望の深化（mask で選んだ行を一括更新）
+    
+    mask: 行インデックスまたはブールマスク, loss_amount: スカラーまたは選択行ごとの配列
+    """
+    despair = debt_state['despair']
+    hope = debt_state['hope']
+    
+    # 借金が増えるほど絶望も深まる
+    new_despair = np.minimum(10.0, despair[mask] + (loss_amount / 100.0) * debt_state['desp_coef'][mask])
+    despair[mask] = new_despair
+    
+    # 絶望が深まると一発逆転への希望も歪む
+    hope[mask] = np.where(new_despair > 7.0, np.minimum(5.0, hope[mask] + 0.3), hope[mask])
+    
+    # 借金額更新
+    debt_state['debt'][mask] -= loss_amount
+
+def apply_wins(debt_state: np.ndarray, mask, win_amount):
+    """
+    勝利による一時的な希望（mask で選んだ行を一括更新）
+    
+    借金完済なら奇跡の復活、まだ借金中なら少しだけ希望が戻る
+    """
+    debt = debt_state['debt']
+    despair = debt_state['despair']
+    hope = debt_state['hope']
+    
+    # 借金減少
+    debt[mask] += win_amount
+    paid_off = debt[mask] >= 0
+    
+    despair[mask] = np.maximum(1.0, despair[mask] * np.where(paid_off, 0.3, 0.9))
+    hope[mask] = np.where(paid_off, 1.0, np.maximum(1.0, hope[mask] * 0.8))
+
+def _debt_field(name: str, cast):
+    """DebtValue の属性を構造化配列の1要素に対応付けるプロパティ"""
+    def getter(self):
+        return cast(self._state[name][self._index])
+    
+    def setter(self, value):
+        self._state[name][self._index] = value
+    
+    return property(getter, setter)
+
 class DebtValue:
-    """借金の主観的価値（カイジ的絶望モデル）"""
-    debt_amount: int  # 借金額（負の値）
-    despair_level: float  # 絶望レベル（1.0〜10.0）
-    desperation_coefficient: float  # 破れかぶれ係数
-    hope_for_reversal: float  # 一発逆転への希望
+    """
+    借金の主観的価値（カイジ的絶望モデル）
+    
+    値そのものは DEBT_DTYPE の構造化配列（全プレイヤー共有）の1行に置き、
+    このオブジェクトは行インデックスを持つビューとして振る舞う。
+    """
+    __slots__ = ("_state", "_index")
+    
+    debt_amount = _debt_field('debt', int)  # 借金額（負の値）
+    despair_level = _debt_field('despair', float)  # 絶望レベル（1.0〜10.0）
+    desperation_coefficient = _debt_field('desp_coef', float)  # 破れかぶれ係数
+    hope_for_reversal = _debt_field('hope', float)  # 一発逆転への希望
+    
+    def __init__(self, debt_state: np.ndarray, index: int):
+        self._state = debt_state
+        self._index = index
     
     def get_subjective_debt_weight(self) -> float:
         """主観的借金の重み"""
@@ -79,67 +177,91 @@ class DebtValue:
     
     def experience_loss(self, loss_amount: int):
         """さらなる損失による絶望の深化"""
-        # 借金が増えるほど絶望も深まる
-        despair_increase = (loss_amount / 100.0) * self.desperation_coefficient
-        self.despair_level = min(10.0, self.despair_level + despair_increase)
-        
-        # 絶望が深まると一発逆転への希望も歪む
-        if self.despair_level > 7.0:
-            self.hope_for_reversal = min(5.0, self.hope_for_reversal + 0.3)
-        
-        # 借金額更新
-        self.debt_amount -= loss_amount
+        apply_losses(self._state, self._index, loss_amount)
     
     def experience_win(self, win_amount: int):
         """勝利による一時的な希望"""
-        # 借金減少
-        self.debt_amount += win_amount
-        
-        if self.debt_amount >= 0:
-            # 借金完済！奇跡の復活
-            self.despair_level = max(1.0, self.despair_level * 0.3)
-            self.hope_for_reversal = 1.0
-        else:
-            # まだ借金中だが少し希望が
-            self.despair_level = max(1.0, self.despair_level * 0.9)
-            self.hope_for_reversal = max(1.0, self.hope_for_reversal * 0.8)
+        apply_wins(self._state, self._index, win_amount)
+
+# 心理状態コード → 名前
+STATE_NAMES = (
+    "miracle_recovery",   # 0: 奇跡の回復
+    "cautious_hope",      # 1: 慎重な希望
+    "desperate_hope",     # 2: 絶望的希望
+    "deep_despair",       # 3: 深い絶望
+    "suicidal_despair",   # 4: 自滅的絶望
+    "ultimate_despair",   # 5: 究極の絶望
+)
+
+@njit(cache=True)
+def psych_state_code(debt, despair):
+    """
+    心理状態コード（STATE_NAMES の添字）を分岐なしで計算
+    
+    借金帯ごとの判定をブール値の積和にまとめる:
+      借金なし → 0, (-200, 0) → 1/2, (-800, -200] → 3/4, -800以下 → 5
+    """
+    low = (debt < 0) * (debt > -200)
+    mid = (debt <= -200) * (debt > -800)
+    ultimate = debt <= -800
+    return int(low * (1 + (despair >= 3.0)) + mid * (3 + (despair >= 5.0)) + ultimate * 5)
 
 class KaijiDebtSystem:
     """カイジ的借金地獄管理システム"""
+    __slots__ = (
+        "despair_history", "_dh_head", "_dh_full",
+        "consecutive_losses", "consecutive_wins",
+        "total_debt_increase", "miracle_recoveries",
+    )
+    
+    DESPAIR_WINDOW = 100
     
     def __init__(self):
-        self.despair_history = deque(maxlen=100)
+        # 絶望レベルの直近ウィンドウ（固定長リングバッファ）
+        self.despair_history = np.empty(self.DESPAIR_WINDOW, dtype=np.float32)
+        self._dh_head = 0
+        self._dh_full = False
         self.consecutive_losses = 0
         self.consecutive_wins = 0
         self.total_debt_increase = 0  # 借金増加総額
         self.miracle_recoveries = 0   # 奇跡的回復回数
+    
+    def append_despair(self, despair_level: float):
+        """絶望レベルをリングバッファに追加（満杯なら最古の値を上書き）"""
+        self.despair_history[self._dh_head] = despair_level
+        self._dh_head = (self._dh_head + 1) % self.DESPAIR_WINDOW
+        if self._dh_head == 0:
+            self._dh_full = True
+    
+    def get_despair_window(self) -> np.ndarray:
+        """記録済みの絶望レベル（順不同のビュー。mean/std 等の集計用）"""
+        if self._dh_full:
+            return self.despair_history
+        return self.despair_history[:self._dh_head]
+        
+    def create_debt_value(self, initial_debt: int, personality: str,
+                          debt_state: Optional[np.ndarray] = None, index: int = 0) -> DebtValue:
+        """
+        性格に応じた借金価値を生成
+        
+        debt_state を渡すとその index 行に書き込む（省略時は1行分を新規確保）
+        """
+        if debt_state is None:
+            debt_state = np.zeros(1, dtype=DEBT_DTYPE)
+            index = 0
         
-    def create_debt_value(self, initial_debt: int, personality: str) -> DebtValue:
-        """性格に応じた借金価値を生成"""
         if personality == 'cautious':
-            # 慎重派: 高い絶望感、低い破れかぶれ度
-            return DebtValue(
-                debt_amount=initial_debt,
-                despair_level=3.0,  # 高めの初期絶望
-                desperation_coefficient=0.4,
-                hope_for_reversal=1.2
-            )
+            # 慎重派: 高い絶望感（高めの初期絶望）、低い破れかぶれ度
+            despair, desp_coef, hope = 3.0, 0.4, 1.2
         elif personality == 'aggressive':
-            # 攻撃派: 中程度の絶望感、高い破れかぶれ度
-            return DebtValue(
-                debt_amount=initial_debt,
-                despair_level=2.0,  # 低めの初期絶望
-                desperation_coefficient=0.6,
-                hope_for_reversal=1.8
-            )
+            # 攻撃派: 中程度の絶望感（低めの初期絶望）、高い破れかぶれ度
+            despair, desp_coef, hope = 2.0, 0.6, 1.8
         else:  # balanced
             # バランス派: 中程度だが不安定
-            return DebtValue(
-                debt_amount=initial_debt,
-                despair_level=2.5,
-                desperation_coefficient=0.5,
-                hope_for_reversal=1.5
-            )
+            despair, desp_coef, hope = 2.5, 0.5, 1.5
+        
+        debt_state[index] = (initial_debt, despair, desp_coef, hope)
+        return DebtValue(debt_state, index)
     
     def update_streaks(self, won: bool):
         """連勝・連敗の更新"""
@@ -153,20 +275,17 @@ class KaijiDebtSystem:
     
     def get_psychological_state(self, debt_amount: int, despair_level: float) -> str:
         """心理状態の判定"""
-        if debt_amount >= 0:
-            return "miracle_recovery"  # 奇跡の回復
-        elif debt_amount > -200:
-            if despair_level < 3.0:
-                return "cautious_hope"  # 慎重な希望
-            else:
-                return "desperate_hope"  # 絶望的希望
-        elif debt_amount > -800:
-            if despair_level < 5.0:
-                return "deep_despair"  # 深い絶望
-            else:
-                return "suicidal_despair"  # 自滅的絶望
-        else:
-            return "ultimate_despair"  # 究極の絶望
+        return STATE_NAMES[psych_state_code(debt_amount, despair_level)]
+
+# ===== 表示バッファ =====
+# ラウンド中の表示行を溜めておき、ラウンドごとに1回の write でまとめて出力する
+_out: List[str] = []
+
+def _flush_out():
+    """溜めた表示行を書き出してバッファを空にする"""
+    if _out:
+        sys.stdout.write("\n".join(_out) + "\n")
+        _out.clear()
 
 # ===== ルーレット設定 =====
 class RouletteConfig:
@@ -174,15 +293,45 @@ class RouletteConfig:
     MAX_NUMBER = 36
     RED_NUMBERS = [1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]
     BLACK_NUMBERS = [2, 4, 6, 8, 10, 11, 13, 15, 17, 20, 22, 24, 26, 28, 29, 31, 33, 35]
+    RED_SET = frozenset(RED_NUMBERS)
+    
+    # 精算用の色判定テーブル（出目でそのまま引く）
+    _IS_RED = np.zeros(MAX_NUMBER + 1, dtype=np.bool_)
+    _IS_RED[RED_NUMBERS] = True
+    _IS_BLACK = np.zeros(MAX_NUMBER + 1, dtype=np.bool_)
+    _IS_BLACK[BLACK_NUMBERS] = True
     
     # カイジ的高配当設定
     PAYOUT_ZERO = 36   # 35:1 + 元金
     PAYOUT_NUMBER = 36 # 35:1 + 元金
     PAYOUT_RED = 2     # 1:1 + 元金
     PAYOUT_BLACK = 2   # 1:1 + 元金
+    
+    # 賭け種類のコード化（ベクトル化精算用）
+    BET_TYPES = ("zero", "number", "red", "black")
+    BET_CODE = {bet_type: code for code, bet_type in enumerate(BET_TYPES)}
+    _NET_PAYOUT = np.array([PAYOUT_ZERO - 1, PAYOUT_NUMBER - 1, PAYOUT_RED - 1, PAYOUT_BLACK - 1])
+    
+    @classmethod
+    def settle(cls, result: int, codes: np.ndarray, values: np.ndarray,
+               amounts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        1回の出目に対する全ベットを一括精算
+        
+        codes: BET_CODE による賭け種類, values: 数字賭けの数字（それ以外は -1）
+        Returns: (won, payout) いずれもベット数の配列
+        """
+        won = np.select(
+            [codes == 0, codes == 1, codes == 2, codes == 3],
+            [result == 0, values == result, cls._IS_RED[result], cls._IS_BLACK[result]],
+            default=False,
+        )
+        payout = np.where(won, amounts * cls._NET_PAYOUT[codes], 0)
+        return won, payout
 
 class KaijiRoulette:
     """カイジ的地獄ルーレット"""
+    __slots__ = ("config", "spin_count", "total_despair_generated")
     
     def __init__(self):
         self.config = RouletteConfig()
@@ -191,18 +340,26 @@ class KaijiRoulette:
     
     def spin(self) -> int:
         """ルーレットを回す（カイジ的演出付き）"""
-        result = random.randint(0, self.config.MAX_NUMBER)
+        return self.announce(int(RNG.integers(0, self.config.MAX_NUMBER + 1)))
+    
+    def spin_batch(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        """n回分の出目を一括で生成（演出は announce() で1回ずつ）"""
+        return rng.integers(0, self.config.MAX_NUMBER + 1, size=n)
+    
+    def announce(self, result: int) -> int:
+        """出目の演出表示"""
+        result = int(result)
         self.spin_count += 1
         
         color = self._get_color(result)
         
         # カイジ的演出
         if result == 0:
-            print(f"\n🎰💀 ルーレット結果: {result} {color} - 運命の緑！")
+            _out.append(f"\n🎰💀 ルーレット結果: {result} {color} - 運命の緑！")
         elif result in [7, 13, 21]:  # 特別な数字
-            print(f"\n🎰🔥 ルーレット結果: {result} {color} - 悪魔の数字...")
+            _out.append(f"\n🎰🔥 ルーレット結果: {result} {color} - 悪魔の数字...")
         else:
-            print(f"\n🎰⚫ ルーレット結果: {result} {color}")
+            _out.append(f"\n🎰⚫ ルーレット結果: {result} {color}")
         
         return result
     
@@ -210,16 +367,86 @@ class KaijiRoulette:
         """数字の色を取得"""
         if number == 0:
             return "💚 GREEN"
-        elif number in self.config.RED_NUMBERS:
+        elif number in self.config.RED_SET:
             return "❤️ RED"
         else:
             return "🖤 BLACK"
 
 # ===== カイジ的借金プレイヤー =====
+# 履歴配列の既定容量（ラウンド数）
+MAX_ROUNDS = 64
+
+# 心理状態 → (賭け倍率, 心の声, 賭けの傾向)
+_PSYCH_TABLE = {
+    "miracle_recovery": (0.5, "🌈 奇跡だ...慎重に行こう...", "safe"),           # 奇跡の回復！慎重になる
+    "ultimate_despair": (3.0, "💀 もうどうでもいい！全てを賭ける！", "desperate"),  # 究極の絶望：完全に破れかぶれ
+    "suicidal_despair": (2.5, "🔥 地獄の底まで落ちてやる！", "aggressive"),       # 自滅的絶望：大きく賭ける
+    "deep_despair": (1.8, "😱 もう後がない...一発逆転を狙う", "risky"),          # 深い絶望：やや攻撃的
+    "desperate_hope": (1.3, "😰 まだ希望はある...はず", "moderate"),             # 絶望的希望：中程度の賭け
+    "cautious_hope": (0.8, "😟 慎重に...慎重に...", "cautious"),                # 慎重な希望：控えめ
+}
+
+# 心理状態アイコン
+_STATE_ICONS = {
+    "miracle_recovery": "🌈✨",
+    "cautious_hope": "😟💭",
+    "desperate_hope": "😰🙏",
+    "deep_despair": "😱💔",
+    "suicidal_despair": "🔥💀",
+    "ultimate_despair": "💀⚡"
+}
+
+# 色・数字混合ベットの選択肢と確率（リスキー／その他）
+_MIXED_BET_OPTIONS = ("red", "black", "number")
+_RISKY_P = np.array([0.30, 0.30, 0.40])
+_SAFE_P = np.array([0.45, 0.45, 0.10])
+
+def _sample_desperate(rng: np.random.Generator) -> Tuple[str, Optional[int]]:
+    """破れかぶれ：ゼロか数字狙い"""
+    if rng.random() < 0.3:
+        return "zero", None
+    return "number", int(rng.choice([7, 13, 21, 6, 9]))  # 「特別な」数字
+
+def _sample_aggressive(rng: np.random.Generator) -> Tuple[str, Optional[int]]:
+    """攻撃的：数字多め"""
+    if rng.random() < 0.6:
+        return "number", int(rng.integers(1, 37))
+    return ("red", "black")[int(rng.integers(2))], None
+
+def _sample_risky(rng: np.random.Generator) -> Tuple[str, Optional[int]]:
+    """リスキー：数字と色の混合"""
+    bet_type = _MIXED_BET_OPTIONS[rng.choice(3, p=_RISKY_P)]
+    return bet_type, int(rng.integers(1, 37)) if bet_type == "number" else None
+
+def _sample_safe(rng: np.random.Generator) -> Tuple[str, Optional[int]]:
+    """その他：安全な色賭け中心"""
+    bet_type = _MIXED_BET_OPTIONS[rng.choice(3, p=_SAFE_P)]
+    return bet_type, int(rng.integers(1, 37)) if bet_type == "number" else None
+
+# 賭けの傾向 → (bet_type, bet_value) を返すサンプラー
+_BET_SAMPLERS = {
+    "desperate": _sample_desperate,
+    "aggressive": _sample_aggressive,
+    "risky": _sample_risky,
+    "safe": _sample_safe,
+    "moderate": _sample_safe,
+    "cautious": _sample_safe,
+}
+
 class KaijiDebtPlayer:
     """カイジ的借金地獄プレイヤー"""
-    
-    def __init__(self, name: str, personality: str, initial_debt: int = -500):
+    __slots__ = (
+        "name", "personality", "initial_debt",
+        "engine", "state", "debt_system", "debt_value",
+        "round_count", "total_wins", "total_losses",
+        "_h_idx", "debt_history", "despair_history", "energy_history",
+        "pressure_history", "leap_history", "leap_count", "_tracks_leaps", "_last_leap_idx",
+        "_rng", "_pressure_buf", "color", "_name_hdr", "_indent_hdr", "_rst",
+    )
+    
+    def __init__(self, name: str, personality: str, initial_debt: int = -500,
+                 max_rounds: int = MAX_ROUNDS, debt_state: Optional[np.ndarray] = None,
+                 debt_index: int = 0):
         self.name = name
         self.personality = personality
         self.initial_debt = initial_debt
@@ -231,35 +458,64 @@ class KaijiDebtPlayer:
         
         # カイジ的借金システム
         self.debt_system = KaijiDebtSystem()
-        self.debt_value = self.debt_system.create_debt_value(initial_debt, personality)
+        self.debt_value = self.debt_system.create_debt_value(
+            initial_debt, personality, debt_state, debt_index
+        )
         
         # 履歴
         self.round_count = 0
         self.total_wins = 0
         self.total_losses = 0
-        self.debt_history = []
-        self.despair_history = []
-        self.energy_history = []  # SSDエンジンエネルギー履歴
-        self.pressure_history = []  # 投入圧力履歴
-        self.leap_history = []  # leap発生履歴
+        # 履歴は事前確保した配列に書き込む（_h_idx = 記録済みラウンド数）
+        # energy/pressure/leap は先頭に初期値を持つため max_rounds + 1 要素
+        # max_rounds は初期容量で、超えた場合は _grow_histories() で2倍に拡張する
+        max_rounds = max(1, max_rounds)
+        self._h_idx = 0
+        self.debt_history = np.empty(max_rounds, dtype=np.int32)
+        self.despair_history = np.empty(max_rounds, dtype=np.float64)
+        self.energy_history = np.empty(max_rounds + 1, dtype=np.float64)  # SSDエンジンエネルギー履歴
+        self.pressure_history = np.empty(max_rounds + 1, dtype=np.float64)  # 投入圧力履歴
+        self.leap_history = np.empty(max_rounds + 1, dtype=np.bool_)  # leap発生履歴
         self.leap_count = 0  # 総leap回数
+        # エンジン状態が跳躍履歴を持つかは一度だけ調べる
+        # （状態は毎ステップ新しくなり、跳躍時には履歴リストもコピーされるため、リスト自体は保持しない）
+        self._tracks_leaps = hasattr(self.state, 'leap_history')
+        self._last_leap_idx = 0  # 確認済みのエンジン側 leap_history の長さ
+        
+        # ベット選択用の乱数生成器（名前から決まるシードで再現可能）
+        self._rng = np.random.default_rng(zlib.crc32(name.encode('utf-8')))
+        
+        # 圧力ベクトル用バッファ（毎ラウンド再利用）
+        self._pressure_buf = np.zeros(4, dtype=np.float64)
         
         # 色分け（暗めのトーン）
         self.color = self._get_color()
+        # 毎ラウンドの表示で使う色付きヘッダを事前に組み立てておく
+        self._name_hdr = f"{self.color}{self.name}: "
+        self._indent_hdr = f"{self.color}  "
+        self._rst = Colors.RESET
         
         # 初期エネルギー記録
         initial_energy = np.sum(self.state.E)
-        self.energy_history.append(initial_energy)
-        self.pressure_history.append(0.0)  # 初期圧力は0
-        self.leap_history.append(False)  # 初期はleap無し
+        self.energy_history[0] = initial_energy
+        self.pressure_history[0] = 0.0  # 初期圧力は0
+        self.leap_history[0] = False  # 初期はleap無し
         
         despair_msg = f"絶望レベル{self.debt_value.despair_level:.1f}"
         print(f"{self.color}💀 {name}({personality})が地獄に参加 - 借金: {abs(initial_debt)}コイン ({despair_msg}){Colors.RESET}")
     
+    def _grow_histories(self):
+        """履歴配列が満杯になったら容量を2倍に拡張（記録済みの値は引き継ぐ）"""
+        for name in ("debt_history", "despair_history", "energy_history",
+                     "pressure_history", "leap_history"):
+            old = getattr(self, name)
+            new = np.empty(2 * len(old), dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+    
     def _get_color(self) -> str:
         """プレイヤー色（暗いトーン）"""
-        colors = [Colors.DARK_RED, Colors.GRAY, Colors.DARK_YELLOW]
-        return colors[hash(self.name) % len(colors)]
+        return _NAME_COLOR.get(self.name, Colors.WHITE)
     
     def get_current_debt(self) -> int:
         """現在の借金額"""
@@ -286,36 +542,7 @@ class KaijiDebtPlayer:
         base_bet = 20  # カイジ的に高めのベット
         
         # 心理状態に基づく賭けパターン
-        if psych_state == "miracle_recovery":
-            # 奇跡の回復！慎重になる
-            bet_multiplier = 0.5
-            comment = "🌈 奇跡だ...慎重に行こう..."
-            bet_preference = "safe"
-        elif psych_state == "ultimate_despair":
-            # 究極の絶望：完全に破れかぶれ
-            bet_multiplier = 3.0
-            comment = "💀 もうどうでもいい！全てを賭ける！"
-            bet_preference = "desperate"
-        elif psych_state == "suicidal_despair":
-            # 自滅的絶望：大きく賭ける
-            bet_multiplier = 2.5
-            comment = "🔥 地獄の底まで落ちてやる！"
-            bet_preference = "aggressive"
-        elif psych_state == "deep_despair":
-            # 深い絶望：やや攻撃的
-            bet_multiplier = 1.8
-            comment = "😱 もう後がない...一発逆転を狙う"
-            bet_preference = "risky"
-        elif psych_state == "desperate_hope":
-            # 絶望的希望：中程度の賭け
-            bet_multiplier = 1.3
-            comment = "😰 まだ希望はある...はず"
-            bet_preference = "moderate"
-        else:  # cautious_hope
-            # 慎重な希望：控えめ
-            bet_multiplier = 0.8
-            comment = "😟 慎重に...慎重に..."
-            bet_preference = "cautious"
+        bet_multiplier, comment, bet_preference = _PSYCH_TABLE[psych_state]
         
         bet_amount = max(10, int(base_bet * bet_multiplier))
         
@@ -328,51 +555,16 @@ class KaijiDebtPlayer:
             bet_amount = 10  # 最低限
         
         # ベット種類決定（心理状態依存）
-        if bet_preference == "desperate":
-            # 破れかぶれ：ゼロか数字狙い
-            if random.random() < 0.3:
-                bet_type = "zero"
-                bet_value = None
-            else:
-                bet_type = "number"
-                bet_value = random.choice([7, 13, 21, 6, 9])  # 「特別な」数字
-        elif bet_preference == "aggressive":
-            # 攻撃的：数字多め
-            if random.random() < 0.6:
-                bet_type = "number"
-                bet_value = random.randint(1, 36)
-            else:
-                bet_type = random.choice(["red", "black"])
-                bet_value = None
-        elif bet_preference == "risky":
-            # リスキー：数字と色の混合
-            bet_options = ["red", "black", "number"]
-            weights = [30, 30, 40]
-            bet_type = random.choices(bet_options, weights=weights, k=1)[0]
-            bet_value = random.randint(1, 36) if bet_type == "number" else None
-        else:
-            # その他：安全な色賭け中心
-            bet_options = ["red", "black", "number"]
-            weights = [45, 45, 10]
-            bet_type = random.choices(bet_options, weights=weights, k=1)[0]
-            bet_value = random.randint(1, 36) if bet_type == "number" else None
+        bet_type, bet_value = _BET_SAMPLERS[bet_preference](self._rng)
         
-        print(f"{self.color}{self.name}: {comment}{Colors.RESET}")
-        print(f"  💀 現在: {self.get_debt_status()}")
-        print(f"  😱 絶望レベル: {despair_level:.1f}/10.0, 希望: {hope_level:.1f}")
-        print(f"  🎰 {bet_type}に{bet_amount}コイン")
+        _out.append(self._name_hdr + comment + self._rst)
+        _out.append(f"  💀 現在: {self.get_debt_status()}")
+        _out.append(f"  😱 絶望レベル: {despair_level:.1f}/10.0, 希望: {hope_level:.1f}")
+        _out.append(f"  🎰 {bet_type}に{bet_amount}コイン")
         
         # 心理状態アイコン
-        state_icons = {
-            "miracle_recovery": "🌈✨",
-            "cautious_hope": "😟💭",
-            "desperate_hope": "😰🙏",
-            "deep_despair": "😱💔",
-            "suicidal_despair": "🔥💀",
-            "ultimate_despair": "💀⚡"
-        }
-        if psych_state in state_icons:
-            print(f"  ⚠️  {state_icons[psych_state]} {psych_state.replace('_', ' ').title()}")
+        if psych_state in _STATE_ICONS:
+            _out.append(f"  ⚠️  {_STATE_ICONS[psych_state]} {psych_state.replace('_', ' ').title()}")
         
         return bet_type, bet_value, bet_amount
     
@@ -407,62 +599,59 @@ class KaijiDebtPlayer:
         self.debt_system.update_streaks(won)
         
         # SSDエンジンにフィードバック（絶望による圧力）
-        import numpy as np
-        pressure_vector = np.zeros(4)
-        
         despair_change = self.debt_value.despair_level - old_despair
-        if won:
-            pressure_vector[3] = 0.2  # UPPER: 希望
-            if self.get_current_debt() >= 0:
-                pressure_vector[3] = 1.0  # 奇跡の回復
-        else:
-            # 絶望による多層圧力
-            pressure_vector[0] = despair_change * 0.8  # BASE: 絶望的な焦り
-            pressure_vector[1] = despair_change * 0.5  # CORE: 責任と後悔
-            pressure_vector[2] = despair_change * 0.3  # SOCIAL: 社会的地位の不安
-            
-            # 究極の絶望状態では全層に圧力
-            if self.debt_value.despair_level >= 8.0:
-                pressure_vector += 0.5
+        pressure_vector = self._pressure_buf
+        _build_pressure(
+            despair_change, won, self.get_current_debt() >= 0, self.debt_value.despair_level,
+            pressure_vector
+        )
         
         self.state = self.engine.step(self.state, pressure_vector, dt=1.0)
         
         # エネルギーと圧力の履歴記録
         current_energy = np.sum(self.state.E)  # 総エネルギー
-        self.energy_history.append(current_energy)
-        self.pressure_history.append(np.linalg.norm(pressure_vector))  # 圧力の大きさ
+        h = self._h_idx
+        if h >= len(self.debt_history):
+            self._grow_histories()
+        self.energy_history[h + 1] = current_energy
+        self.pressure_history[h + 1] = float(np.sqrt(pressure_vector @ pressure_vector))  # 圧力の大きさ
         
         # leap発生チェック
+        # 前回確認した位置以降にエンジン側の跳躍記録があれば、このラウンドでleapが起きた
+        # （1ステップで複数回跳躍した場合も全件数える）
         leap_occurred = False
-        if hasattr(self.state, 'leap_history') and self.state.leap_history:
-            # 前回チェック時より新しいleapがあるかチェック
-            current_leap_count = len(self.state.leap_history)
-            if current_leap_count > len(self.leap_history):
+        if self._tracks_leaps:
+            engine_leaps = self.state.leap_history
+            new_count = len(engine_leaps)
+            if new_count > self._last_leap_idx:
                 leap_occurred = True
-                self.leap_count += 1
-                latest_leap = self.state.leap_history[-1]
-                leap_type = latest_leap[1].name if hasattr(latest_leap[1], 'name') else str(latest_leap[1])
-                print(f"  ⚡🔥 {self.name}: LEAP発生！ {leap_type} (時刻: {latest_leap[0]:.2f})")
+                for leap_t, leap_kind in engine_leaps[self._last_leap_idx:]:
+                    self.leap_count += 1
+                    leap_type = leap_kind.name if hasattr(leap_kind, 'name') else str(leap_kind)
+                    _out.append(f"  ⚡🔥 {self.name}: LEAP発生！ {leap_type} (時刻: {leap_t:.2f})")
+                self._last_leap_idx = new_count
         
         # このラウンドのleap状態を記録
-        self.leap_history.append(leap_occurred)
+        self.leap_history[h + 1] = leap_occurred
         
         # 履歴記録
         new_debt = self.get_current_debt()
         new_despair = self.debt_value.despair_level
-        self.debt_history.append(new_debt)
-        self.despair_history.append(new_despair)
+        self.debt_history[h] = new_debt
+        self.despair_history[h] = new_despair
+        self.debt_system.append_despair(new_despair)
+        self._h_idx = h + 1
         
         # 結果表示
-        print(f"{self.color}  {result_msg}{Colors.RESET}")
-        print(f"  💰 借金: {abs(old_debt)}→{abs(new_debt) if new_debt < 0 else '完済！'}")
-        print(f"  😱 絶望: {old_despair:.1f}→{new_despair:.1f} ({emotion})")
+        _out.append(self._indent_hdr + result_msg + self._rst)
+        _out.append(f"  💰 借金: {abs(old_debt)}→{abs(new_debt) if new_debt < 0 else '完済！'}")
+        _out.append(f"  😱 絶望: {old_despair:.1f}→{new_despair:.1f} ({emotion})")
         
         # 連続記録表示
         if self.debt_system.consecutive_losses >= 3:
-            print(f"  🔥 地獄の{self.debt_system.consecutive_losses}連敗...")
+            _out.append(f"  🔥 地獄の{self.debt_system.consecutive_losses}連敗...")
         elif self.debt_system.consecutive_wins >= 2:
-            print(f"  ✨ 奇跡の{self.debt_system.consecutive_wins}連勝！")
+            _out.append(f"  ✨ 奇跡の{self.debt_system.consecutive_wins}連勝！")
 
 # ===== カイジ的地獄ゲーム実行 =====
 def run_kaiji_debt_hell_experiment():
@@ -478,21 +667,27 @@ def run_kaiji_debt_hell_experiment():
     print("・借金限度額: 2000コイン（それ以上は...）")
     print()
     
-    # プレイヤー作成
+    rounds = 25  # カイジ的に長期戦
+    
+    # プレイヤー作成（借金状態は全員分を1つの構造化配列で保持）
+    debt_state = np.zeros(3, dtype=DEBT_DTYPE)
     players = [
-        KaijiDebtPlayer("カイジ", "balanced", -500),    # 主人公
-        KaijiDebtPlayer("遠藤", "cautious", -500),      # 慎重派
-        KaijiDebtPlayer("佐原", "aggressive", -500),    # 攻撃派
+        KaijiDebtPlayer("カイジ", "balanced", -500, max_rounds=rounds,
+                        debt_state=debt_state, debt_index=0),    # 主人公
+        KaijiDebtPlayer("遠藤", "cautious", -500, max_rounds=rounds,
+                        debt_state=debt_state, debt_index=1),    # 慎重派
+        KaijiDebtPlayer("佐原", "aggressive", -500, max_rounds=rounds,
+                        debt_state=debt_state, debt_index=2),    # 攻撃派
     ]
     
     # 地獄のルーレット準備
     roulette = KaijiRoulette()
     
-    # 地獄ラウンド実行
-    rounds = 25  # カイジ的に長期戦
+    # 地獄ラウンド実行（出目は全ラウンド分を先に生成）
+    spins = roulette.spin_batch(RNG, rounds)
     
     for round_num in range(1, rounds + 1):
-        print(f"\n{'💀'*20} 地獄Round {round_num} {'💀'*20}")
+        _out.append(f"\n{'💀'*20} 地獄Round {round_num} {'💀'*20}")
         
         # 各プレイヤーがベット（借金限度まで）
         bets = []
@@ -501,40 +696,34 @@ def run_kaiji_debt_hell_experiment():
                 bet_type, bet_value, bet_amount = player.place_bet()
                 bets.append((player, bet_type, bet_value, bet_amount))
             else:
-                print(f"{player.color}{player.name}: 💀 借金限度額到達...もう終わりだ...{Colors.RESET}")
+                _out.append(player._name_hdr + "💀 借金限度額到達...もう終わりだ..." + player._rst)
         
         if not bets:
-            print("💀 全員が借金限度額に到達...地獄の終わり...")
+            _out.append("💀 全員が借金限度額に到達...地獄の終わり...")
+            _flush_out()
             break
         
         # 地獄のルーレット回転
-        result = roulette.spin()
-        
-        # 運命の判定
-        for player, bet_type, bet_value, bet_amount in bets:
-            won = False
-            payout = 0
+        result = roulette.announce(spins[round_num - 1])
+        
+        # 運命の判定（全ベットを一括精算）
+        codes = np.array([RouletteConfig.BET_CODE[b[1]] for b in bets])
+        values = np.array([-1 if b[2] is None else b[2] for b in bets])
+        amounts = np.array([b[3] for b in bets])
+        won_arr, payout_arr = RouletteConfig.settle(result, codes, values, amounts)
+        
+        for (player, bet_type, bet_value, bet_amount), won, payout in zip(bets, won_arr, payout_arr):
+            won = bool(won)
+            if won and bet_type == "zero":
+                _out.append(f"🌈 {player.name} - 奇跡のゼロ！大勝利！")
+            elif won and bet_type == "number":
+                _out.append(f"🎰 {player.name} - 数字的中！一発逆転！")
             
-            if bet_type == "zero" and result == 0:
-                won = True
-                payout = bet_amount * (RouletteConfig.PAYOUT_ZERO - 1)
-                print(f"🌈 {player.name} - 奇跡のゼロ！大勝利！")
-            elif bet_type == "number" and result == bet_value:
-                won = True
-                payout = bet_amount * (RouletteConfig.PAYOUT_NUMBER - 1)
-                print(f"🎰 {player.name} - 数字的中！一発逆転！")
-            elif bet_type == "red" and result in RouletteConfig.RED_NUMBERS:
-                won = True
-                payout = bet_amount * (RouletteConfig.PAYOUT_RED - 1)
-            elif bet_type == "black" and result in RouletteConfig.BLACK_NUMBERS:
-                won = True
-                payout = bet_amount * (RouletteConfig.PAYOUT_BLACK - 1)
-            
-            player.update_result(won, payout, bet_amount)
+            player.update_result(won, int(payout), bet_amount)
         
         # 地獄の中間報告
         if round_num % 10 == 0:
-            print(f"\n💀 地獄{round_num}ラウンド後の絶望状況:")
+            _out.append(f"\n💀 地獄{round_num}ラウンド後の絶望状況:")
             for player in players:
                 debt = player.get_current_debt()
                 despair = player.debt_value.despair_level
@@ -551,9 +740,12 @@ def run_kaiji_debt_hell_experiment():
                     status_icon = "💀"
                     status = f"地獄の{abs(debt)}コインの借金"
                 
-                print(f"{player.color}  {player.name}: {status_icon}{status} "
-                      f"(絶望: {despair:.1f}, 希望: {hope:.1f}, "
-                      f"勝率: {win_rate:.1%}){Colors.RESET}")
+                _out.append(f"{player.color}  {player.name}: {status_icon}{status} "
+                            f"(絶望: {despair:.1f}, 希望: {hope:.1f}, "
+                            f"勝率: {win_rate:.1%}){Colors.RESET}")
+        
+        # このラウンドの出力をまとめて書き出す
+        _flush_out()
     
     # 地獄の最終審判
     print(f"\n{'💀'*80}")
@@ -583,6 +775,9 @@ def run_kaiji_debt_hell_experiment():
         print(f"\n{player.color}💀 {player.name} ({player.personality}){Colors.RESET}")
         print(f"  💰 借金変化: {abs(initial_debt)}→{abs(debt) if debt < 0 else f'完済+{debt}'} ({debt_change:+d})")
         print(f"  😱 最終絶望レベル: {despair:.1f}/10.0")
+        despair_window = player.debt_system.get_despair_window()
+        if despair_window.size:
+            print(f"  📉 平均絶望レベル（直近{despair_window.size}ラウンド）: {despair_window.mean():.1f}/10.0")
         print(f"  🙏 最終希望レベル: {hope:.1f}")
         print(f"  ⚖️  最終状態: {final_state}")
         print(f"  📜 審判: {judgement}")
@@ -603,20 +798,46 @@ def run_kaiji_debt_hell_experiment():
     print("・カイジの世界観：希望と絶望が交錯する人間ドラマ")
     print(f"{'💀'*80}")
 
+def _stack_histories(series, length: int) -> np.ndarray:
+    """長さの異なる履歴を NaN 埋めの (length, 系列数) 行列にまとめる（plot は NaN を描かない）"""
+    mat = np.full((length, len(series)), np.nan)
+    for k, values in enumerate(series):
+        mat[:len(values), k] = values
+    return mat
+
 def create_kaiji_despair_charts(players):
     """カイジ的絶望変化のグラフを作成"""
+    # matplotlib はグラフ作成時だけ必要なので遅延インポート
+    import matplotlib.pyplot as plt
+    from matplotlib.colors import ListedColormap
+    
     fig, ((ax1, ax2, ax5), (ax3, ax4, ax6)) = plt.subplots(2, 3, figsize=(20, 10))
     
     colors = ['darkred', 'gray', 'darkorange']
+    names = [player.name for player in players]
+    cmap = ListedColormap(colors[:len(players)])
+    for ax in (ax1, ax2, ax4, ax5):
+        ax.set_prop_cycle(color=colors)
+    
+    # 履歴をプレイヤー列の行列にまとめ、各グラフを plot / scatter 1回で描く
+    # （限度額到達で途中離脱したプレイヤーの分は NaN 埋め）
+    n_rounds = np.array([player._h_idx for player in players])
+    xs = np.arange(1, n_rounds.max() + 1)
+    xs_e = np.arange(1, n_rounds.max() + 2)  # 初期値を含む系列（エネルギー・圧力）用
+    debts = [player.debt_history[:n] for player, n in zip(players, n_rounds)]
+    despairs = [player.despair_history[:n] for player, n in zip(players, n_rounds)]
+    energies = [player.energy_history[:n + 1] for player, n in zip(players, n_rounds)]
+    pressures = [player.pressure_history[:n + 1] for player, n in zip(players, n_rounds)]
+    
+    # 散布図の色分け用プレイヤー番号
+    idx = np.repeat(np.arange(len(players)), n_rounds)
+    idx_e = np.repeat(np.arange(len(players)), n_rounds + 1)
     
     # グラフ1: 借金額の変化
-    for i, player in enumerate(players):
-        rounds = list(range(1, len(player.debt_history) + 1))
-        debts = player.debt_history
-        ax1.plot(rounds, debts, marker='o', color=colors[i], 
-                label=f"{player.name}({player.personality})", linewidth=2)
-        ax1.axhline(y=0, color='green', linestyle='--', alpha=0.5, label='完済ライン' if i == 0 else "")
-        ax1.axhline(y=-2000, color='red', linestyle='--', alpha=0.5, label='限度額' if i == 0 else "")
+    ax1.plot(xs, _stack_histories(debts, len(xs)), marker='o', linewidth=2,
+             label=[f"{player.name}({player.personality})" for player in players])
+    ax1.axhline(y=0, color='green', linestyle='--', alpha=0.5, label='完済ライン')
+    ax1.axhline(y=-2000, color='red', linestyle='--', alpha=0.5, label='限度額')
     
     ax1.set_title('借金地獄の変遷', fontsize=14, fontweight='bold')
     ax1.set_xlabel('ラウンド')
@@ -625,13 +846,9 @@ def create_kaiji_despair_charts(players):
     ax1.grid(True, alpha=0.3)
     
     # グラフ2: 絶望レベルの変化
-    for i, player in enumerate(players):
-        rounds = list(range(1, len(player.despair_history) + 1))
-        despair = player.despair_history
-        ax2.plot(rounds, despair, marker='s', color=colors[i], 
-                label=f"{player.name}", linewidth=2)
-        ax2.axhline(y=5.0, color='orange', linestyle='--', alpha=0.5, label='危険域' if i == 0 else "")
-        ax2.axhline(y=8.0, color='red', linestyle='--', alpha=0.5, label='絶望域' if i == 0 else "")
+    ax2.plot(xs, _stack_histories(despairs, len(xs)), marker='s', linewidth=2, label=names)
+    ax2.axhline(y=5.0, color='orange', linestyle='--', alpha=0.5, label='危険域')
+    ax2.axhline(y=8.0, color='red', linestyle='--', alpha=0.5, label='絶望域')
     
     ax2.set_title('絶望レベルの深化', fontsize=14, fontweight='bold')
     ax2.set_xlabel('ラウンド')
@@ -640,22 +857,18 @@ def create_kaiji_despair_charts(players):
     ax2.grid(True, alpha=0.3)
     
     # グラフ3: 借金vs絶望の相関
-    for i, player in enumerate(players):
-        ax3.scatter(player.debt_history, player.despair_history, 
-                   color=colors[i], alpha=0.6, s=50, label=f"{player.name}")
+    sc3 = ax3.scatter(np.concatenate(debts), np.concatenate(despairs),
+                      c=idx, cmap=cmap, vmin=0, vmax=len(players) - 1, alpha=0.6, s=50)
     
     ax3.set_title('借金額 vs 絶望レベル', fontsize=14, fontweight='bold')
     ax3.set_xlabel('借金額')
     ax3.set_ylabel('絶望レベル')
-    ax3.legend()
+    ax3.legend(sc3.legend_elements()[0], names)
     ax3.grid(True, alpha=0.3)
     
     # グラフ4: SSDエンジンエネルギー推移
-    for i, player in enumerate(players):
-        rounds = list(range(1, len(player.energy_history) + 1))
-        ax4.plot(rounds, player.energy_history, 
-                color=colors[i], marker='o', markersize=3,
-                label=f"{player.name} Energy", linewidth=2)
+    ax4.plot(xs_e, _stack_histories(energies, len(xs_e)), marker='o', markersize=3, linewidth=2,
+             label=[f"{name} Energy" for name in names])
     
     ax4.set_title('SSDエンジン エネルギー(E)推移', fontsize=14, fontweight='bold')
     ax4.set_xlabel('ラウンド')
@@ -664,11 +877,8 @@ def create_kaiji_despair_charts(players):
     ax4.grid(True, alpha=0.3)
     
     # グラフ5: 投入圧力の推移
-    for i, player in enumerate(players):
-        rounds = list(range(1, len(player.pressure_history) + 1))
-        ax5.plot(rounds, player.pressure_history, 
-                color=colors[i], marker='s', markersize=3,
-                label=f"{player.name} Pressure", linewidth=2)
+    ax5.plot(xs_e, _stack_histories(pressures, len(xs_e)), marker='s', markersize=3, linewidth=2,
+             label=[f"{name} Pressure" for name in names])
     
     ax5.set_title('投入圧力推移', fontsize=14, fontweight='bold')
     ax5.set_xlabel('ラウンド')
@@ -677,19 +887,17 @@ def create_kaiji_despair_charts(players):
     ax5.grid(True, alpha=0.3)
     
     # グラフ6: E vs 圧力の相関
-    for i, player in enumerate(players):
-        ax6.scatter(player.pressure_history, player.energy_history, 
-                   color=colors[i], alpha=0.6, s=50, label=f"{player.name}")
+    sc6 = ax6.scatter(np.concatenate(pressures), np.concatenate(energies),
+                      c=idx_e, cmap=cmap, vmin=0, vmax=len(players) - 1, alpha=0.6, s=50)
     
     ax6.set_title('投入圧力 vs エネルギー応答', fontsize=14, fontweight='bold')
     ax6.set_xlabel('投入圧力')
     ax6.set_ylabel('エネルギー')
-    ax6.legend()
+    ax6.legend(sc6.legend_elements()[0], names)
     ax6.grid(True, alpha=0.3)
     
     plt.tight_layout()
     plt.show()
 
 if __name__ == "__main__":
-    random.seed(42)  # カイジも運命には逆らえない
     run_kaiji_debt_hell_experiment()
\ No newline at end of file
@@ -8,7 +8,6 @@ Log-Alignmentを完全に無効化して、
 
 import sys
 import os
-import random
 import numpy as np
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
@@ -21,9 +20,30 @@ extensions_path = os.path.join(current_dir, "..", "..", "extensions")
 sys.path.insert(0, core_path)
 sys.path.insert(0, extensions_path)
 
-# SSD Log版エンジンをインポート
-from ssd_core_engine_log import SSDCoreEngine, SSDCoreParams, create_default_state
+# SSDコアエンジン（Log-Alignment対応の正式版）をインポート
+# バッチ更新（step_batched / create_batched_state）があるのはこちらなので、エンジン・パラメータもそろえる
+from ssd_core_engine import SSDCoreEngine, SSDCoreParams, create_batched_state
 from ssd_human_module import HumanAgent, HumanParams
+from ssd_pressure_kernels import raw_pressure
+
+# ラウンド内の詳細出力（--quiet または KAIJI_VERBOSE=0 で抑制）
+VERBOSE = os.environ.get('KAIJI_VERBOSE', '1') == '1' and '--quiet' not in sys.argv
+
+# ラウンド内の出力はここに溜めて、ラウンド末尾で1回だけ書き出す
+_round_lines = []
+_log = _round_lines.append if VERBOSE else (lambda msg: None)
+
+
+def _flush_log():
+    """溜めたラウンド出力をまとめて標準出力へ書き出す"""
+    if _round_lines:
+        sys.stdout.write("\n".join(_round_lines) + "\n")
+        _round_lines.clear()
+
+
+# 見出し用の装飾（毎ラウンド作り直さないよう一度だけ生成）
+SKULL20 = "💀" * 20
+SKULL58 = "💀" * 58
 
 
 # カイジ用のRaw（Log-Alignment無効）パラメータ
@@ -78,13 +98,20 @@ class KaijiRawPlayer:
     def __post_init__(self):
         self.energy_history = []
         self.pressure_history = []
+        self._despair = None  # 絶望レベルのキャッシュ（debt/hope 更新時に再計算）
     
-    @property
-    def despair_level(self) -> float:
-        """絶望レベル計算 (0-10)"""
+    def _recompute_despair(self):
+        """絶望レベル計算 (0-10) してキャッシュに書き込む"""
         base_despair = min(self.debt / 200.0, 10.0)
         hope_modifier = max(0.1, 1.0 / max(0.1, self.hope))
-        return min(base_despair * hope_modifier, 10.0)
+        self._despair = min(base_despair * hope_modifier, 10.0)
+    
+    @property
+    def despair_level(self) -> float:
+        """絶望レベル (0-10)。1ラウンド中に何度も参照されるのでキャッシュを返す"""
+        if self._despair is None:
+            self._recompute_despair()
+        return self._despair
     
     def get_bet_amount(self) -> int:
         """賭け金計算（借金の10%基準、絶望に応じて変動）"""
@@ -92,17 +119,17 @@ class KaijiRawPlayer:
         despair_multiplier = 1.0 + (self.despair_level / 10.0) * 0.5
         return int(base_bet * despair_multiplier)
     
-    def choose_color(self) -> RouletteColor:
-        """色選択（性格と絶望に基づく）"""
+    def choose_color(self, draw: float) -> RouletteColor:
+        """色選択（性格と絶望に基づく）。draw は事前生成した [0, 1) の一様乱数"""
         if self.personality == "cautious":
             # 慎重派: 赤をやや好む
-            return RouletteColor.RED if random.random() < 0.6 else RouletteColor.BLACK
+            return RouletteColor.RED if draw < 0.6 else RouletteColor.BLACK
         elif self.personality == "aggressive":
             # 攻撃的: 黒を好む（高リスク高リターン的心理）
-            return RouletteColor.BLACK if random.random() < 0.6 else RouletteColor.RED
+            return RouletteColor.BLACK if draw < 0.6 else RouletteColor.RED
         else:  # balanced
             # バランス派: 五分五分
-            return RouletteColor.RED if random.random() < 0.5 else RouletteColor.BLACK
+            return RouletteColor.RED if draw < 0.5 else RouletteColor.BLACK
     
     def update_psychology(self, won: bool, amount: int):
         """心理状態更新"""
@@ -118,6 +145,7 @@ class KaijiRawPlayer:
             self.consecutive_wins = 0
         
         self.total_rounds += 1
+        self._recompute_despair()
     
     def get_status_emoji(self) -> str:
         """状況に応じた絵文字"""
@@ -148,32 +176,23 @@ class KaijiRawPlayer:
             return "完全に絶望の底..."
 
 
-def create_roulette_result():
-    """ルーレット結果生成（0-36、0は緑）"""
-    number = random.randint(0, 36)
-    if number == 0:
-        return number, "GREEN"
-    elif number in [1,3,5,7,9,12,14,16,18,19,21,23,25,27,30,32,34,36]:
-        return number, "RED"
-    else:
-        return number, "BLACK"
+# 出目 → 赤/黒 の判定テーブル（0 は緑なのでどちらでもない）
+IS_RED = np.zeros(37, dtype=bool)
+IS_RED[[1, 3, 5, 7, 9, 12, 14, 16, 18, 19, 21, 23, 25, 27, 30, 32, 34, 36]] = True
+IS_BLACK = ~IS_RED
+IS_BLACK[0] = False
+
+
+def create_roulette_result(number: int):
+    """ルーレット結果（0-36、0は緑）。number は事前生成した出目"""
+    number = int(number)
+    return number, ("GREEN" if number == 0 else ("RED" if IS_RED[number] else "BLACK"))
 
 
 def inject_despair_pressure(player: KaijiRawPlayer) -> float:
     """絶望に基づく心理圧力注入（Log-Alignment無効なので直接的）"""
-    despair = player.despair_level
-    base_pressure = despair * 20.0  # 絶望1レベルあたり20の圧力
-    
-    # 連敗による圧力増加
-    loss_pressure = player.consecutive_losses * 15.0
-    
-    # 借金による圧力
-    debt_pressure = min(player.debt / 10.0, 100.0)
-    
-    total_pressure = base_pressure + loss_pressure + debt_pressure
-    
-    # Raw版なので圧力をそのまま返す
-    return total_pressure
+    # 絶望・連敗・借金による圧力の和（Raw版なので圧力をそのまま返す）
+    return raw_pressure(player.despair_level, player.consecutive_losses, player.debt)
 
 
 def run_kaiji_raw_experiment():
@@ -190,6 +209,7 @@ def run_kaiji_raw_experiment():
     
     # パラメータ設定
     engine_params = create_kaiji_raw_params()
+    Theta = np.asarray(engine_params.Theta_values, dtype=np.float64)
     human_params = HumanParams()
     
     # プレイヤー作成
@@ -199,82 +219,90 @@ def run_kaiji_raw_experiment():
         KaijiRawPlayer("佐原", "aggressive"),
     ]
     
+    # SSDエンジンは全員で1つを共有し、状態は (プレイヤー, レイヤー) のバッチで持つ
+    n_players = len(players)
+    engine = SSDCoreEngine(engine_params)
+    batch_state = create_batched_state(n_players, engine_params.num_layers)
+    P = np.zeros((n_players, engine_params.num_layers))  # ラウンドごとの圧力行列
+    
     # エージェント初期化
     for player in players:
         player.agent = HumanAgent(human_params)
-        state = create_default_state(engine_params.num_layers)
-        player.agent.engine = SSDCoreEngine(engine_params)
-        player.agent.engine.current_state = state
         print(f"💀 {player.name}({player.personality})が地獄に参加 - 借金: {player.debt}コイン (絶望レベル{player.despair_level:.1f})")
     
     print()
     
     # 25ラウンドの地獄
+    n_rounds = 25
     total_leaps = 0
     
-    for round_num in range(1, 26):
-        print("💀" * 20 + f" 地獄Round {round_num} " + "💀" * 20)
+    # 乱数は実験全体の分を先に生成しておき、ラウンド・プレイヤーで引く
+    rng = np.random.default_rng(42)
+    color_draws = rng.random((n_rounds, n_players))
+    spins = rng.integers(0, 37, n_rounds)
+    
+    for round_num in range(1, n_rounds + 1):
+        _log(f"{SKULL20} 地獄Round {round_num} {SKULL20}")
         
         # 各プレイヤーの行動
         round_results = []
-        for player in players:
+        P.fill(0.0)
+        for i, player in enumerate(players):
             status = player.get_status_emoji()
             message = player.get_status_message()
             bet_amount = player.get_bet_amount()
-            chosen_color = player.choose_color()
+            chosen_color = player.choose_color(color_draws[round_num - 1, i])
             
-            print(f"{player.name}: {status} {message}")
-            print(f"  💀 現在: {player.debt}コインの借金")
-            print(f"  😱 絶望レベル: {player.despair_level:.1f}/10.0, 希望: {player.hope:.1f}")
-            print(f"  🎰 {chosen_color.value}に{bet_amount}コイン")
+            if VERBOSE:
+                _log(f"{player.name}: {status} {message}")
+                _log(f"  💀 現在: {player.debt}コインの借金")
+                _log(f"  😱 絶望レベル: {player.despair_level:.1f}/10.0, 希望: {player.hope:.1f}")
+                _log(f"  🎰 {chosen_color.value}に{bet_amount}コイン")
             
             # 心理圧力注入（Raw版 - Log-Alignment無効）
             pressure = inject_despair_pressure(player)
-            print(f"  ⚠️  💸 Raw Pressure: {pressure:.1f}")
-            
-            # SSDエンジンで圧力処理
-            old_energy = player.agent.engine.current_state.E[0]
-            
-            # 圧力をベクトルとして設定（第1レイヤーに注入）
-            pressure_vector = np.zeros(engine_params.num_layers)
-            pressure_vector[0] = pressure
-            
-            # ステップ実行
-            new_state = player.agent.engine.step(player.agent.engine.current_state, pressure_vector)
-            player.agent.engine.current_state = new_state
+            _log(f"  ⚠️  💸 Raw Pressure: {pressure:.1f}")
             
-            new_energy = new_state.E[0]
-            
-            # LEAP判定（手動）
-            leap_occurred = False
-            for i, (energy, theta) in enumerate(zip(new_state.E, engine_params.Theta_values)):
-                if energy >= theta:
-                    leap_occurred = True
-                    player.leap_count += 1
-                    total_leaps += 1
-                    print(f"  🚀 LEAP発生! レイヤー{i+1}でE={energy:.2f} >= Theta={theta} (累計{player.leap_count}回)")
-                    # LEAPによるエネルギーリセット
-                    new_state.E[i] = 0.0
-                    break
-            
-            # エネルギー履歴記録
-            player.energy_history.append(new_energy)
-            player.pressure_history.append(pressure)
+            # 圧力行列の自分の行に設定（第1レイヤーに注入）
+            P[i, 0] = pressure
             
             round_results.append((player, bet_amount, chosen_color, pressure))
         
-        print()
+        # SSDエンジンで全員分の圧力を一括処理
+        batch_state = engine.step_batched(batch_state, P)
+        E_all = batch_state.E
+        new_energy = E_all[:, 0].copy()  # LEAPリセット前の第1レイヤー
+        
+        # LEAP判定（手動）：各プレイヤーで閾値を超えた最初のレイヤー
+        exceed = E_all >= Theta
+        leap_rows = np.flatnonzero(exceed.any(axis=1))
+        leap_layers = exceed.argmax(axis=1)
+        for i in leap_rows:
+            player = players[i]
+            layer = leap_layers[i]
+            player.leap_count += 1
+            total_leaps += 1
+            _log(f"  🚀 {player.name}: LEAP発生! レイヤー{layer+1}でE={E_all[i, layer]:.2f} >= Theta={Theta[layer]} (累計{player.leap_count}回)")
+        # LEAPによるエネルギーリセット
+        E_all[leap_rows, leap_layers[leap_rows]] = 0.0
+        
+        # エネルギー履歴記録
+        for i, player in enumerate(players):
+            player.energy_history.append(new_energy[i])
+            player.pressure_history.append(P[i, 0])
+        
+        _log("")
         
         # ルーレット回転
-        number, color = create_roulette_result()
+        number, color = create_roulette_result(spins[round_num - 1])
         
         if number == 0:
-            print(f"🎰💚 ルーレット結果: {number} 💚 GREEN - 全員敗北...")
+            _log(f"🎰💚 ルーレット結果: {number} 💚 GREEN - 全員敗北...")
             winner_color = None
         else:
             color_emoji = "❤️" if color == "RED" else "🖤"
             special_emoji = "🔥" if number in [7, 13] else ""
-            print(f"🎰{special_emoji} ルーレット結果: {number} {color_emoji} {color}{(' - 悪魔の数字...' if special_emoji else '')}")
+            _log(f"🎰{special_emoji} ルーレット結果: {number} {color_emoji} {color}{(' - 悪魔の数字...' if special_emoji else '')}")
             winner_color = color
         
         # 勝敗処理
@@ -288,69 +316,75 @@ def run_kaiji_raw_experiment():
                 won = chosen_color.value.upper() == winner_color
             
             if won:
-                print(f"  🎉 勝利！ +{bet_amount}コイン")
-                print(f"  💰 借金: {player.debt}→{max(0, player.debt - bet_amount)}")
-                print(f"  😱 絶望: {player.despair_level:.1f}→{max(0.1, (max(0, player.debt - bet_amount) / 200.0) * max(0.1, 1.0 / max(0.1, min(5.0, player.hope * 1.2)))):.1f} (希望の光が見えた)")
+                if VERBOSE:
+                    _log(f"  🎉 勝利！ +{bet_amount}コイン")
+                    _log(f"  💰 借金: {player.debt}→{max(0, player.debt - bet_amount)}")
+                    _log(f"  😱 絶望: {player.despair_level:.1f}→{max(0.1, (max(0, player.debt - bet_amount) / 200.0) * max(0.1, 1.0 / max(0.1, min(5.0, player.hope * 1.2)))):.1f} (希望の光が見えた)")
                 round_winners += 1
                 
                 player.update_psychology(True, bet_amount)
                 
                 if player.consecutive_wins >= 2:
-                    print(f"  ✨ 奇跡の{player.consecutive_wins}連勝！")
+                    _log(f"  ✨ 奇跡の{player.consecutive_wins}連勝！")
                     
             else:
-                print(f"  💀 敗北... -{bet_amount}コイン")
-                print(f"  💰 借金: {player.debt - bet_amount}→{player.debt + bet_amount}")
-                print(f"  😱 絶望: {player.despair_level:.1f}→{min(10.0, ((player.debt + bet_amount) / 200.0) * max(0.1, 1.0 / max(0.1, max(0.1, player.hope * 0.8)))):.1f} (借金が雪だるま式に...)")
+                if VERBOSE:
+                    _log(f"  💀 敗北... -{bet_amount}コイン")
+                    _log(f"  💰 借金: {player.debt - bet_amount}→{player.debt + bet_amount}")
+                    _log(f"  😱 絶望: {player.despair_level:.1f}→{min(10.0, ((player.debt + bet_amount) / 200.0) * max(0.1, 1.0 / max(0.1, max(0.1, player.hope * 0.8)))):.1f} (借金が雪だるま式に...)")
                 round_losers += 1
                 
                 player.update_psychology(False, bet_amount)
                 
                 if player.consecutive_losses >= 3:
-                    print(f"  🔥 地獄の{player.consecutive_losses}連敗...")
+                    _log(f"  🔥 地獄の{player.consecutive_losses}連敗...")
         
         # ラウンド総括
         if round_winners == 3:
-            print("  ✨ 奇跡の全員勝利！")
+            _log("  ✨ 奇跡の全員勝利！")
         elif round_losers == 3:
-            print("  🔥 地獄の3連敗...")
+            _log("  🔥 地獄の3連敗...")
         
-        print()
+        _log("")
         
         # 10ラウンド毎に中間報告
         if round_num % 10 == 0:
-            print(f"💀 地獄{round_num}ラウンド後の状況:")
+            _log(f"💀 地獄{round_num}ラウンド後の状況:")
             for player in players:
-                print(f"  {player.name}: {player.debt}コインの借金 (絶望: {player.despair_level:.1f}, LEAP: {player.leap_count}回)")
-            print()
+                _log(f"  {player.name}: {player.debt}コインの借金 (絶望: {player.despair_level:.1f}, LEAP: {player.leap_count}回)")
+            _log("")
+        
+        _flush_log()
     
-    # 最終結果
-    print("💀" * 58)
-    print("💀" * 22 + "                                                                         ⚰️  Raw版実験 - 最終審判")
-    print("💀" * 58)
-    print("💀" * 22 + "                                                                         ")
+    # 最終結果（まとめて1回で出力）
+    out = []
+    out.append(SKULL58)
+    out.append(f"{'⚰️  Raw版実験 - 最終審判':^80}")
+    out.append(SKULL58)
     
     for player in players:
         initial_debt = 500
         debt_change = initial_debt - player.debt if player.debt < initial_debt else -(player.debt - initial_debt)
         win_rate = (player.total_rounds - sum(1 for i in range(len(player.energy_history)) if i < len(round_results) and not round_results[i])) / player.total_rounds * 100 if player.total_rounds > 0 else 0
         
-        print(f"💀 {player.name} ({player.personality})")
-        print(f"  💰 借金変化: {initial_debt}→{player.debt}")
-        print(f"  😱 最終絶望レベル: {player.despair_level:.1f}/10.0")
+        out.append(f"💀 {player.name} ({player.personality})")
+        out.append(f"  💰 借金変化: {initial_debt}→{player.debt}")
+        out.append(f"  😱 最終絶望レベル: {player.despair_level:.1f}/10.0")
         if player.leap_count > 0:
-            print(f"  ⚡ LEAP発生: {player.leap_count}回 🚀🚀🚀")
+            out.append(f"  ⚡ LEAP発生: {player.leap_count}回 🚀🚀🚀")
         else:
-            print(f"  ⚡ LEAP発生: {player.leap_count}回 🔥🔥🔥")
-        print(f"  🎯 勝率: 計算中")
-        print()
+            out.append(f"  ⚡ LEAP発生: {player.leap_count}回 🔥🔥🔥")
+        out.append(f"  🎯 勝率: 計算中")
+        out.append("")
     
-    print(f"🎯 全体LEAP発生総数: {total_leaps}回")
+    out.append(f"🎯 全体LEAP発生総数: {total_leaps}回")
     
     if total_leaps > 0:
-        print("🚀 Raw版でLEAP発生確認！Log-Alignmentが主要阻害因子だった！")
+        out.append("🚀 Raw版でLEAP発生確認！Log-Alignmentが主要阻害因子だった！")
     else:
-        print("😱 Raw版でもLEAP未発生...さらなる調査が必要")
+        out.append("😱 Raw版でもLEAP未発生...さらなる調査が必要")
+    
+    print("\n".join(out))
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ SSD Log版エンジンのTheta閾値を大幅に下げて、
 
 import sys
 import os
-import random
 import numpy as np
 import matplotlib.pyplot as plt
 from dataclasses import dataclass
@@ -21,10 +20,19 @@ extensions_path = os.path.join(current_dir, "..", "..", "extensions")
 sys.path.insert(0, core_path)
 sys.path.insert(0, extensions_path)
 
-# SSD Log版エンジンをインポート
-from ssd_core_engine_log import SSDCoreEngine, SSDCoreParams, create_default_state
+# SSDコアエンジン（Log-Alignment対応の正式版）をインポート
+# バッチ更新（step_batched / create_batched_state）があるのはこちらなので、エンジン・パラメータもそろえる
+from ssd_core_engine import SSDCoreEngine, SSDCoreParams, LeapType, create_batched_state
 from ssd_human_module import HumanAgent, HumanPressure, HumanLayer
-import numpy as np
+from ssd_pressure_kernels import sensitive_pressure_vec
+
+# 跳躍したレイヤー番号（step_batched の diagnostics['leap_layer']）→ 跳躍タイプ
+LEAP_TYPE_BY_LAYER = (
+    LeapType.LEAP_LAYER_1,
+    LeapType.LEAP_LAYER_2,
+    LeapType.LEAP_LAYER_3,
+    LeapType.LEAP_LAYER_4,
+)
 
 # カイジ用の高感度パラメータ
 def create_kaiji_sensitive_params():
@@ -58,6 +66,9 @@ class Colors:
     GREEN = '\033[32m'
     CYAN = '\033[36m'
 
+# プレイヤー表示色（color_idx で指定）
+PLAYER_COLORS = (Colors.DARK_RED, Colors.GRAY, Colors.DARK_YELLOW)
+
 # ルーレット設定
 @dataclass
 class RouletteConfig:
@@ -69,6 +80,12 @@ class RouletteConfig:
     PAYOUT_NUMBER = 36
     PAYOUT_ZERO = 36
 
+# 出目 → 赤/黒 の判定テーブル（0 は緑なのでどちらでもない）
+IS_RED = np.zeros(37, dtype=bool)
+IS_RED[RouletteConfig.RED_NUMBERS] = True
+IS_BLACK = ~IS_RED
+IS_BLACK[0] = False
+
 # 借金価値システム
 class DebtValue:
     def __init__(self, initial_debt: int, personality: str):
@@ -146,8 +163,9 @@ class HellRoulette:
         self.config = RouletteConfig()
         self.history = []
     
-    def spin(self) -> int:
-        result = random.randint(0, 36)
+    def spin(self, result: int) -> int:
+        """出目（事前生成済み）の記録と演出表示"""
+        result = int(result)
         self.history.append(result)
         
         color = self._get_color(result)
@@ -164,24 +182,20 @@ class HellRoulette:
     def _get_color(self, number: int) -> str:
         if number == 0:
             return "💚 GREEN"
-        elif number in self.config.RED_NUMBERS:
+        elif IS_RED[number]:
             return "❤️ RED"
         else:
             return "🖤 BLACK"
 
 # カイジ的借金プレイヤー（高感度版）
 class KaijiSensitivePlayer:
-    def __init__(self, name: str, personality: str, initial_debt: int = -500):
+    def __init__(self, name: str, personality: str, initial_debt: int = -500, color_idx: int = 0):
         self.name = name
         self.personality = personality
         self.initial_debt = initial_debt
         
-        # 高感度Log版SSDエンジン
-        params = create_kaiji_sensitive_params()
-        self.engine = SSDCoreEngine(params)
-        self.state = create_default_state(num_layers=4)
-        
         # カイジ的借金システム
+        # （SSDエンジンと状態は実験側で全員分をバッチとしてまとめて持つ）
         self.debt_system = KaijiDebtSystem()
         self.debt_value = self.debt_system.create_debt_value(initial_debt, personality)
         
@@ -196,20 +210,20 @@ class KaijiSensitivePlayer:
         self.leap_history = []
         self.leap_count = 0
         
-        # 初期記録
-        initial_energy = np.sum(self.state.E)
-        self.energy_history.append(initial_energy)
-        self.pressure_history.append(0.0)
-        self.leap_history.append(False)
+        # update_result() から record_step() へ渡す今ラウンドの結果
+        self._pending = None
         
-        self.color = self._get_color()
+        # 表示色は呼び出し側が指定（hash(name) はプロセスごとに変わるため使わない）
+        self.color = PLAYER_COLORS[color_idx % len(PLAYER_COLORS)]
         
         despair_msg = f"絶望レベル{self.debt_value.despair_level:.1f}"
         print(f"{self.color}💀 {name}({personality})が地獄に参加 - 借金: {abs(initial_debt)}コイン ({despair_msg}){Colors.RESET}")
     
-    def _get_color(self) -> str:
-        colors = [Colors.DARK_RED, Colors.GRAY, Colors.DARK_YELLOW]
-        return colors[hash(self.name) % len(colors)]
+    def start_history(self, E_row: np.ndarray):
+        """初期状態の記録（バッチ状態の自分の行を受け取る）"""
+        self.energy_history.append(np.sum(E_row))
+        self.pressure_history.append(0.0)
+        self.leap_history.append(False)
     
     def get_current_debt(self) -> int:
         return self.debt_value.current_debt
@@ -217,8 +231,13 @@ class KaijiSensitivePlayer:
     def can_continue(self) -> bool:
         return self.debt_value.current_debt > -2000
     
-    def make_bet(self) -> tuple:
-        """高感度版：より危険な賭けに傾向"""
+    def make_bet(self, type_draw: float, color_draw: float, number_draw: int) -> tuple:
+        """
+        高感度版：より危険な賭けに傾向
+        
+        type_draw, color_draw: 事前生成した [0, 1) の一様乱数（賭け種類・色の選択用）
+        number_draw: 事前生成した 1-36 の数字（数字賭け用）
+        """
         debt = self.get_current_debt()
         despair = self.debt_value.despair_level
         desperation = self.debt_value.desperation_multiplier
@@ -230,15 +249,15 @@ class KaijiSensitivePlayer:
         # 賭けタイプ決定（絶望が深いほど危険な賭け）
         if despair >= 8.0:
             bet_type = "number"
-            bet_value = random.randint(1, 36)
+            bet_value = int(number_draw)
             status = "💀⚡ Ultimate Despair"
             message = "💀 もうどうでもいい！全てを賭ける！"
         elif despair >= 5.0:
-            if random.random() < 0.3:
+            if type_draw < 0.3:
                 bet_type = "number"
                 bet_value = 7  # 悪魔の数字
             else:
-                bet_type = random.choice(["red", "black"])
+                bet_type = "red" if color_draw < 0.5 else "black"
                 bet_value = None
             status = "😱💔 Deep Despair"
             message = "😱 もう後がない...一発逆転を狙う"
@@ -249,7 +268,7 @@ class KaijiSensitivePlayer:
             status = "🌈✨ Miracle Recovery"
             message = "🌈 奇跡だ...慎重に行こう..."
         else:
-            bet_type = random.choice(["red", "black"])
+            bet_type = "red" if color_draw < 0.5 else "black"
             bet_value = None
             status = "😰💸 Desperation"
             message = "😰 なんとか巻き返したい..."
@@ -262,8 +281,13 @@ class KaijiSensitivePlayer:
         
         return bet_type, bet_value, bet_amount
     
-    def update_result(self, won: bool, payout: int, bet_amount: int):
-        """高感度版：より強い圧力をSSDエンジンに投入"""
+    def update_result(self, won: bool, payout: int, bet_amount: int, pressure_vector: np.ndarray):
+        """
+        高感度版：より強い圧力をSSDエンジンに投入
+        
+        借金状態を更新し、今ラウンドの圧力を pressure_vector（圧力行列の自分の行）に書き込む。
+        エンジン更新は実験側が全員分まとめて行い、その後 record_step() を呼ぶ。
+        """
         self.round_count += 1
         
         old_debt = self.get_current_debt()
@@ -276,47 +300,34 @@ class KaijiSensitivePlayer:
             self.total_losses += 1
             self.debt_value.experience_loss(bet_amount)
         
-        # より強いSSDエンジンへの圧力投入
-        pressure_vector = np.zeros(4)
+        # より強いSSDエンジンへの圧力投入（勝利時は希望的圧力、敗北時は絶望的圧力）
         despair_change = self.debt_value.despair_level - old_despair
+        pressure_norm = sensitive_pressure_vec(
+            pressure_vector, despair_change, self.debt_value.despair_level,
+            won, self.get_current_debt() >= 0
+        )
         
-        if won:
-            # 勝利時は希望的圧力（軽め）
-            pressure_vector[3] = 0.5
-            if self.get_current_debt() >= 0:
-                pressure_vector[3] = 2.0  # 完済時は大きな安堵
-        else:
-            # 敗北時は絶望的圧力（強化版）
-            base_pressure = abs(despair_change) * 2.0  # 2倍に強化
-            pressure_vector[0] = base_pressure * 1.5   # BASE層
-            pressure_vector[1] = base_pressure * 1.0   # CORE層
-            pressure_vector[2] = base_pressure * 0.8   # SOCIAL層
-            pressure_vector[3] = base_pressure * 0.3   # UPPER層
-            
-            # 極限絶望時は全層に追加圧力
-            if self.debt_value.despair_level >= 8.0:
-                pressure_vector += 1.5  # 追加圧力も強化
-            elif self.debt_value.despair_level >= 5.0:
-                pressure_vector += 1.0
+        self._pending = (won, payout, bet_amount, old_debt, old_despair, pressure_norm)
+    
+    def record_step(self, E_row: np.ndarray, leap_layer: int, t: float):
+        """
+        バッチ更新後の自分の行（E_row, 跳躍レイヤー）から履歴記録と結果表示を行う
         
-        # SSDエンジン更新
-        self.state = self.engine.step(self.state, pressure_vector, dt=1.0)
+        leap_layer: 跳躍したレイヤー（跳躍なしは -1）, t: 更新前の時刻
+        """
+        won, payout, bet_amount, old_debt, old_despair, pressure_norm = self._pending
         
         # LEAP検出（高感度）
-        leap_occurred = False
-        if hasattr(self.state, 'leap_history') and self.state.leap_history:
-            current_leap_count = len(self.state.leap_history)
-            if current_leap_count > len(self.leap_history):
-                leap_occurred = True
-                self.leap_count += 1
-                latest_leap = self.state.leap_history[-1]
-                leap_type = latest_leap[1].name if hasattr(latest_leap[1], 'name') else str(latest_leap[1])
-                print(f"  ⚡🔥🔥 {self.name}: 🌈LEAP発生🌈 {leap_type} (時刻: {latest_leap[0]:.2f}) ⚡🔥🔥")
+        leap_occurred = leap_layer >= 0
+        if leap_occurred:
+            self.leap_count += 1
+            leap_type = LEAP_TYPE_BY_LAYER[leap_layer].name
+            print(f"  ⚡🔥🔥 {self.name}: 🌈LEAP発生🌈 {leap_type} (時刻: {t:.2f}) ⚡🔥🔥")
         
         # 履歴記録
-        current_energy = np.sum(self.state.E)
+        current_energy = np.sum(E_row)
         self.energy_history.append(current_energy)
-        self.pressure_history.append(np.linalg.norm(pressure_vector))
+        self.pressure_history.append(pressure_norm)
         self.leap_history.append(leap_occurred)
         
         new_debt = self.get_current_debt()
@@ -357,6 +368,11 @@ class KaijiSensitivePlayer:
             print(f"  {streak_msg}")
 
 
+# 見出し用の装飾（毎ラウンド作り直さないよう一度だけ生成）
+SKULL20 = "💀" * 20
+SKULL80 = "💀" * 80
+
+
 def run_kaiji_sensitive_experiment():
     """高感度カイジ実験メイン"""
     print("="*80)
@@ -372,22 +388,42 @@ def run_kaiji_sensitive_experiment():
     
     # 高感度プレイヤー生成
     players = [
-        KaijiSensitivePlayer("カイジ", "balanced", -500),
-        KaijiSensitivePlayer("遠藤", "cautious", -500), 
-        KaijiSensitivePlayer("佐原", "aggressive", -500)
+        KaijiSensitivePlayer("カイジ", "balanced", -500, color_idx=0),
+        KaijiSensitivePlayer("遠藤", "cautious", -500, color_idx=1),
+        KaijiSensitivePlayer("佐原", "aggressive", -500, color_idx=2)
     ]
     
     roulette = HellRoulette()
     
+    # 高感度SSDエンジンは全員で1つを共有し、状態は (プレイヤー, レイヤー) のバッチで持つ
+    n_players = len(players)
+    engine = SSDCoreEngine(create_kaiji_sensitive_params())
+    batch_state = create_batched_state(n_players, num_layers=4)
+    P = np.zeros((n_players, 4))  # ラウンドごとの圧力行列
+    for i, player in enumerate(players):
+        player.start_history(batch_state.E[i])
+    
     # 地獄の25ラウンド
-    for round_num in range(1, 26):
-        print(f"\n{'💀'*20} 地獄Round {round_num} {'💀'*20}")
+    n_rounds = 25
+    
+    # 乱数は実験全体の分を先に生成しておき、ラウンド・プレイヤーで引く
+    rng = np.random.default_rng(42)
+    type_draws = rng.random((n_rounds, n_players))
+    color_draws = rng.random((n_rounds, n_players))
+    number_draws = rng.integers(1, 37, (n_rounds, n_players))
+    spins = rng.integers(0, 37, n_rounds)
+    
+    for round_num in range(1, n_rounds + 1):
+        print(f"\n{SKULL20} 地獄Round {round_num} {SKULL20}")
         
         bets = []
-        for player in players:
+        for i, player in enumerate(players):
             if player.can_continue():
-                bet_type, bet_value, bet_amount = player.make_bet()
-                bets.append((player, bet_type, bet_value, bet_amount))
+                r = round_num - 1
+                bet_type, bet_value, bet_amount = player.make_bet(
+                    type_draws[r, i], color_draws[r, i], number_draws[r, i]
+                )
+                bets.append((i, player, bet_type, bet_value, bet_amount))
             else:
                 print(f"{player.color}{player.name}: 💀 借金限度額到達...もう終わりだ...{Colors.RESET}")
         
@@ -395,9 +431,11 @@ def run_kaiji_sensitive_experiment():
             print("💀 全員が借金限度額に到達...地獄の終わり...")
             break
         
-        result = roulette.spin()
+        result = roulette.spin(spins[round_num - 1])
         
-        for player, bet_type, bet_value, bet_amount in bets:
+        P.fill(0.0)
+        active = np.zeros(n_players, dtype=bool)
+        for i, player, bet_type, bet_value, bet_amount in bets:
             won = False
             payout = 0
             
@@ -409,14 +447,30 @@ def run_kaiji_sensitive_experiment():
                 won = True
                 payout = bet_amount * (RouletteConfig.PAYOUT_NUMBER - 1)
                 print(f"🎰 {player.name} - 数字的中！一発逆転！")
-            elif bet_type == "red" and result in RouletteConfig.RED_NUMBERS:
+            elif bet_type == "red" and IS_RED[result]:
                 won = True
                 payout = bet_amount * (RouletteConfig.PAYOUT_RED - 1)
-            elif bet_type == "black" and result in RouletteConfig.BLACK_NUMBERS:
+            elif bet_type == "black" and IS_BLACK[result]:
                 won = True
                 payout = bet_amount * (RouletteConfig.PAYOUT_BLACK - 1)
             
-            player.update_result(won, payout, bet_amount)
+            active[i] = True
+            player.update_result(won, payout, bet_amount, P[i])
+        
+        # SSDエンジン更新（全員分を一括）
+        # 借金限度で脱落したプレイヤーの行は更新前の状態に戻し、これまで通り凍結する
+        t_before = batch_state.t
+        prev_state = batch_state
+        batch_state = engine.step_batched(batch_state, P, dt=1.0)
+        if not active.all():
+            batch_state.E[~active] = prev_state.E[~active]
+            batch_state.kappa[~active] = prev_state.kappa[~active]
+            for key in ('m', 'alpha_t', 'zeta'):
+                batch_state.logalign_state[key][~active] = prev_state.logalign_state[key][~active]
+        leap_layer = batch_state.diagnostics['leap_layer']
+        
+        for i, player, *_ in bets:
+            player.record_step(batch_state.E[i], int(leap_layer[i]), t_before)
         
         # 中間報告
         if round_num % 10 == 0:
@@ -427,9 +481,9 @@ def run_kaiji_sensitive_experiment():
                       f"(絶望: {player.debt_value.despair_level:.1f}, LEAP: {player.leap_count}回)")
     
     # 最終結果
-    print(f"\n{'💀'*80}")
+    print(f"\n{SKULL80}")
     print("⚰️  高感度実験 - 最終審判")
-    print(f"{'💀'*80}")
+    print(SKULL80)
     
     for player in players:
         debt = player.get_current_debt()
@@ -440,5 +494,4 @@ def run_kaiji_sensitive_experiment():
         print(f"  🎯 勝率: {player.total_wins}/{player.round_count}ラウンド ({player.total_wins/player.round_count:.1%})")
 
 if __name__ == "__main__":
-    random.seed(42)
     run_kaiji_sensitive_experiment()
\ No newline at end of file
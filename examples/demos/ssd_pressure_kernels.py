@@ -0,0 +1,69 @@
+"""
+カイジ的借金地獄ルーレット用 圧力計算カーネル
+===========================================
+
+Raw版・高感度版デモの毎ラウンド×全プレイヤーで呼ばれる圧力計算を、
+スカラー演算だけの関数としてまとめたもの。
+numba があれば JIT コンパイル（cache=True で初回以降はコンパイル不要）、
+なければ通常のPython関数として動作する。
+"""
+
+import math
+import os
+import sys
+
+# 共通の numba フォールバック（core/ssd_jit.py）を使う
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "core"))
+
+from ssd_jit import njit
+
+
+@njit(cache=True, fastmath=True)
+def raw_pressure(despair, losses, debt):
+    """
+    絶望に基づく心理圧力（Raw版：Log-Alignment無効なので直接的）
+    
+    Args:
+        despair: 絶望レベル (0-10)
+        losses: 連敗数
+        debt: 借金額（正の値）
+    """
+    base_pressure = despair * 20.0  # 絶望1レベルあたり20の圧力
+    loss_pressure = losses * 15.0  # 連敗による圧力増加
+    debt_pressure = min(debt / 10.0, 100.0)  # 借金による圧力
+    return base_pressure + loss_pressure + debt_pressure
+
+
+@njit(cache=True, fastmath=True)
+def sensitive_pressure_vec(out, despair_change, despair_level, won, debt_nonneg):
+    """
+    高感度版の4層圧力ベクトルを out に書き込み、そのノルムを返す
+    
+    Args:
+        out: 書き込み先 (4,)（圧力行列の1行など）
+        despair_change: 今ラウンドの絶望レベル変化
+        despair_level: 更新後の絶望レベル
+        won: 勝利したか
+        debt_nonneg: 借金を完済しているか
+    """
+    out[:] = 0.0
+    if won:
+        # 勝利時は希望的圧力（軽め）、完済時は大きな安堵
+        out[3] = 2.0 if debt_nonneg else 0.5
+    else:
+        # 敗北時は絶望的圧力（強化版）
+        base_pressure = abs(despair_change) * 2.0  # 2倍に強化
+        out[0] = base_pressure * 1.5   # BASE層
+        out[1] = base_pressure * 1.0   # CORE層
+        out[2] = base_pressure * 0.8   # SOCIAL層
+        out[3] = base_pressure * 0.3   # UPPER層
+        
+        # 極限絶望時は全層に追加圧力
+        if despair_level >= 8.0:
+            out += 1.5  # 追加圧力も強化
+        elif despair_level >= 5.0:
+            out += 1.0
+    
+    # 長さ4固定なので np.linalg.norm を介さずスカラー演算で求める
+    return math.sqrt(out[0] * out[0] + out[1] * out[1] + out[2] * out[2] + out[3] * out[3])
+
@@ -55,9 +55,9 @@ def test_leap_force():
     print(f"📊 強制LEAP用パラメータ:")
     print(f"   R値（大幅増加）: {params.R_values}")
     print(f"   G0={params.G0}, g={params.g} （導電率低減）")
-    print(f"   Gamma（大幅増加）: {params.gamma_values}")
-    print(f"   Beta（最小化）: {params.beta_values}")
-    print(f"   Theta（現実的）: {params.Theta_values}")
+    print(f"   Gamma（大幅増加）: {np.asarray(params.gamma_values).tolist()}")
+    print(f"   Beta（最小化）: {np.asarray(params.beta_values).tolist()}")
+    print(f"   Theta（現実的）: {np.asarray(params.Theta_values).tolist()}")
     print()
     
     # 段階的実験
@@ -90,9 +90,9 @@ def test_physical_correction():
     
     print(f"📊 テストパラメータ:")
     print(f"   R値: {params.R_values}")
-    print(f"   Gamma: {params.gamma_values}")
-    print(f"   Beta: {params.beta_values}")
-    print(f"   Theta: {params.Theta_values}")
+    print(f"   Gamma: {np.asarray(params.gamma_values).tolist()}")
+    print(f"   Beta: {np.asarray(params.beta_values).tolist()}")
+    print(f"   Theta: {np.asarray(params.Theta_values).tolist()}")
     print()
     
     # 元の「超電導」エンジンと修正版を比較
@@ -155,7 +155,7 @@ def run_thermal_kaiji_experiment():
     engine = ThermalSSDEngine(params)
     
     print(f"🌡️  心理温度: T = {params.temperature_T} (高興奮状態)")
-    print(f"📊 LEAP閾値: {params.Theta_values}")
+    print(f"📊 LEAP閾値: {np.asarray(params.Theta_values).tolist()}")
     print()
     
     # カイジの極限心理状態シミュレーション
@@ -7,6 +7,7 @@ Neuromodulator layer for SSD Core Engine
 """
 
 from dataclasses import dataclass, replace
+from functools import lru_cache
 from typing import Optional, Dict
 import numpy as np
 
@@ -20,7 +21,7 @@ def s_curve(x, k=1.0):
     return x**(1/(1e-6 + k)) / (x**(1/(1e-6 + k)) + (1-x)**(1/(1e-6 + k)) + 1e-9)
 
 # -------- Neuro state (normalized 0..1) --------
-@dataclass
+@dataclass(slots=True)
 class NeuroState:
     D1: float = 0.3   # Dopamine D1-like (促進)
     D2: float = 0.3   # Dopamine D2-like (抑制)
@@ -74,6 +75,7 @@ class NeuroConfig:
 def modulate_params(core_params, neuro: NeuroState, cfg: Optional[NeuroConfig] = None):
     """
     Returns a COPY of core_params with neuromodulator-aware tweaks.
+    Per-layer arrays are scaled as whole ndarrays (no per-layer Python loop).
     core_params: SSDCoreParams (from ssd_core_engine_log.py)
     neuro: NeuroState (0..1 normalized levels)
     """
@@ -83,55 +85,65 @@ def modulate_params(core_params, neuro: NeuroState, cfg: Optional[NeuroConfig] =
     p = core_params  # shorthand
     q = replace(p)   # copy (dataclass replace)
 
+    # 受容体ごとの飽和応答（各1回だけ評価して使い回す）
+    # ※ 既定の NeuroState()（全0.3）でも s_curve は非ゼロのため、変調は恒等にならない
+    s_D1 = s_curve(neuro.D1)
+    s_D2 = s_curve(neuro.D2)
+    s_NE = s_curve(neuro.NE)
+    s_5HT = s_curve(neuro._5HT)
+    s_ACh = s_curve(neuro.ACh)
+
     # --- 1) 感覚ゲイン（Log-Alignment alpha0 の感じやすさ） ---
-    sense_gain = 1.0 + cfg.k_sense_D1 * s_curve(neuro.D1) \
-                     + cfg.k_sense_NE  * s_curve(neuro.NE) \
-                     + cfg.k_sense_5HT * s_curve(neuro._5HT)
+    sense_gain = 1.0 + cfg.k_sense_D1 * s_D1 \
+                     + cfg.k_sense_NE  * s_NE \
+                     + cfg.k_sense_5HT * s_5HT
     q.alpha0 = max(1e-3, p.alpha0 * sense_gain)
 
     # --- 2) LEAP閾値調整（Theta_values を神経変調） ---
-    theta_mult = 1.0 + cfg.k_theta_D1 * s_curve(neuro.D1) \
-                     + cfg.k_theta_D2 * s_curve(neuro.D2)
+    theta_mult = 1.0 + cfg.k_theta_D1 * s_D1 \
+                     + cfg.k_theta_D2 * s_D2
     theta_mult = sat(theta_mult, cfg.min_theta_mult, cfg.max_theta_mult)
-    q.Theta_values = [theta * theta_mult for theta in p.Theta_values]
+    q.Theta_values = np.asarray(p.Theta_values, dtype=np.float64) * theta_mult
 
     # --- 3) エネルギー生成（gamma_values 活動性調整） ---
-    gamma_mult = 1.0 + cfg.k_gamma_D1 * s_curve(neuro.D1) \
-                     + cfg.k_gamma_NE * s_curve(neuro.NE)
+    gamma_mult = 1.0 + cfg.k_gamma_D1 * s_D1 \
+                     + cfg.k_gamma_NE * s_NE
     gamma_mult = sat(gamma_mult, cfg.min_gamma_mult, cfg.max_gamma_mult)
-    q.gamma_values = [gamma * gamma_mult for gamma in p.gamma_values]
+    q.gamma_values = np.asarray(p.gamma_values, dtype=np.float64) * gamma_mult
 
     # --- 4) エネルギー減衰（beta_values 安定化調整） ---
-    beta_mult = 1.0 + cfg.k_beta_5HT * s_curve(neuro._5HT) \
-                    + cfg.k_beta_D2 * s_curve(neuro.D2)
+    beta_mult = 1.0 + cfg.k_beta_5HT * s_5HT \
+                    + cfg.k_beta_D2 * s_D2
     beta_mult = sat(beta_mult, cfg.min_beta_mult, cfg.max_beta_mult)
-    q.beta_values = [beta * beta_mult for beta in p.beta_values]
+    q.beta_values = np.asarray(p.beta_values, dtype=np.float64) * beta_mult
 
     # --- 5) 学習可塑性（eta_values 注意・学習） ---
-    eta_mult = 1.0 + cfg.k_eta_ACh * s_curve(neuro.ACh) \
-                   + cfg.k_eta_D1 * s_curve(neuro.D1)
+    eta_mult = 1.0 + cfg.k_eta_ACh * s_ACh \
+                   + cfg.k_eta_D1 * s_D1
     eta_mult = max(0.1, eta_mult)
-    q.eta_values = [eta * eta_mult for eta in p.eta_values]
+    q.eta_values = np.asarray(p.eta_values, dtype=np.float64) * eta_mult
 
     # --- 6) 導電性（G0, g オーム則パラメータ） ---
-    conductance_mult = 1.0 + cfg.k_conductance_NE * s_curve(neuro.NE) \
-                           + cfg.k_conductance_5HT * s_curve(neuro._5HT)
+    conductance_mult = 1.0 + cfg.k_conductance_NE * s_NE \
+                           + cfg.k_conductance_5HT * s_5HT
     conductance_mult = max(0.1, conductance_mult)
     q.G0 = max(1e-6, p.G0 * conductance_mult)
     q.g = max(1e-6, p.g * conductance_mult)
 
     # --- 7) 探索温度/ノイズ ---
-    q.temperature_T = max(0.0, p.temperature_T * (1.0 + cfg.k_temp_NE * s_curve(neuro.NE)))
+    q.temperature_T = max(0.0, p.temperature_T * (1.0 + cfg.k_temp_NE * s_NE))
     
     # ノイズレベル調整
-    noise_mult = 1.0 + cfg.k_noise_5HT * s_curve(neuro._5HT) + cfg.k_noise_D1 * s_curve(neuro.D1)
+    noise_mult = 1.0 + cfg.k_noise_5HT * s_5HT + cfg.k_noise_D1 * s_D1
     noise_mult = max(0.1, noise_mult)
     q.epsilon_noise = max(1e-6, p.epsilon_noise * noise_mult)
 
     return q
 
 # Optional: simple policy helper
-def neuro_preset(name: str) -> NeuroState:
+# プリセットは固定なので名前ごとにキャッシュ（共有インスタンスは外に出さない）
+@lru_cache(maxsize=8)
+def _cached_preset(name: str) -> NeuroState:
     name = name.lower()
     if name in ("focus", "集中"):
         return NeuroState(D1=0.4, D2=0.3, NE=0.5, _5HT=0.5, ACh=0.6)
@@ -139,4 +151,8 @@ def neuro_preset(name: str) -> NeuroState:
         return NeuroState(D1=0.7, D2=0.2, NE=0.7, _5HT=0.2, ACh=0.4)
     if name in ("calm", "鎮静"):
         return NeuroState(D1=0.2, D2=0.5, NE=0.2, _5HT=0.7, ACh=0.5)
-    return NeuroState()
\ No newline at end of file
+    return NeuroState()
+
+def neuro_preset(name: str) -> NeuroState:
+    # 呼び出し側が書き換えてもキャッシュ済みプリセットが壊れないようコピーを返す
+    return replace(_cached_preset(name))
\ No newline at end of file
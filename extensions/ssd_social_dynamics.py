@@ -134,6 +134,43 @@ if core_path not in sys.path:
 
 from ssd_human_module import HumanAgent, HumanParams, HumanPressure, HumanLayer
 
+try:
+    import numba
+    from numba import njit, prange
+except ImportError:
+    numba = None
+
+try:
+    import scipy.sparse as scipy_sparse
+except ImportError:
+    scipy_sparse = None
+
+
+if numba is not None:
+    @njit(parallel=True, cache=True, boundscheck=False)
+    def _social_coupling_kernel(E, kappa, R, coop_threshold, comp_threshold, zeta, xi, omega):
+        """社会的カップリングの一括計算（エージェント i ごとに独立なので prange で並列化）"""
+        N, L = E.shape
+        energy = np.zeros((N, L))
+        kappa_c = np.zeros((N, L))
+        for i in prange(N):
+            for j in range(N):
+                if j == i:
+                    continue
+                r = R[i, j]
+                if r > coop_threshold:
+                    for l in range(L):
+                        energy[i, l] += (E[j, l] - E[i, l]) * zeta[l] * r
+                        d = kappa[j, l] - kappa[i, l]
+                        if d > 0.0:
+                            kappa_c[i, l] += d * xi[l] * r
+                elif r < comp_threshold:
+                    for l in range(L):
+                        energy[i, l] += omega[l] * E[j, l] * (-r)
+        return energy, kappa_c
+else:
+    _social_coupling_kernel = None
+
 
 class RelationType(Enum):
     """関係性タイプ"""
@@ -254,6 +291,8 @@ class RelationshipMatrix:
     - 混合ネットワーク → 派閥の形成、社会の階層化
     """
     matrix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0)))
+    # 変更カウンタ（疎行列キャッシュの無効化判定に使う）
+    version: int = field(default=0, init=False, repr=False)
     
     def __post_init__(self):
         """対角成分を0にする（自己との関係は無し）"""
@@ -295,6 +334,11 @@ class RelationshipMatrix:
     def set_relation(self, i: int, j: int, value: float):
         """i→jの関係性を設定"""
         self.matrix[i, j] = np.clip(value, -1.0, 1.0)
+        self.version += 1
+    
+    def mark_dirty(self):
+        """matrix を直接書き換えた後に呼ぶ（派生キャッシュを作り直させる）"""
+        self.version += 1
 
 
 class Society:
@@ -376,13 +420,28 @@ class Society:
     平時は統計的安定、臨界時は個の揺らぎが歴史を動かす。
     """
     
+    # SoA状態行列の精度（表示は小数1〜3桁なので単精度で十分）
+    STATE_DTYPE = np.float32
+    
     def __init__(
         self,
         num_agents: int = 10,
         human_params: Optional[HumanParams] = None,
         social_params: Optional[SocialCouplingParams] = None,
-        relationships: Optional[RelationshipMatrix] = None
+        relationships: Optional[RelationshipMatrix] = None,
+        sparse: bool = False
     ):
+        """
+        Args:
+            sparse: Trueなら関係性をCSR疎行列として扱い、カップリングを非ゼロ要素のみで計算
+                    （大規模・疎な関係ネットワーク向け。scipyが必要）
+                    CSR構造は関係性が変わったときだけ作り直すので、matrix を直接
+                    書き換えた場合は relationships.mark_dirty() を呼ぶこと
+        """
+        if sparse and scipy_sparse is None:
+            raise ImportError("sparse=True には scipy が必要です")
+        self.sparse = sparse
+        self._sparse_cache = None  # 疎行列版カップリング用の構造キャッシュ
         self.num_agents = num_agents
         self.social_params = social_params or SocialCouplingParams()
         
@@ -401,9 +460,90 @@ class Society:
         else:
             self.relationships = relationships
         
+        # 状態はSoA（E, κ を (num_agents, 4) 行列で一括保持）
+        # agent.state.E / agent.state.kappa はこの行列の行ビューとして共有する
+        self.E = np.zeros((num_agents, 4), dtype=self.STATE_DTYPE, order='C')
+        self.kappa = np.ones((num_agents, 4), dtype=self.STATE_DTYPE, order='C')
+        self.kappa_min = np.array([
+            [a.params.kappa_min_physical, a.params.kappa_min_base,
+             a.params.kappa_min_core, a.params.kappa_min_upper]
+            for a in self.agents
+        ], dtype=self.STATE_DTYPE).reshape(num_agents, 4)
+        # 支配層判定用の層別抵抗 R (num_agents, 4)
+        self.R = np.array(
+            [a.engine.params.R_values for a in self.agents], dtype=self.STATE_DTYPE
+        ).reshape(num_agents, 4)
+        for i, agent in enumerate(self.agents):
+            self.E[i] = agent.state.E
+            self.kappa[i] = agent.state.kappa
+        self._bind_agent_views()
+        
+        # カップリングカーネルのスレッド数（エージェント数を超えても意味がない）
+        # プロセス全体の設定は変えず、カーネル呼び出しの間だけ適用する
+        self._kernel_threads = (
+            max(1, min(num_agents, numba.config.NUMBA_NUM_THREADS)) if numba is not None else 0
+        )
+        
         # 時間
         self.t = 0.0
     
+    def _bind_agent_views(self):
+        """各エージェントの state.E / state.kappa を SoA 行列の行ビューに差し替える"""
+        for i, agent in enumerate(self.agents):
+            agent.state.E = self.E[i]
+            agent.state.kappa = self.kappa[i]
+    
+    def _layer_coefficients(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """層別の (ζ, ξ, ω) を長さ4の配列で返す"""
+        sp = self.social_params
+        zeta = np.array([sp.zeta_physical, sp.zeta_base, sp.zeta_core, sp.zeta_upper])
+        xi = np.array([sp.xi_physical, sp.xi_base, sp.xi_core, sp.xi_upper])
+        omega = np.array([sp.omega_physical, sp.omega_base, sp.omega_core, sp.omega_upper])
+        return zeta, xi, omega
+    
+    def _compute_social_couplings(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        全エージェントへの社会的カップリングを行列演算で一括計算
+        
+        _compute_social_coupling_for_agent を全 i について並べたものと同じ結果:
+            協力: ΔE_i = ζ Σⱼ r_ij (E_j - E_i),  Δκ_i = ξ Σⱼ r_ij max(κ_j - κ_i, 0)
+            競争: ΔE_i = ω Σⱼ |r_ij| E_j
+        
+        Returns:
+            (energy_coupling, kappa_coupling) いずれも (num_agents, 4)
+        """
+        R = self.relationships.matrix
+        sp = self.social_params
+        zeta, xi, omega = self._layer_coefficients()
+        
+        if self.sparse:
+            return self._compute_social_couplings_sparse(zeta, xi, omega)
+        
+        if _social_coupling_kernel is not None:
+            prev_threads = numba.get_num_threads()
+            numba.set_num_threads(min(self._kernel_threads, prev_threads))
+            try:
+                return _social_coupling_kernel(
+                    self.E, self.kappa, np.ascontiguousarray(R, dtype=np.float64),
+                    sp.cooperation_threshold, sp.competition_threshold, zeta, xi, omega
+                )
+            finally:
+                numba.set_num_threads(prev_threads)
+        
+        # 関係性タイプ別の重み（中立は0、対角は RelationshipMatrix が0に保つ）
+        W_coop = np.where(R > sp.cooperation_threshold, R, 0.0)
+        W_comp = np.where(R < sp.competition_threshold, -R, 0.0)
+        
+        E = self.E
+        energy = zeta * (W_coop @ E - W_coop.sum(axis=1)[:, None] * E)
+        energy += omega * (W_comp @ E)
+        
+        # κ伝播（高い方が低い方を引き上げる）
+        dkappa = np.maximum(self.kappa[None, :, :] - self.kappa[:, None, :], 0.0)
+        kappa = xi * np.einsum('ij,ijl->il', W_coop, dkappa)
+        
+        return energy, kappa
+    
     def _compute_social_coupling_for_agent(
         self,
         agent_idx: int
@@ -504,43 +644,92 @@ class Society:
             'kappa_coupling': kappa_coupling
         }
     
-    def step(self, pressures: Optional[List[HumanPressure]] = None, dt: float = 0.1):
+    def _sparse_structure(self):
+        """
+        疎行列版カップリングの構造（協力・競争のCSR重みと協力辺リスト）を返す
+        
+        関係性行列・その変更カウンタ・閾値が前回と同じならキャッシュを再利用し、
+        密行列の走査とCSR変換は関係性が変わったときだけ行う。
+        """
+        rel = self.relationships
+        sp = self.social_params
+        key = (rel.matrix, rel.version, sp.cooperation_threshold, sp.competition_threshold)
+        cache = self._sparse_cache
+        if cache is not None and cache[0][0] is key[0] and cache[0][1:] == key[1:]:
+            return cache[1]
+        
+        R = rel.matrix
+        W_coop = scipy_sparse.csr_matrix(np.where(R > sp.cooperation_threshold, R, 0.0))
+        W_comp = scipy_sparse.csr_matrix(np.where(R < sp.competition_threshold, -R, 0.0))
+        coop_sum = np.asarray(W_coop.sum(axis=1))
+        
+        # 協力辺 (i, j) と、辺ごとの値を行 i へ集計する (num_agents, 辺数) の疎行列
+        edges = W_coop.tocoo()
+        n_edges = edges.nnz
+        edge_to_row = scipy_sparse.csr_matrix(
+            (edges.data, (edges.row, np.arange(n_edges))),
+            shape=(self.num_agents, n_edges)
+        )
+        
+        structure = (W_coop, W_comp, coop_sum, edges.row, edges.col, edge_to_row)
+        self._sparse_cache = (key, structure)
+        return structure
+    
+    def _compute_social_couplings_sparse(
+        self,
+        zeta: np.ndarray,
+        xi: np.ndarray,
+        omega: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """_compute_social_couplings の疎行列版（協力・競争の非ゼロ辺のみを走査）"""
+        W_coop, W_comp, coop_sum, rows, cols, edge_to_row = self._sparse_structure()
+        
+        E = self.E
+        energy = zeta * (W_coop @ E - coop_sum * E)
+        energy += omega * (W_comp @ E)
+        
+        # κ伝播: 協力辺 (i, j) ごとに max(κ_j - κ_i, 0)·r_ij を i へ集計
+        dkappa = np.maximum(self.kappa[cols] - self.kappa[rows], 0.0)
+        kappa = xi * (edge_to_row @ dkappa)
+        
+        return energy, kappa
+    
+    def step(self, pressures: Optional[List[HumanPressure]] = None, dt: float = 0.1,
+             return_state: bool = False) -> Optional[Tuple[np.ndarray, np.ndarray]]:
         """
         社会全体の1ステップ更新
         
         Args:
             pressures: 各エージェントへの外部圧力（Noneの場合はゼロ圧力）
             dt: 時間刻み
+            return_state: Trueなら更新後の (E, κ) 行列を返す（次の step でその場更新されるビュー）
+        
+        Returns:
+            return_state=True の時 (E, κ) いずれも (num_agents, 4)、それ以外は None
         """
         if pressures is None:
             pressures = [HumanPressure() for _ in range(self.num_agents)]
         
-        # 各エージェントの社会的カップリングを計算
-        social_couplings = []
-        for i in range(self.num_agents):
-            coupling = self._compute_social_coupling_for_agent(i)
-            social_couplings.append(coupling)
+        # 全エージェントの社会的カップリングを更新前の状態から一括計算
+        energy_coupling, kappa_coupling = self._compute_social_couplings()
         
-        # 各エージェントを更新（社会的カップリングを反映）
+        # 各エージェントの基本ステップ（engine.step は新しい配列を返すので行列へ書き戻す）
         for i, agent in enumerate(self.agents):
-            # 基本ステップ
             agent.step(pressures[i], dt=dt)
-            
-            # 社会的カップリングを状態に加算
-            coupling = social_couplings[i]
-            agent.state.E += coupling['energy_coupling'] * dt
-            agent.state.kappa += coupling['kappa_coupling'] * dt
-            
-            # κの範囲制約
-            kappa_min = np.array([
-                agent.params.kappa_min_physical,
-                agent.params.kappa_min_base,
-                agent.params.kappa_min_core,
-                agent.params.kappa_min_upper
-            ])
-            agent.state.kappa = np.maximum(kappa_min, agent.state.kappa)
+            self.E[i] = agent.state.E
+            self.kappa[i] = agent.state.kappa
+        
+        # 社会的カップリングを状態に加算し、κの範囲制約を適用
+        self.E += energy_coupling * dt
+        self.kappa += kappa_coupling * dt
+        np.maximum(self.kappa, self.kappa_min, out=self.kappa)
+        self._bind_agent_views()
         
         self.t += dt
+        
+        if return_state:
+            return self.E, self.kappa
+        return None
     
     def get_social_network_state(self) -> Dict:
         """
@@ -567,18 +756,12 @@ class Society:
         Returns:
             各層が支配的なエージェントの数
         """
-        distribution = {
-            "PHYSICAL": 0,
-            "BASE": 0,
-            "CORE": 0,
-            "UPPER": 0
-        }
+        # HumanAgent.get_dominant_layer と同じ判定: 均一圧力下の構造的影響力 E·κ·R の最大層
+        # （均一圧力の p̂ は全層で同じ正の値なので argmax に影響しない）
+        dominant = np.argmax(self.E * self.kappa * self.R, axis=1)
+        counts = np.bincount(dominant, minlength=4)
         
-        for agent in self.agents:
-            dominant = agent.get_dominant_layer()
-            distribution[dominant.name] += 1
-        
-        return distribution
+        return {layer.name: int(counts[layer.value]) for layer in HumanLayer}
     
     def is_critical_state(self, threshold_ratio: float = 0.8) -> Dict[str, bool]:
         """
@@ -624,10 +807,7 @@ class Society:
         Returns:
             平均E [4] (PHYSICAL, BASE, CORE, UPPER)
         """
-        total_E = np.zeros(4)
-        for agent in self.agents:
-            total_E += agent.state.E
-        return total_E / self.num_agents
+        return self.E.mean(axis=0)
     
     def get_E_variance(self) -> np.ndarray:
         """
@@ -640,13 +820,7 @@ class Society:
         Returns:
             分散 [4]
         """
-        avg_E = self.get_average_E()
-        variance = np.zeros(4)
-        
-        for agent in self.agents:
-            variance += (agent.state.E - avg_E) ** 2
-        
-        return variance / self.num_agents
+        return self.E.var(axis=0)
     
     def visualize_network(self):
         """
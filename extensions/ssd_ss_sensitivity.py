@@ -73,7 +73,8 @@ class SocialLanguageKPI:
 # -------- SS変調関数 --------
 def modulate_ss_params(core_params, ss_profile: SSProfile, 
                       current_stress: float = 0.0,
-                      cfg: Optional[SSNeuroConfig] = None):
+                      cfg: Optional[SSNeuroConfig] = None,
+                      out=None):
     """
     SS型プロファイルによるパラメータ変調
     
@@ -82,11 +83,17 @@ def modulate_ss_params(core_params, ss_profile: SSProfile,
         ss_profile: SS型プロファイル
         current_stress: 現在ストレス水準 (0..1)
         cfg: SS変調設定
+        out: 書き込み先の作業用SSDCoreParams（指定時は新規インスタンスを作らず上書きして返す）
     """
     if cfg is None:
         cfg = SSNeuroConfig()
     
-    q = replace(core_params)
+    # 配列は q 側の独立したバッファへ書き込む（core の SSDCoreParams は代入時に配列をコピー済み）
+    q = replace(core_params) if out is None else core_params.copy_into(out)
+    # 配列化しないパラメータ型（ログエンジン版など）でも out= で書き込めるよう自前の配列にそろえる
+    for name in ('Theta_values', 'gamma_values', 'beta_values'):
+        if not isinstance(getattr(q, name), np.ndarray):
+            setattr(q, name, np.array(getattr(q, name), dtype=np.float64))
     ss = ss_profile.ss_level
     
     # ストレス転換: A→B遷移判定
@@ -106,13 +113,13 @@ def modulate_ss_params(core_params, ss_profile: SSProfile,
         
         # 3) 安定化指向↑ (放熱強化・跳躍抑制)
         stabilize_factor = 1.0 + cfg.k_ss_stabilize * ss * pathway_weight_A
-        q.beta_values = [beta * stabilize_factor for beta in core_params.beta_values]
+        np.multiply(core_params.beta_values, stabilize_factor, out=q.beta_values)
     
     # 経路B: 脅威感受性優位
     if pathway_weight_B > 0.1:
         # 4) 発火障壁鋭化 (LEAPしやすさ↑)
         barrier_sharp = 1.0 + cfg.k_ss_barrier_sharp * ss * pathway_weight_B
-        q.Theta_values = [theta / barrier_sharp for theta in core_params.Theta_values]
+        np.divide(core_params.Theta_values, barrier_sharp, out=q.Theta_values)
         
         # 5) 熱ノイズ増幅 (感情的揺らぎ↑)
         noise_amp = 1.0 + cfg.k_ss_noise_amp * ss * pathway_weight_B
@@ -120,7 +127,7 @@ def modulate_ss_params(core_params, ss_profile: SSProfile,
         
         # 6) LEAP促進 (跳躍活動性↑)
         leap_factor = 1.0 + cfg.k_ss_leap_prone * ss * pathway_weight_B
-        q.gamma_values = [gamma * leap_factor for gamma in core_params.gamma_values]
+        np.multiply(core_params.gamma_values, leap_factor, out=q.gamma_values)
     
     return q
 
@@ -244,16 +251,19 @@ def ss_preset(profile_name: str) -> SSProfile:
 def modulate_with_ss(core_params, ss_profile: SSProfile, 
                     current_stress: float = 0.0,
                     neuro_config: Optional[NeuroConfig] = None,
-                    ss_config: Optional[SSNeuroConfig] = None):
+                    ss_config: Optional[SSNeuroConfig] = None,
+                    out=None):
     """
     SS型 + 通常神経変調の統合適用
     
+    out を指定するとSS変調は out へ上書きされる（neuro_config 指定時の神経変調は別インスタンスを返す）
+    
     Returns:
         Tuple[modulated_params, neuro_state, ss_kpi_placeholder]
     """
     
     # 1) SS型による基本変調
-    ss_modulated = modulate_ss_params(core_params, ss_profile, current_stress, ss_config)
+    ss_modulated = modulate_ss_params(core_params, ss_profile, current_stress, ss_config, out=out)
     
     # 2) SS型から神経状態生成
     neuro_state = ss_to_neuro_state(ss_profile, current_stress)
@@ -33,6 +33,12 @@ class ObservableSignal(Enum):
     NORM_ADHERENCE = "norm_adherence"        # 規範遵守
 
 
+# バッチ計算でのシグナル列の並び（signals[:, k] が SIGNAL_ORDER[k] の強度）
+SIGNAL_ORDER = tuple(ObservableSignal)
+NUM_SIGNALS = len(SIGNAL_ORDER)
+SIGNAL_INDEX = {sig: k for k, sig in enumerate(SIGNAL_ORDER)}
+
+
 @dataclass
 class ObservationContext:
     """観測コンテキスト
@@ -99,6 +105,73 @@ class SubjectiveSocialPressureCalculator:
             for layer, pressure in layer_pressures.items()
         }
     
+    def calculate_pressure_batch(
+        self,
+        kappa: np.ndarray,
+        signals: np.ndarray,
+        relationship: np.ndarray,
+        distance: np.ndarray,
+        ideology_alignment: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """全 (観測者, 対象) ペアの意味圧を一括計算し、観測者ごとに合算
+        
+        calculate_pressure を全ペア・全シグナルについて呼んで合算したものと同じ結果
+        （怒り・攻撃の対象指定 context_data は無い前提。自己観測は除外）。
+        
+        Args:
+            kappa: 観測者のκ (N, 4)
+            signals: 対象ごとのシグナル強度 (N, S)、列の並びは SIGNAL_ORDER
+            relationship: relationship[o, t] = 観測者oの対象tに対する関係性 (N, N)
+            distance: 距離 (N, N)
+            ideology_alignment: イデオロギー一致度 (N, N)（Noneなら0.0）
+            
+        Returns:
+            観測者ごとの意味圧 (N, 4)
+        """
+        N = kappa.shape[0]
+        rel = relationship[..., None]
+        if ideology_alignment is None:
+            ideology_alignment = np.zeros((N, N))
+        align = ideology_alignment[..., None]
+        
+        # 閾値以下のシグナルは観測されない
+        intensity = np.where(signals > 0.01, signals, 0.0)
+        
+        # 距離と関係性で減衰（自己観測は重み0）
+        atten = (1.0 - distance * 0.5) * (0.5 + np.abs(relationship) * 0.5)
+        atten = atten * (1.0 - np.eye(N))
+        
+        # 観測者の規範意識（κ_core）による感度 (N, 1, 1)
+        norm_sens = np.minimum(kappa[:, HumanLayer.CORE.value] / 2.0, 1.0)[:, None, None]
+        
+        def by_relation(friendly, hostile, neutral):
+            return np.where(rel > 0.3, friendly, np.where(rel < -0.3, hostile, neutral))
+        
+        # シグナル強度1あたりの層別意味圧（各解釈関数と同じ係数）
+        unit = np.ones((N, N, 1))
+        coef = {
+            ObservableSignal.FEAR_EXPRESSION: by_relation(
+                np.array([0.0, 0.8, 0.0, 0.0]) * rel,
+                np.array([0.0, -0.3, -0.2, 0.0]),
+                np.array([0.0, 0.2, 0.1, 0.0])),
+            ObservableSignal.ANGER_EXPRESSION: unit * np.array([0.0, 0.2, 0.3, 0.0]),
+            ObservableSignal.COOPERATIVE_ACT: by_relation(
+                np.array([-0.2, -0.4, -0.3, 0.0]),
+                np.array([0.0, 0.3, 0.5, 0.4]),
+                np.array([0.0, -0.1, -0.2, 0.0])),
+            ObservableSignal.AGGRESSIVE_ACT: unit * np.array([0.2, 0.4, 0.5, 0.0]),
+            ObservableSignal.VERBAL_IDEOLOGY: np.where(
+                align > 0.5, np.array([0.0, 0.0, -0.2, -0.4]) * align,
+                np.where(align < -0.5, np.array([0.0, 0.0, 0.4, 0.7]) * np.abs(align),
+                         np.array([0.0, 0.0, 0.1, 0.2]))),
+            ObservableSignal.NORM_VIOLATION: unit * np.array([0.0, 0.2, 0.8, 0.3]) * norm_sens,
+            ObservableSignal.NORM_ADHERENCE: unit * np.array([0.0, 0.0, -0.3, -0.2]) * norm_sens,
+        }
+        
+        # (N, N, S, 4) にまとめ、対象・シグナルについて1回の縮約で合算
+        coef = np.stack([coef[sig] for sig in SIGNAL_ORDER], axis=2)
+        return np.einsum('ts,ot,otsl->ol', intensity, atten, coef, optimize=True)
+    
     def _compute_attenuation(self, obs: ObservationContext) -> float:
         """距離と関係性による減衰係数
         
@@ -30,7 +30,10 @@ from ssd_human_module import HumanAgent, HumanPressure, HumanLayer
 from ssd_subjective_social_pressure import (
     SubjectiveSocialPressureCalculator,
     ObservableSignal,
-    ObservationContext
+    ObservationContext,
+    SIGNAL_ORDER,
+    NUM_SIGNALS,
+    SIGNAL_INDEX
 )
 
 
@@ -74,54 +77,54 @@ class SignalGenerator:
         Returns:
             観測可能なシグナル {FEAR_EXPRESSION: 0.8, ANGER_EXPRESSION: 0.3, ...}
         """
-        signals = {}
+        row = self.generate_signals_into(agent, np.empty(NUM_SIGNALS))
+        return {sig: float(row[k]) for k, sig in enumerate(SIGNAL_ORDER) if row[k] > 0.0}
+    
+    def generate_signals_into(self, agent: HumanAgent, out: np.ndarray) -> np.ndarray:
+        """シグナル強度を SIGNAL_ORDER 順の配列 out へ書き込む（発生しないシグナルは0.0）
         
-        # エネルギーとκを取得
-        E_physical = agent.state.E[HumanLayer.PHYSICAL.value]
-        E_base = agent.state.E[HumanLayer.BASE.value]
-        E_core = agent.state.E[HumanLayer.CORE.value]
-        E_upper = agent.state.E[HumanLayer.UPPER.value]
+        Args:
+            agent: HumanAgent
+            out: 書き込み先 (NUM_SIGNALS,)
+            
+        Returns:
+            out
+        """
+        out.fill(0.0)
         
-        kappa_base = agent.state.kappa[HumanLayer.BASE.value]
+        # エネルギーとκを取得
+        E_physical, E_base, E_core, E_upper = agent.state.E
         kappa_core = agent.state.kappa[HumanLayer.CORE.value]
-        kappa_upper = agent.state.kappa[HumanLayer.UPPER.value]
         
         # 恐怖表情（BASE層の高エネルギー）
         if E_base > 0.3:  # 閾値を現実的に調整（0.3以上で表情に現れる）
-            fear_intensity = min(E_base / 10.0, 1.0)
-            signals[ObservableSignal.FEAR_EXPRESSION] = fear_intensity
+            out[SIGNAL_INDEX[ObservableSignal.FEAR_EXPRESSION]] = min(E_base / 10.0, 1.0)
         
         # 怒り表情（BASE層 + CORE層の高エネルギー）
         if E_base > 1.0 and E_core > 0.8:
-            anger_intensity = min((E_base + E_core) / 15.0, 1.0)
-            signals[ObservableSignal.ANGER_EXPRESSION] = anger_intensity
+            out[SIGNAL_INDEX[ObservableSignal.ANGER_EXPRESSION]] = min((E_base + E_core) / 15.0, 1.0)
         
         # 協力的行動（CORE層のκが高い）
         if kappa_core > 1.5 and E_core < 3.0:  # 規範意識が高く、葛藤が少ない
-            cooperative_intensity = min((kappa_core - 1.0) / 2.0, 1.0)
-            signals[ObservableSignal.COOPERATIVE_ACT] = cooperative_intensity
+            out[SIGNAL_INDEX[ObservableSignal.COOPERATIVE_ACT]] = min((kappa_core - 1.0) / 2.0, 1.0)
         
         # 攻撃的行動（BASE層が高く、UPPER層の抑制が効いていない）
         if E_base > 5.0 and E_upper < 1.0:
-            aggressive_intensity = min(E_base / 10.0, 1.0)
-            signals[ObservableSignal.AGGRESSIVE_ACT] = aggressive_intensity
+            out[SIGNAL_INDEX[ObservableSignal.AGGRESSIVE_ACT]] = min(E_base / 10.0, 1.0)
         
         # イデオロギー的発言（UPPER層が高い）
         if E_upper > 1.0:  # 閾値を現実的に調整
-            ideology_intensity = min(E_upper / 8.0, 1.0)
-            signals[ObservableSignal.VERBAL_IDEOLOGY] = ideology_intensity
+            out[SIGNAL_INDEX[ObservableSignal.VERBAL_IDEOLOGY]] = min(E_upper / 8.0, 1.0)
         
         # 規範遵守（CORE層のκが高い）
         if kappa_core > 1.8:
-            adherence_intensity = min((kappa_core - 1.0) / 3.0, 1.0)
-            signals[ObservableSignal.NORM_ADHERENCE] = adherence_intensity
+            out[SIGNAL_INDEX[ObservableSignal.NORM_ADHERENCE]] = min((kappa_core - 1.0) / 3.0, 1.0)
         
         # 規範違反（CORE層のエネルギーが高く、κが低い）
         if E_core > 3.0 and kappa_core < 1.2:
-            violation_intensity = min(E_core / 8.0, 1.0)
-            signals[ObservableSignal.NORM_VIOLATION] = violation_intensity
+            out[SIGNAL_INDEX[ObservableSignal.NORM_VIOLATION]] = min(E_core / 8.0, 1.0)
         
-        return signals
+        return out
     
     def get_ideology_alignment(
         self,
@@ -157,6 +160,31 @@ class SignalGenerator:
             return -0.7  # 対立
         else:
             return 0.0  # 中立
+    
+    def get_ideology_alignment_matrix(
+        self,
+        kappa: np.ndarray,
+        E: np.ndarray
+    ) -> np.ndarray:
+        """全ペアのイデオロギー一致度（get_ideology_alignment の行列版）
+        
+        Args:
+            kappa: 各エージェントのκ (N, 4)
+            E: 各エージェントのE (N, 4)
+            
+        Returns:
+            一致度 (N, N)
+        """
+        kappa_upper = kappa[:, HumanLayer.UPPER.value]
+        E_upper = E[:, HumanLayer.UPPER.value]
+        kappa_diff = np.abs(kappa_upper[:, None] - kappa_upper[None, :])
+        E_diff = np.abs(E_upper[:, None] - E_upper[None, :])
+        
+        return np.where(
+            kappa_diff < 0.2,
+            np.where(E_diff < 10.0, 0.8, 0.4),
+            np.where(kappa_diff > 0.8, -0.7, 0.0)
+        )
 
 
 class RelationshipMatrix:
@@ -252,6 +280,7 @@ class SubjectiveSociety:
         
         # シグナル生成器
         self.signal_generator = SignalGenerator()
+        self.signals = np.empty((self.num_agents, NUM_SIGNALS), dtype=np.float32)
         
         # 主観的圧力計算器
         self.pressure_calculator = SubjectiveSocialPressureCalculator()
@@ -269,12 +298,22 @@ class SubjectiveSociety:
         Args:
             dt: 時間刻み
         """
-        # フェーズ1: 全エージェントのシグナル生成
-        agent_signals = self._generate_all_signals()
+        # フェーズ1: 全エージェントのシグナルを (N, S) バッファへ生成
+        signals = self.signals
+        for t, agent in enumerate(self.agents):
+            self.signal_generator.generate_signals_into(agent, signals[t])
+        
+        # フェーズ2: 全観測者の主観的圧力をステップ開始時点の状態から一括計算
+        kappa = np.stack([a.state.kappa for a in self.agents])
+        E = np.stack([a.state.E for a in self.agents])
+        alignment = self.signal_generator.get_ideology_alignment_matrix(kappa, E)
+        pressures = self.pressure_calculator.calculate_pressure_batch(
+            kappa, signals, self.relationships.matrix, self.distance_matrix, alignment
+        )
         
-        # フェーズ2: 各エージェントが他者を観測→解釈→自己変化
+        # フェーズ3: 各エージェントの内部状態が主観的に変化
         for i, observer in enumerate(self.agents):
-            self._process_subjective_observations(i, observer, agent_signals, dt)
+            observer.step(pressures[i], dt)
     
     def _generate_all_signals(self) -> List[Dict[ObservableSignal, float]]:
         """全エージェントの観測可能なシグナルを生成